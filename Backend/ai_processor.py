@@ -1,10 +1,45 @@
 import json
 import re
+import threading
+from cluster_fanout import KubeContexts
+from intent_matcher import IntentMatcher
+from speech_corrector import DEVOPS_VOCABULARY, SpeechCorrector
+
+# Kubernetes/Docker object names (DNS-1123 style), safe to pass to the CLIs
+NAME = r'([a-z0-9](?:[a-z0-9_.-]*[a-z0-9])?)'
+NAME_PATTERNS = [
+    re.compile(rf'\b(?:pod|container|deployment|service)\s+(?:named\s+)?{NAME}'),
+    re.compile(rf'\blogs?\s+(?:of|for|from)\s+(?:the\s+)?{NAME}'),
+    re.compile(rf'\b(?:scale|restart|delete|remove|stop|describe)\s+(?:the\s+)?{NAME}'),
+]
+# "across all clusters", "in every context"
+ALL_CLUSTERS = re.compile(r'\b(?:across|in|on|from)\s+(?:all|every|each)\s+(?:the\s+)?(?:cluster|context)s?\b|\bacross\s+(?:the\s+)?(?:cluster|context)s\b')
+# "in clusters prod and staging", "on context kind-dev", "in the staging cluster";
+# group 1 is the plural "s": only a plural names contexts on its own, other names must exist
+NAMED_CLUSTERS = re.compile(rf'\b(?:cluster|context)(s?)\s+({NAME[1:-1]}(?:\s*(?:,|\band\b)\s*{NAME[1:-1]})*)')
+CLUSTER_BEFORE = re.compile(rf'\b(?:in|on|from)\s+(?:the\s+)?{NAME}\s+(?:cluster|context)\b')
+# Words next to "cluster" that are never a context name ("show the cluster nodes")
+NOT_CLUSTER_NAMES = set(DEVOPS_VOCABULARY) | {'a', 'an', 'the', 'this', 'that', 'my', 'our', 'your', 'current', 'whole', 'entire', 'and'}
+FAILING = re.compile(r'\b(?:failing|failed|unhealthy|broken|crashing|not\s+(?:running|ready))\b')
+# "what changed", "any changes to the pods", "since last time"
+CHANGES = re.compile(r'\b(?:changed|changes|since\s+(?:the\s+)?last\s+(?:time|check))\b')
+# Verbs that can precede "<name> logs"
+LOG_VERBS = {'show', 'get', 'display', 'search', 'find', 'grep', 'filter', 'count', 'check', 'read', 'tail', 'my', 'me'}
+# Words the name patterns can catch that are never names
+NOT_NAMES = {
+    'pod', 'pods', 'container', 'containers', 'deployment', 'deployments', 'service', 'services',
+    'the', 'all', 'log', 'logs', 'status', 'to', 'in', 'of', 'named', 'health', 'system', 'replicas',
+    'last', 'past', 'recent', 'error', 'errors', 'warning', 'warnings', 'exception', 'exceptions', 'namespace',
+}
 
 class AIProcessor:
     """AI-powered command processor for natural language understanding"""
     
-    def __init__(self):
+    def __init__(self, corrector=None, contexts=None):
+        # Fixes misheard words against DevOps vocabulary and live resource names
+        self.corrector = corrector if corrector is not None else SpeechCorrector()
+        # kubeconfig contexts, to tell "the staging cluster" from "the cluster status"
+        self.contexts = contexts if contexts is not None else KubeContexts()
         self.command_patterns = {
             # Kubernetes Pods
             'get_pods': [
@@ -20,12 +55,12 @@ class AIProcessor:
                 r'info.*pod'
             ],
             'delete_pod': [
-                r'(delete|remove|kill).*pod',
-                r'pod.*(delete|remove)'
+                r'\b(delete|remove|kill)\b.*pod',
+                r'pod.*\b(delete|remove)\b'
             ],
             'restart_pod': [
-                r'restart.*pod',
-                r'pod.*restart'
+                r'\brestart\b.*pod',
+                r'pod.*\brestart\b'
             ],
             
             # Docker Containers
@@ -39,8 +74,8 @@ class AIProcessor:
                 r'docker.*image'
             ],
             'stop_container': [
-                r'stop.*container',
-                r'container.*stop'
+                r'\bstop\b.*container',
+                r'container.*\bstop\b'
             ],
             
             # Kubernetes Services
@@ -55,13 +90,21 @@ class AIProcessor:
                 r'deployment.*status'
             ],
             'scale_deployment': [
-                r'scale.*deployment',
-                r'deployment.*scale',
-                r'increase.*replica',
-                r'decrease.*replica'
+                r'\bscale\b.*deployment',
+                r'deployment.*\bscale\b',
+                r'\bscale\b.*\bto\s+\d',
+                r'\bincrease\b.*replica',
+                r'\bdecrease\b.*replica'
             ],
             
             # Logs
+            'search_logs': [
+                r'(error|warning|exception|count|search|find|grep|filter).*log',
+                r'count\s+\d(\d\d|xx)s?\b',
+                r'\d(\d\d|xx)s?\s+in\b',
+                r'(errors|warnings|exceptions)\s+(in|from|for)\b',
+                r'log.*(contain|matching|last\s+\d|last\s+(minute|hour))'
+            ],
             'get_logs': [
                 r'(show|get|display).*log',
                 r'log.*pod',
@@ -80,18 +123,55 @@ class AIProcessor:
             'get_nodes': [
                 r'(show|list|get).*node',
                 r'node.*status'
+            ],
+            
+            # Other cluster objects
+            'get_namespaces': [
+                r'namespaces',
+                r'(show|list|get).*namespace'
+            ],
+            'get_configmaps': [
+                r'config\s*map'
+            ],
+            'get_secrets': [
+                r'secret'
             ]
         }
+        
+        # All patterns are compiled into a single-pass matcher on first use
+        self._intent_matcher = None
+        self._matcher_lock = threading.Lock()
     
-    def process_command(self, voice_command):
-        """Process voice command and return structured action"""
-        command_lower = voice_command.lower()
+    @property
+    def intent_matcher(self):
+        if self._intent_matcher is None:
+            with self._matcher_lock:
+                if self._intent_matcher is None:
+                    self._intent_matcher = IntentMatcher(self.command_patterns)
+        return self._intent_matcher
+    
+    def warm_up(self):
+        """Compile the intent patterns now instead of on the first command"""
+        return self.intent_matcher
+    
+    def process_command(self, voice_command, context=None):
+        """Process voice command and return structured action
+        
+        With a SessionContext, follow-ups ("describe the second one", "logs
+        for that") are resolved against the session's last listing.
+        """
+        command_lower = self.normalize_command(voice_command)
         
         # Detect command type
         command_type = self.detect_command_type(command_lower)
         
         # Extract parameters
         params = self.extract_parameters(command_lower)
+        if command_type == 'search_logs':
+            params.update(self.extract_log_filters(command_lower, params))
+        
+        if context is not None:
+            command_type, params = context.resolve(command_lower, command_type, params)
         
         # Generate response
         result = {
@@ -104,35 +184,111 @@ class AIProcessor:
         
         return result
     
+    def normalize_command(self, voice_command):
+        """Lowercase and fix speech recognition errors"""
+        return self.corrector.correct(voice_command.lower())
+    
     def detect_command_type(self, command):
         """Detect what type of command user wants"""
-        for cmd_type, patterns in self.command_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, command, re.IGNORECASE):
-                    return cmd_type
-        return 'unknown'
+        return self.intent_matcher.match(command)
     
     def extract_parameters(self, command):
         """Extract parameters like pod name, replica count, etc."""
         params = {}
         
         # Extract pod/container name
-        name_match = re.search(r'(pod|container|deployment|service)\s+(\w+)', command)
-        if name_match:
-            params['name'] = name_match.group(2)
+        for pattern in NAME_PATTERNS:
+            names = [m.group(1) for m in pattern.finditer(command) if m.group(1) not in NOT_NAMES]
+            if names:
+                params['name'] = names[0]
+                break
         
         # Extract replica count
-        replica_match = re.search(r'(\d+)\s*(replica|instance|pod)', command)
+        replica_match = re.search(r'(\d+)\s*(replica|instance|pod)', command) or re.search(r'\bto\s+(\d+)\b', command)
         if replica_match:
             params['replicas'] = int(replica_match.group(1))
         
         # Extract namespace
-        namespace_match = re.search(r'namespace\s+(\w+)', command)
+        namespace_match = re.search(rf'namespace\s+{NAME}', command) or re.search(rf'\bin\s+{NAME}\s+namespace', command)
         if namespace_match:
             params['namespace'] = namespace_match.group(1)
         
+        # Target kubeconfig contexts: 'all' or a tuple of spoken names
+        clusters = self.extract_clusters(command)
+        if clusters:
+            params['clusters'] = clusters
+        
+        if FAILING.search(command):
+            params['failing'] = True
+        
+        if CHANGES.search(command):
+            params['diff'] = True
+        
         return params
     
+    def extract_clusters(self, command):
+        """'all', the context names said, or None
+        
+        "clusters prod and staging" names contexts outright; a single
+        "cluster X" or "in the X cluster" only counts if every X is a known
+        context, so "check cluster health" stays on the current cluster.
+        """
+        if ALL_CLUSTERS.search(command):
+            return 'all'
+        for match in NAMED_CLUSTERS.finditer(command):
+            names = self.cluster_names(match.group(2))
+            if names and (match.group(1) or self.known_contexts(names)):
+                return names
+        for match in CLUSTER_BEFORE.finditer(command):
+            names = self.cluster_names(match.group(1))
+            if names and self.known_contexts(names):
+                return names
+        return None
+    
+    def cluster_names(self, spoken):
+        names = re.split(r'\s*(?:,|\band\b)\s*', spoken)
+        if any(name in NOT_CLUSTER_NAMES or name in NOT_NAMES for name in names):
+            return None
+        return tuple(names)
+    
+    def known_contexts(self, names):
+        return not self.contexts.select(names)[1]
+    
+    def extract_log_filters(self, command, params):
+        """Extract log search filters: target, time window, level, status code, text"""
+        filters = {}
+        
+        if 'name' not in params:
+            # "backend logs", "in nginx"
+            targets = [m.group(1) for m in re.finditer(rf'\b{NAME}\s+(?:container\s+|pod\s+)?logs?\b', command)]
+            targets += [m.group(1) for m in re.finditer(rf'\b(?:in|from|for)\s+(?:the\s+)?{NAME}\s*$', command)]
+            targets = [t for t in targets if t not in NOT_NAMES and t not in LOG_VERBS]
+            if targets:
+                filters['name'] = targets[0]
+        
+        # "last 10 minutes", "past hour", "last 30 seconds"
+        window_match = re.search(r'\b(?:last|past)\s+(\d+\s*)?(second|sec|minute|min|hour|day)s?\b', command)
+        if window_match:
+            amount = int(window_match.group(1) or 1)
+            filters['since'] = f"{amount}{window_match.group(2)[0]}" if window_match.group(2) != 'day' else f"{amount * 24}h"
+        
+        status_match = re.search(r'\b([1-5](?:\d\d|xx))s?\b', command)
+        if status_match:
+            filters['status'] = status_match.group(1)
+        
+        for level, words in (('error', r'errors?|exceptions?|failures?'), ('warn', r'warn(?:ing)?s?'), ('debug', r'debug')):
+            if re.search(rf'\b(?:{words})\b', command):
+                filters['level'] = level
+                break
+        
+        text_match = re.search(r'\b(?:containing|matching|with(?: the)? text|grep(?: for)?)\s+[\'"]?(.+?)[\'"]?(?=\s+(?:in|from|for|over)\b|$)', command)
+        if text_match:
+            filters['pattern'] = text_match.group(1)
+        
+        if re.search(r'\b(?:count|how many|number of)\b', command):
+            filters['aggregate'] = 'count'
+        return filters
+    
     def get_action(self, command_type, params):
         """Get the actual command to execute"""
         actions = {
@@ -145,10 +301,14 @@ class AIProcessor:
             'stop_container': f"docker stop {params.get('name', '')}",
             'get_services': 'kubectl get services',
             'get_deployments': 'kubectl get deployments',
-            'scale_deployment': f"kubectl scale deployment {params.get('name', '')} --replicas={params.get('replicas', 3)}",
+            'scale_deployment': f"kubectl scale deployment {params.get('name', '')} --replicas={params.get('replicas', '?')}",
             'get_logs': f"kubectl logs {params.get('name', '')}",
+            'search_logs': f"kubectl logs {params.get('name', '')} --since={params.get('since', '1h')}",
             'health_check': 'system_health',
             'get_nodes': 'kubectl get nodes',
+            'get_namespaces': 'kubectl get namespaces',
+            'get_configmaps': 'kubectl get configmaps',
+            'get_secrets': 'kubectl get secrets',
             'unknown': 'unknown'
         }
         return actions.get(command_type, 'unknown')
@@ -156,7 +316,7 @@ class AIProcessor:
     def get_description(self, command_type, params):
         """Get human-readable description"""
         descriptions = {
-            'get_pods': 'Fetching all pods in the cluster',
+            'get_pods': 'Fetching all pods' if params.get('clusters') else 'Fetching all pods in the cluster',
             'describe_pod': f"Getting detailed information about pod: {params.get('name', 'unknown')}",
             'delete_pod': f"Deleting pod: {params.get('name', 'unknown')}",
             'restart_pod': f"Restarting deployment: {params.get('name', 'unknown')}",
@@ -165,16 +325,37 @@ class AIProcessor:
             'stop_container': f"Stopping container: {params.get('name', 'unknown')}",
             'get_services': 'Fetching all Kubernetes services',
             'get_deployments': 'Listing all deployments',
-            'scale_deployment': f"Scaling deployment {params.get('name', '')} to {params.get('replicas', 3)} replicas",
+            'scale_deployment': f"Scaling deployment {params.get('name', '')} to {params.get('replicas', '?')} replicas",
             'get_logs': f"Fetching logs for: {params.get('name', 'unknown')}",
+            'search_logs': f"Searching logs of: {params.get('name', 'unknown')}",
             'health_check': 'Checking system health status',
             'get_nodes': 'Listing all cluster nodes',
+            'get_namespaces': 'Listing all namespaces',
+            'get_configmaps': 'Listing all config maps',
+            'get_secrets': 'Listing all secrets',
             'unknown': 'Command not recognized'
         }
-        return descriptions.get(command_type, 'Processing command...')
+        description = descriptions.get(command_type, 'Processing command...')
+        if params.get('clusters') == 'all':
+            description += ' across all clusters'
+        elif params.get('clusters'):
+            description += f" in {', '.join(params['clusters'])}"
+        if params.get('diff'):
+            description += ', changes since last time'
+        return description
     
-    def generate_smart_response(self, command_result, ai_analysis):
+    def generate_smart_response(self, command_result, ai_analysis, result_set=None):
         """Generate intelligent response based on command output"""
+        # Typed records: summarize from parsed statuses, not substring counts
+        if result_set is not None:
+            if result_set.error:
+                response = "⚠️ There seems to be an issue. "
+            elif not len(result_set):
+                response = f"ℹ️ {result_set.summary()}. "
+            else:
+                response = f"✅ {result_set.summary()}. "
+            return response + f"\n\n{command_result}"
+        
         output = command_result.lower()
         
         # Analyze output
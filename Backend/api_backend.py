@@ -0,0 +1,546 @@
+import http.client
+import json
+import os
+import shlex
+import socket
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlparse
+
+SERVICE_ACCOUNT_DIR = '/var/run/secrets/kubernetes.io/serviceaccount'
+
+
+class BackendError(Exception):
+    """The API answered, but with an error"""
+
+
+class BackendUnavailable(Exception):
+    """The API could not be reached - callers should fall back to the CLI"""
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a UNIX domain socket (Docker Engine API)"""
+
+    def __init__(self, socket_path, timeout=10):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP connections"""
+
+    def __init__(self, factory, maxsize=8):
+        self.factory = factory
+        self.maxsize = maxsize
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def request(self, method, path, headers=None):
+        """Send a request and return (status, body bytes)"""
+        headers = headers or {}
+
+        # A pooled connection may have been closed by the server; retry once fresh
+        for attempt in range(2):
+            conn, reused = self._acquire(fresh=attempt > 0)
+            try:
+                conn.request(method, path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise BackendUnavailable(str(e))
+            except OSError as e:
+                conn.close()
+                raise BackendUnavailable(str(e))
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, body
+
+    def _acquire(self, fresh=False):
+        if not fresh:
+            with self._lock:
+                if self._idle:
+                    return self._idle.pop(), True
+        return self.factory(), False
+
+    def _release(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def warm_up(self):
+        """Open one connection ahead of the first request; False if unreachable"""
+        conn = self.factory()
+        try:
+            conn.connect()
+        except OSError:
+            conn.close()
+            return False
+        self._release(conn)
+        return True
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def format_age(timestamp):
+    """Render a Kubernetes/Docker timestamp like kubectl's AGE column"""
+    if not timestamp:
+        return '<unknown>'
+    if isinstance(timestamp, (int, float)):
+        created = datetime.fromtimestamp(timestamp, timezone.utc)
+    else:
+        # fromisoformat is C-fast, unlike strptime; it takes 'Z' only from Python 3.11
+        created = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    seconds = int((datetime.now(timezone.utc) - created).total_seconds())
+    if seconds < 120:
+        return f"{seconds}s"
+    if seconds < 7200:
+        return f"{seconds // 60}m"
+    if seconds < 172800:
+        return f"{seconds // 3600}h"
+    return f"{seconds // 86400}d"
+
+
+def render_table(headers, rows):
+    """Left-aligned columns separated by three spaces, like kubectl"""
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], len(cell))
+    lines = []
+    for row in [headers] + rows:
+        lines.append('   '.join(cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip())
+    return '\n'.join(lines)
+
+
+def pod_status(item):
+    """Pod phase, or the waiting reason (e.g. CrashLoopBackOff) if a container has one"""
+    phase = item.get('status', {}).get('phase', 'Unknown')
+    for s in item.get('status', {}).get('containerStatuses', []):
+        waiting = s.get('state', {}).get('waiting')
+        if waiting and waiting.get('reason'):
+            phase = waiting['reason']
+    return phase
+
+
+# `kubectl get pods -o jsonpath=...`: one tab-separated line per pod with just
+# the fields listings use, a fraction of the JSON to transfer and parse. The
+# status fields come first so counting needs only a partial split; namespace
+# and name (never empty) are at the ends so stripping the output keeps them.
+POD_JSONPATH = (
+    '{range .items[*]}{.metadata.namespace}{"\\t"}{.status.phase}{"\\t"}'
+    '{.status.containerStatuses[*].state.waiting.reason}{"\\t"}{.metadata.creationTimestamp}{"\\t"}'
+    '{.status.containerStatuses[*].ready}{"\\t"}{.status.containerStatuses[*].restartCount}{"\\t"}{.metadata.name}{"\\n"}{end}'
+)
+
+
+def pod_lines(items):
+    """POD_JSONPATH output for API list items, as kubectl prints it"""
+    lines = []
+    for item in items:
+        metadata = item.get('metadata', {})
+        status = item.get('status', {})
+        statuses = status.get('containerStatuses', [])
+        lines.append('\t'.join((
+            metadata.get('namespace', ''),
+            status.get('phase', ''),
+            ' '.join(s['state']['waiting']['reason'] for s in statuses
+                     if s.get('state', {}).get('waiting', {}).get('reason')),
+            metadata.get('creationTimestamp') or '',
+            ' '.join('true' if s.get('ready') else 'false' for s in statuses),
+            ' '.join(str(s.get('restartCount', 0)) for s in statuses),
+            metadata.get('name', ''),
+        )) + '\n')
+    return ''.join(lines)
+
+
+def pod_row(item):
+    statuses = item.get('status', {}).get('containerStatuses', [])
+    ready = sum(1 for s in statuses if s.get('ready'))
+    restarts = sum(s.get('restartCount', 0) for s in statuses)
+    return [
+        item['metadata']['name'],
+        f"{ready}/{len(statuses)}",
+        pod_status(item),
+        str(restarts),
+        format_age(item['metadata'].get('creationTimestamp')),
+    ]
+
+
+def service_row(item):
+    spec = item.get('spec', {})
+    ports = ','.join(f"{p.get('port')}/{p.get('protocol', 'TCP')}" for p in spec.get('ports', []))
+    return [
+        item['metadata']['name'],
+        spec.get('type', ''),
+        spec.get('clusterIP', ''),
+        ports or '<none>',
+        format_age(item['metadata'].get('creationTimestamp')),
+    ]
+
+
+def deployment_row(item):
+    status = item.get('status', {})
+    return [
+        item['metadata']['name'],
+        f"{status.get('readyReplicas', 0)}/{item.get('spec', {}).get('replicas', 0)}",
+        str(status.get('updatedReplicas', 0)),
+        str(status.get('availableReplicas', 0)),
+        format_age(item['metadata'].get('creationTimestamp')),
+    ]
+
+
+def node_status(item):
+    conditions = item.get('status', {}).get('conditions', [])
+    ready = any(c.get('type') == 'Ready' and c.get('status') == 'True' for c in conditions)
+    return 'Ready' if ready else 'NotReady'
+
+
+def node_row(item):
+    labels = item['metadata'].get('labels', {})
+    roles = ','.join(sorted(k.split('/', 1)[1] for k in labels if k.startswith('node-role.kubernetes.io/')))
+    return [
+        item['metadata']['name'],
+        node_status(item),
+        roles or '<none>',
+        format_age(item['metadata'].get('creationTimestamp')),
+        item.get('status', {}).get('nodeInfo', {}).get('kubeletVersion', ''),
+    ]
+
+
+def namespace_row(item):
+    return [
+        item['metadata']['name'],
+        item.get('status', {}).get('phase', ''),
+        format_age(item['metadata'].get('creationTimestamp')),
+    ]
+
+
+# kubectl-style table layout per resource: (headers, row builder, status function or None)
+KUBE_TABLES = {
+    'pods': (['NAME', 'READY', 'STATUS', 'RESTARTS', 'AGE'], pod_row, pod_status),
+    'services': (['NAME', 'TYPE', 'CLUSTER-IP', 'PORT(S)', 'AGE'], service_row, None),
+    'deployments': (['NAME', 'READY', 'UP-TO-DATE', 'AVAILABLE', 'AGE'], deployment_row, None),
+    'nodes': (['NAME', 'STATUS', 'ROLES', 'AGE', 'VERSION'], node_row, node_status),
+    'namespaces': (['NAME', 'STATUS', 'AGE'], namespace_row, lambda item: item.get('status', {}).get('phase', '')),
+}
+
+
+# kubectl resource name/alias -> (kind, API group path, namespaced)
+KUBE_RESOURCES = {
+    'pods': ('pods', '/api/v1', True),
+    'pod': ('pods', '/api/v1', True),
+    'po': ('pods', '/api/v1', True),
+    'services': ('services', '/api/v1', True),
+    'service': ('services', '/api/v1', True),
+    'svc': ('services', '/api/v1', True),
+    'deployments': ('deployments', '/apis/apps/v1', True),
+    'deployment': ('deployments', '/apis/apps/v1', True),
+    'deploy': ('deployments', '/apis/apps/v1', True),
+    'nodes': ('nodes', '/api/v1', False),
+    'node': ('nodes', '/api/v1', False),
+    'no': ('nodes', '/api/v1', False),
+    'namespaces': ('namespaces', '/api/v1', False),
+    'namespace': ('namespaces', '/api/v1', False),
+    'ns': ('namespaces', '/api/v1', False),
+}
+
+
+def render_kube_table(kind, data):
+    """Render a Kubernetes list response the way `kubectl get <kind>` does"""
+    headers, row, _ = KUBE_TABLES[kind]
+    rows = [row(item) for item in data.get('items', [])]
+    if not rows:
+        return ''
+    return render_table(headers, rows)
+
+
+def _parse_args(command):
+    """Split a CLI command into positional words and a flag dict"""
+    words, flags = [], {}
+    tokens = shlex.split(command)
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.startswith('--') and '=' in token:
+            key, value = token[2:].split('=', 1)
+            flags[key] = value
+        elif token in ('-n', '--namespace') and i + 1 < len(tokens):
+            flags['namespace'] = tokens[i + 1]
+            i += 1
+        elif token in ('-o', '--output') and i + 1 < len(tokens):
+            flags['output'] = tokens[i + 1]
+            i += 1
+        elif token in ('-A', '--all-namespaces'):
+            flags['all-namespaces'] = True
+        elif token in ('-a', '--all'):
+            flags['all'] = True
+        elif token == '--tail' and i + 1 < len(tokens):
+            flags['tail'] = tokens[i + 1]
+            i += 1
+        elif token.startswith('-'):
+            flags[token.lstrip('-')] = True
+        else:
+            words.append(token)
+        i += 1
+    return words, flags
+
+
+class KubernetesAPIClient:
+    """Minimal Kubernetes API client reusing one authenticated session"""
+
+    def __init__(self, server, token=None, ca_file=None, insecure=False, namespace='default', pool_size=8, timeout=10):
+        parsed = urlparse(server)
+        self.namespace = namespace
+        self.headers = {'Accept': 'application/json'}
+        if token:
+            self.headers['Authorization'] = f"Bearer {token}"
+
+        host, port = parsed.hostname, parsed.port
+        if parsed.scheme == 'https':
+            self._ca_file = ca_file
+            self._insecure = insecure
+            self._tls_context = None
+            self._tls_lock = threading.Lock()
+            factory = lambda: http.client.HTTPSConnection(host, port or 443, timeout=timeout, context=self.tls_context())
+        else:
+            factory = lambda: http.client.HTTPConnection(host, port or 80, timeout=timeout)
+        self.pool = ConnectionPool(factory, maxsize=pool_size)
+
+    def tls_context(self):
+        """TLS context, built with the first connection: loading CA certificates is slow"""
+        with self._tls_lock:
+            if self._tls_context is None:
+                import ssl
+
+                context = ssl.create_default_context(cafile=self._ca_file)
+                if self._insecure:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                self._tls_context = context
+        return self._tls_context
+
+    def get(self, path, params=None, raw=False):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        status, body = self.pool.request('GET', path, self.headers)
+        if status >= 400:
+            try:
+                message = json.loads(body).get('message', body.decode(errors='replace'))
+            except ValueError:
+                message = body.decode(errors='replace')
+            raise BackendError(f"Error from server: {message}")
+        if raw:
+            return body.decode(errors='replace')
+        return json.loads(body)
+
+    def _ns_path(self, group_path, resource, flags):
+        if flags.get('all-namespaces'):
+            return f"{group_path}/{resource}"
+        namespace = flags.get('namespace', self.namespace)
+        return f"{group_path}/namespaces/{namespace}/{resource}"
+
+    def run(self, command):
+        """Serve a kubectl command, or return None if it is not supported"""
+        words, flags = _parse_args(command)
+        if not words or 'context' in flags:
+            # This client talks to one cluster; other contexts go through kubectl
+            return None
+
+        if words[0] == 'logs' and len(words) > 1:
+            params = {}
+            if 'tail' in flags:
+                params['tailLines'] = flags['tail']
+            namespace = flags.get('namespace', self.namespace)
+            return self.get(f"/api/v1/namespaces/{namespace}/pods/{words[1]}/log", params, raw=True)
+
+        output = flags.get('output')
+        if words[0] != 'get' or len(words) != 2 or output not in (None, 'json', f"jsonpath={POD_JSONPATH}"):
+            return None
+
+        resource = KUBE_RESOURCES.get(words[1])
+        if resource is None:
+            return None
+        kind, group_path, namespaced = resource
+        path = self._ns_path(group_path, kind, flags) if namespaced else f"{group_path}/{kind}"
+
+        # -o json passes the API's list straight through
+        if output == 'json':
+            return self.get(path, raw=True)
+        if output is not None:
+            return pod_lines(self.get(path).get('items', [])) if kind == 'pods' else None
+        return render_kube_table(kind, self.get(path))
+
+    def version(self):
+        return self.get('/version')
+
+
+class DockerAPIClient:
+    """Minimal Docker Engine API client over the daemon's UNIX socket"""
+
+    def __init__(self, socket_path='/var/run/docker.sock', pool_size=8, timeout=10):
+        self.socket_path = socket_path
+        self.pool = ConnectionPool(lambda: UnixHTTPConnection(socket_path, timeout=timeout), maxsize=pool_size)
+
+    def get(self, path, params=None, raw=False):
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        status, body = self.pool.request('GET', path, {'Host': 'docker'})
+        if status >= 400:
+            try:
+                message = json.loads(body).get('message', body.decode(errors='replace'))
+            except ValueError:
+                message = body.decode(errors='replace')
+            raise BackendError(f"Error response from daemon: {message}")
+        if raw:
+            return body
+        return json.loads(body)
+
+    def run(self, command):
+        """Serve a docker command, or return None if it is not supported"""
+        words, flags = _parse_args(command)
+        if not words or flags.get('format'):
+            return None
+
+        if words == ['ps']:
+            params = {'all': 1} if flags.get('all') else {}
+            return self._render_containers(self.get('/containers/json', params))
+        if words == ['images']:
+            return self._render_images(self.get('/images/json'))
+        if words == ['info']:
+            info = self.get('/info')
+            return f"Containers: {info.get('Containers', 0)}\nImages: {info.get('Images', 0)}\nServer Version: {info.get('ServerVersion', '')}"
+        if words[0] == 'logs' and len(words) == 2:
+            params = {'stdout': 1, 'stderr': 1}
+            if 'tail' in flags:
+                params['tail'] = flags['tail']
+            return self._demux_logs(self.get(f"/containers/{words[1]}/logs", params, raw=True))
+        return None
+
+    def _demux_logs(self, body):
+        """Strip the 8-byte stream headers Docker adds for non-TTY containers"""
+        if len(body) < 8 or body[0] not in (0, 1, 2) or body[1:4] != b'\x00\x00\x00':
+            return body.decode(errors='replace').strip()
+        chunks, i = [], 0
+        while i + 8 <= len(body):
+            size = int.from_bytes(body[i + 4:i + 8], 'big')
+            chunks.append(body[i + 8:i + 8 + size])
+            i += 8 + size
+        return b''.join(chunks).decode(errors='replace').strip()
+
+    def _render_containers(self, containers):
+        rows = [[
+            c.get('Id', '')[:12],
+            c.get('Image', ''),
+            c.get('Status', ''),
+            ','.join(n.lstrip('/') for n in c.get('Names', [])),
+        ] for c in containers]
+        if not rows:
+            return ''
+        return render_table(['CONTAINER ID', 'IMAGE', 'STATUS', 'NAMES'], rows)
+
+    def _render_images(self, images):
+        rows = []
+        for image in images:
+            tags = image.get('RepoTags') or ['<none>:<none>']
+            repo, _, tag = tags[0].rpartition(':')
+            rows.append([
+                repo,
+                tag,
+                image.get('Id', '').split(':')[-1][:12],
+                format_age(image.get('Created')),
+                f"{image.get('Size', 0) / 1e6:.1f}MB",
+            ])
+        if not rows:
+            return ''
+        return render_table(['REPOSITORY', 'TAG', 'IMAGE ID', 'CREATED', 'SIZE'], rows)
+
+
+class NativeAPIBackend:
+    """Executor backend that talks to the Kubernetes and Docker APIs directly"""
+
+    def __init__(self, kubernetes=None, docker=None):
+        self.kubernetes = kubernetes
+        self.docker = docker
+
+    def run_kubectl(self, command):
+        if self.kubernetes is None:
+            return None
+        return self.kubernetes.run(command)
+
+    def run_docker(self, command):
+        if self.docker is None:
+            return None
+        return self.docker.run(command)
+
+    def warm_up(self):
+        """Connect to each configured API before the first command needs it"""
+        for client in (self.kubernetes, self.docker):
+            if client is not None:
+                client.pool.warm_up()
+
+    def close(self):
+        for client in (self.kubernetes, self.docker):
+            if client is not None:
+                client.pool.close()
+
+
+def create_backend_from_env(environ=None):
+    """Build a NativeAPIBackend when DEVOPS_BACKEND=api, else return None
+
+    Kubernetes is reached through KUBE_API_SERVER (e.g. a `kubectl proxy`
+    at http://127.0.0.1:8001) with optional KUBE_TOKEN/KUBE_TOKEN_FILE and
+    KUBE_CA_FILE, or through the in-cluster service account. Docker uses
+    the UNIX socket from DOCKER_HOST (default /var/run/docker.sock).
+    """
+    env = os.environ if environ is None else environ
+    if env.get('DEVOPS_BACKEND', 'subprocess') != 'api':
+        return None
+
+    kubernetes = None
+    server = env.get('KUBE_API_SERVER')
+    token = env.get('KUBE_TOKEN')
+    ca_file = env.get('KUBE_CA_FILE')
+    token_file = env.get('KUBE_TOKEN_FILE')
+
+    if not server and env.get('KUBERNETES_SERVICE_HOST'):
+        server = f"https://{env['KUBERNETES_SERVICE_HOST']}:{env.get('KUBERNETES_SERVICE_PORT', '443')}"
+        token_file = token_file or os.path.join(SERVICE_ACCOUNT_DIR, 'token')
+        ca_file = ca_file or os.path.join(SERVICE_ACCOUNT_DIR, 'ca.crt')
+
+    if not token and token_file and os.path.exists(token_file):
+        with open(token_file) as f:
+            token = f.read().strip()
+
+    if server:
+        kubernetes = KubernetesAPIClient(
+            server,
+            token=token,
+            ca_file=ca_file,
+            insecure=env.get('KUBE_INSECURE_SKIP_TLS_VERIFY') == 'true',
+            namespace=env.get('KUBE_NAMESPACE', 'default'),
+        )
+
+    docker = None
+    docker_host = env.get('DOCKER_HOST', 'unix:///var/run/docker.sock')
+    if docker_host.startswith('unix://'):
+        docker = DockerAPIClient(docker_host[len('unix://'):])
+
+    return NativeAPIBackend(kubernetes, docker)
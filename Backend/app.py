@@ -1,17 +1,63 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
-from devops_executor import DevOpsExecutor
+from devops_executor import DevOpsExecutor, log_stream_url
 from ai_processor import AIProcessor
-from voice_response import VoiceResponse
+from speech_service import create_voice_response
+from api_backend import create_backend_from_env
+from resource_index import start_index_from_env
+from speech_corrector import SpeechCorrector
+from log_stream import MAX_STREAM_BYTES, format_sse
+from batch_runner import BatchRunner, split_runbook
+from command_planner import CommandPlanner
+from app_logging import configure_logging, get_logger
+from startup import warm_up_in_background
+from session_context import SESSION_HEADER, SessionStore
+from metrics import REGISTRY, REQUEST_SECONDS, TRACE_HEADER, register_component_metrics, stage, traced
+import os
 import json
 
+configure_logging()
+log = get_logger('app')
+
 app = Flask(__name__)
-CORS(app)
+# Browsers may only read the trace headers if they are exposed
+CORS(app, expose_headers=[TRACE_HEADER, 'Server-Timing'])
 
 # Initialize components
-devops_executor = DevOpsExecutor()
-ai_processor = AIProcessor()
-voice_response = VoiceResponse()
+# One speech corrector learns live resource names for both parsing stages
+speech_corrector = SpeechCorrector()
+devops_executor = DevOpsExecutor(backend=create_backend_from_env(), index=start_index_from_env(),
+                                 corrector=speech_corrector)
+ai_processor = AIProcessor(corrector=speech_corrector, contexts=devops_executor.contexts)
+voice_response = create_voice_response()
+batch_runner = BatchRunner(devops_executor, ai_processor, voice_response,
+                           max_workers=int(os.environ.get('BATCH_CONCURRENCY', 8)))
+command_planner = CommandPlanner(batch_runner)
+# Follow-up context per client session ("describe the second one")
+sessions = SessionStore(ttl=float(os.environ.get('SESSION_TTL', 900)),
+                        max_sessions=int(os.environ.get('SESSION_MAX', 1000)))
+register_component_metrics(devops_executor, voice_response)
+# Engines, patterns and API connections are built on first use; WARM_UP=1 starts them now
+warm_up_in_background(voice_response, ai_processor, devops_executor.backend)
+
+def deliver_voice(voice_summary, wants_audio):
+    """Speak the summary, or render it for the browser; returns the clip URL if rendered"""
+    if wants_audio:
+        audio_key = voice_response.audio_clip(voice_summary)
+        if audio_key:
+            return f"/api/audio/{audio_key}.wav"
+    voice_response.speak(voice_summary)
+    return None
+
+def traced_response(payload, trace, wants_trace):
+    """JSON response; with the stage breakdown when the client sent a request ID"""
+    if not wants_trace:
+        return jsonify(payload)
+    payload['trace'] = trace.to_dict()
+    response = jsonify(payload)
+    response.headers[TRACE_HEADER] = trace.request_id
+    response.headers['Server-Timing'] = trace.server_timing()
+    return response
 
 @app.route('/')
 def index():
@@ -19,55 +65,190 @@ def index():
 
 @app.route('/api/voice-command', methods=['POST'])
 def handle_voice_command():
-    try:
-        data = request.get_json()
-        voice_command = data.get('command', '')
-        
-        print(f"\n{'='*50}")
-        print(f"Received voice command: {voice_command}")
-        
-        # Step 1: AI Processing - Understand command
-        ai_analysis = ai_processor.process_command(voice_command)
-        print(f"AI Analysis: {ai_analysis['command_type']}")
-        print(f"Description: {ai_analysis['description']}")
-        
-        # Step 2: Execute DevOps command
-        response = devops_executor.execute_command(voice_command)
-        
-        # Step 3: Generate smart response
-        smart_response = ai_processor.generate_smart_response(response, ai_analysis)
-        
-        # Step 4: Voice response
-        voice_summary = voice_response.generate_summary(smart_response)
-        voice_response.speak(voice_summary)
-        
-        print(f"Response sent to user")
-        print(f"Voice: {voice_summary}")
-        print(f"{'='*50}\n")
-        
-        return jsonify({
+    request_id = request.headers.get(TRACE_HEADER)
+    with traced(request_id) as trace:
+        try:
+            return run_voice_command(request.get_json(), trace, wants_trace=request_id is not None,
+                                     session_id=request.headers.get(SESSION_HEADER))
+        except Exception as e:
+            log.exception("[%s] Voice command failed: %s", trace.request_id, e)
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+
+def run_voice_command(data, trace, wants_trace, session_id=None):
+    voice_command = data.get('command', '')
+    # 'text' renders tables for display; 'records' returns typed rows only
+    output_format = data.get('output', 'text')
+    # Browser plays the summary itself instead of the server speaker
+    wants_audio = data.get('audio', False)
+    # Follow-ups resolve against what this session saw last; no ID, no context
+    context = sessions.get(data.get('session_id') or session_id)
+    
+    log.debug("[%s] Received voice command: %s", trace.request_id, voice_command)
+    
+    # Several requests in one sentence: plan and run them as a graph
+    steps = None
+    if command_planner.is_compound(voice_command):
+        with stage('parse'):
+            steps = command_planner.plan(voice_command, context)
+    if steps is not None:
+        with stage('execute'):
+            result = command_planner.execute(steps, context, data.get('diff', False))
+        with stage('speak'):
+            audio_url = deliver_voice(result['voice_summary'], wants_audio)
+        REQUEST_SECONDS.observe(trace.elapsed_ms() / 1000, intent='compound')
+        log.info("[%s] compound (%d steps) in %.1f ms", trace.request_id, len(steps), trace.elapsed_ms())
+        return traced_response({
             'success': True,
-            'response': smart_response,
+            'response': result['response'],
             'command': voice_command,
+            'steps': result['steps'],
+            'total_ms': result['total_ms'],
+            'audio_url': audio_url,
             'ai_analysis': {
-                'command_type': ai_analysis['command_type'],
-                'description': ai_analysis['description'],
-                'parameters': ai_analysis['parameters']
+                'command_type': 'compound',
+                'description': f"Running {len(steps)} commands",
+                'parameters': {}
             }
-        })
+        }, trace, wants_trace)
+    
+    # Step 1: AI Processing - Understand command
+    with stage('parse'):
+        ai_analysis = ai_processor.process_command(voice_command, context)
+        step = devops_executor.resolve_analysis(ai_analysis)
+    
+    # Step 2: Execute DevOps command (listings as typed records)
+    with stage('execute'):
+        result_set = devops_executor.run_structured(step)
+        if context is not None:
+            # Repeated listings in diff mode return only what changed
+            result_set = context.changes(ai_analysis['command_type'], ai_analysis['parameters'], result_set, data.get('diff', False))
+        if result_set is None:
+            response = devops_executor.execute_step(step)
+        elif output_format == 'records':
+            response = result_set.error or ''
+        else:
+            response = result_set.render()
+        devops_executor.invalidate_for_intent(ai_analysis['command_type'])
+        if context is not None:
+            context.remember(result_set)
+    
+    # Step 3: Generate smart response
+    with stage('summarize'):
+        smart_response = ai_processor.generate_smart_response(response, ai_analysis, result_set)
+        voice_summary = voice_response.generate_summary(smart_response, result_set)
+    
+    # Step 4: Voice response
+    with stage('speak'):
+        audio_url = deliver_voice(voice_summary, wants_audio)
+    
+    # Offer a live tail for log commands
+    log_stream = log_stream_url(step[1]) if step[0] == 'logs' else None
     
+    REQUEST_SECONDS.observe(trace.elapsed_ms() / 1000, intent=ai_analysis['command_type'])
+    log.info("[%s] %s in %.1f ms (%s)", trace.request_id, ai_analysis['command_type'], trace.elapsed_ms(), trace.server_timing())
+    
+    return traced_response({
+        'success': True,
+        'response': smart_response,
+        'command': voice_command,
+        'log_stream': log_stream,
+        'audio_url': audio_url,
+        'records': result_set.to_dicts() if result_set is not None and output_format == 'records' else None,
+        'ai_analysis': {
+            'command_type': ai_analysis['command_type'],
+            'description': ai_analysis['description'],
+            'parameters': ai_analysis['parameters']
+        }
+    }, trace, wants_trace)
+
+@app.route('/api/voice-commands/batch', methods=['POST'])
+def handle_batch_commands():
+    data = request.get_json() or {}
+    try:
+        commands = split_runbook(data.get('commands', []))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    log.info("Received batch of %d commands", len(commands))
+    
+    if data.get('stream'):
+        # One JSON object per line, in completion order
+        def generate():
+            results = []
+            for result in batch_runner.run(commands):
+                results.append(result)
+                yield json.dumps(result) + '\n'
+            summary = batch_runner.summarize(results)
+            voice_response.speak(summary)
+            yield json.dumps({'done': True, 'voice_summary': summary}) + '\n'
+        
+        return Response(generate(), mimetype='application/x-ndjson')
+    
+    try:
+        results = batch_runner.run_ordered(commands)
     except Exception as e:
-        print(f"Error: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        log.exception("Batch failed: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    summary = batch_runner.summarize(results)
+    voice_response.speak(summary)
+    return jsonify({'success': True, 'results': results, 'voice_summary': summary})
+
+@app.route('/api/logs/stream')
+def stream_logs():
+    name = request.args.get('name', '')
+    namespace = request.args.get('namespace')
+    tail = request.args.get('tail', 30, type=int)
+    max_bytes = min(request.args.get('max_bytes', 1024 * 1024, type=int), MAX_STREAM_BYTES)
+    
+    try:
+        stream = devops_executor.stream_logs(name, tail=tail, max_bytes=max_bytes, namespace=namespace)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def generate():
+        # Closing this generator (client disconnect) kills the follower process
+        try:
+            for line in stream.lines():
+                yield format_sse(line)
+            yield format_sse('truncated' if stream.truncated else 'eof', event='end')
+        finally:
+            stream.close()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/audio/<key>.wav')
+def audio_clip(key):
+    path = voice_response.audio_cache.file_for(key)
+    if path is None:
+        return jsonify({'success': False, 'error': 'Clip not found'}), 404
+    # Keys are content hashes, so a clip never changes
+    return send_file(path, mimetype='audio/wav', max_age=31536000)
+
+@app.route('/api/system-health')
+def system_health():
+    return jsonify(devops_executor.health_report())
+
+@app.route('/api/tts-metrics')
+def tts_metrics():
+    return jsonify(voice_response.metrics())
+
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 @app.route('/api/health')
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'voice-devops-assistant'})
 
 if __name__ == '__main__':
+    # Development server; use serve.py for production
     print("Starting Voice DevOps Assistant...")
     print("Server running on: http://localhost:5000")
-    app.run(debug=True, host='127.0.0.1', port=5000)
\ No newline at end of file
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='127.0.0.1', port=5000)
\ No newline at end of file
@@ -0,0 +1,37 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+_listener = None
+
+
+def configure_logging(level=None, stream=None):
+    """Send the assistant's log records through a queue to one writer thread
+
+    Request threads only enqueue a record; formatting and the write to
+    stderr happen on the listener thread. LOG_LEVEL sets the level (INFO).
+    """
+    global _listener
+    logger = logging.getLogger('voice')
+    logger.setLevel((level or os.environ.get('LOG_LEVEL', 'INFO')).upper())
+    if _listener is not None:
+        return logger
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    records = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    logger.propagate = False
+
+    _listener = QueueListener(records, handler)
+    _listener.start()
+    # Flush what is still queued on interpreter exit
+    atexit.register(_listener.stop)
+    return logger
+
+
+def get_logger(name):
+    return logging.getLogger(f'voice.{name}')
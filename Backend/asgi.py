@@ -0,0 +1,365 @@
+"""ASGI entry point for the async request pipeline
+
+Run with an ASGI server, e.g.:  uvicorn asgi:app --port 5000
+"""
+import asyncio
+import json
+import os
+from urllib.parse import parse_qs
+from async_executor import AsyncDevOpsExecutor
+from devops_executor import DevOpsExecutor, log_stream_url
+from ai_processor import AIProcessor
+from speech_service import create_voice_response
+from api_backend import create_backend_from_env
+from resource_index import start_index_from_env
+from speech_corrector import SpeechCorrector
+from log_stream import MAX_STREAM_BYTES, close_all_streams, format_sse
+from batch_runner import BatchRunner, split_runbook
+from command_planner import CommandPlanner
+from app_logging import configure_logging, get_logger
+from startup import warm_up_in_background
+from session_context import SESSION_HEADER, SessionStore
+from metrics import REGISTRY, REQUEST_SECONDS, TRACE_HEADER, register_component_metrics, stage, traced
+
+configure_logging()
+log = get_logger('asgi')
+
+# Initialize components
+# One speech corrector learns live resource names for both parsing stages
+speech_corrector = SpeechCorrector()
+async_executor = AsyncDevOpsExecutor(DevOpsExecutor(backend=create_backend_from_env(), index=start_index_from_env(),
+                                                 corrector=speech_corrector))
+ai_processor = AIProcessor(corrector=speech_corrector, contexts=async_executor.executor.contexts)
+voice_response = create_voice_response()
+batch_runner = BatchRunner(async_executor.executor, ai_processor, voice_response,
+                           max_workers=int(os.environ.get('BATCH_CONCURRENCY', 8)))
+command_planner = CommandPlanner(batch_runner)
+# Follow-up context per client session ("describe the second one")
+sessions = SessionStore(ttl=float(os.environ.get('SESSION_TTL', 900)),
+                        max_sessions=int(os.environ.get('SESSION_MAX', 1000)))
+register_component_metrics(async_executor.executor, voice_response, async_executor)
+# Engines, patterns and API connections are built on first use; WARM_UP=1 starts them now
+warm_up_in_background(voice_response, ai_processor, async_executor.executor.backend)
+
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-headers', f'Content-Type, {TRACE_HEADER}, {SESSION_HEADER}'.encode()),
+    (b'access-control-allow-methods', b'GET, POST, OPTIONS'),
+    (b'access-control-expose-headers', f'{TRACE_HEADER}, Server-Timing'.encode()),
+]
+
+
+async def send_json(send, payload, status=200, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())] + list(headers) + CORS_HEADERS,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def header(scope, name):
+    """First value of a request header, or None"""
+    name = name.lower().encode()
+    for key, value in scope.get('headers', []):
+        if key == name:
+            return value.decode('latin-1')
+    return None
+
+
+def traced_response(payload, trace, wants_trace):
+    """(payload, extra headers); with the stage breakdown when the client sent a request ID"""
+    if not wants_trace:
+        return payload, []
+    payload['trace'] = trace.to_dict()
+    return payload, [(TRACE_HEADER.lower().encode(), trace.request_id.encode()),
+                     (b'server-timing', trace.server_timing().encode())]
+
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise asyncio.CancelledError()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def deliver_voice(voice_summary, wants_audio):
+    """Speak the summary, or render it for the browser; returns the clip URL if rendered"""
+    if wants_audio:
+        audio_key = await asyncio.to_thread(voice_response.audio_clip, voice_summary)
+        if audio_key:
+            return f"/api/audio/{audio_key}.wav"
+    voice_response.speak(voice_summary)
+    return None
+
+
+async def handle_voice_command(data, request_id=None, session_id=None):
+    with traced(request_id) as trace:
+        return await run_voice_command(data, trace, wants_trace=request_id is not None, session_id=session_id)
+
+
+async def run_voice_command(data, trace, wants_trace, session_id=None):
+    voice_command = data.get('command', '')
+    # 'text' renders tables for display; 'records' returns typed rows only
+    output_format = data.get('output', 'text')
+    # Browser plays the summary itself instead of the server speaker
+    wants_audio = data.get('audio', False)
+    # Follow-ups resolve against what this session saw last; no ID, no context
+    context = sessions.get(data.get('session_id') or session_id)
+
+    log.debug("[%s] Received voice command: %s", trace.request_id, voice_command)
+
+    # Several requests in one sentence: plan and run them as a graph
+    steps = None
+    if command_planner.is_compound(voice_command):
+        with stage('parse'):
+            steps = await asyncio.to_thread(command_planner.plan, voice_command, context)
+    if steps is not None:
+        with stage('execute'):
+            result = await command_planner.aexecute(async_executor, steps, context, data.get('diff', False))
+        with stage('speak'):
+            audio_url = await deliver_voice(result['voice_summary'], wants_audio)
+        REQUEST_SECONDS.observe(trace.elapsed_ms() / 1000, intent='compound')
+        log.info("[%s] compound (%d steps) in %.1f ms", trace.request_id, len(steps), trace.elapsed_ms())
+        return traced_response({
+            'success': True,
+            'response': result['response'],
+            'command': voice_command,
+            'steps': result['steps'],
+            'total_ms': result['total_ms'],
+            'audio_url': audio_url,
+            'ai_analysis': {
+                'command_type': 'compound',
+                'description': f"Running {len(steps)} commands",
+                'parameters': {}
+            }
+        }, trace, wants_trace)
+
+    # Step 1: AI Processing - Understand command
+    with stage('parse'):
+        ai_analysis = ai_processor.process_command(voice_command, context)
+        step = async_executor.executor.resolve_analysis(ai_analysis)
+
+    # Step 2: Execute DevOps command (listings as typed records)
+    with stage('execute'):
+        result_set = await async_executor.run_structured(step)
+        if context is not None:
+            # Repeated listings in diff mode return only what changed
+            result_set = context.changes(ai_analysis['command_type'], ai_analysis['parameters'], result_set, data.get('diff', False))
+        if result_set is None:
+            response = await async_executor.execute_step(step)
+        elif output_format == 'records':
+            response = result_set.error or ''
+        else:
+            response = result_set.render()
+        async_executor.executor.invalidate_for_intent(ai_analysis['command_type'])
+        if context is not None:
+            context.remember(result_set)
+
+    # Step 3: Generate smart response
+    with stage('summarize'):
+        smart_response = ai_processor.generate_smart_response(response, ai_analysis, result_set)
+        voice_summary = voice_response.generate_summary(smart_response, result_set)
+
+    # Step 4: Voice response
+    with stage('speak'):
+        audio_url = await deliver_voice(voice_summary, wants_audio)
+
+    REQUEST_SECONDS.observe(trace.elapsed_ms() / 1000, intent=ai_analysis['command_type'])
+    log.info("[%s] %s in %.1f ms (%s)", trace.request_id, ai_analysis['command_type'], trace.elapsed_ms(), trace.server_timing())
+
+    return traced_response({
+        'success': True,
+        'response': smart_response,
+        'command': voice_command,
+        'log_stream': log_stream_url(step[1]) if step[0] == 'logs' else None,
+        'audio_url': audio_url,
+        'records': result_set.to_dicts() if result_set is not None and output_format == 'records' else None,
+        'ai_analysis': {
+            'command_type': ai_analysis['command_type'],
+            'description': ai_analysis['description'],
+            'parameters': ai_analysis['parameters']
+        }
+    }, trace, wants_trace)
+
+
+async def handle_batch(data, send):
+    try:
+        commands = split_runbook(data.get('commands', []))
+    except ValueError as e:
+        await send_json(send, {'success': False, 'error': str(e)}, 400)
+        return
+
+    if not data.get('stream'):
+        results = [result async for result in batch_runner.arun(async_executor, commands)]
+        results.sort(key=lambda result: result['index'])
+        summary = batch_runner.summarize(results)
+        voice_response.speak(summary)
+        await send_json(send, {'success': True, 'results': results, 'voice_summary': summary})
+        return
+
+    # One JSON object per line, in completion order
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/x-ndjson')] + CORS_HEADERS,
+    })
+    results = []
+    async for result in batch_runner.arun(async_executor, commands):
+        results.append(result)
+        await send({'type': 'http.response.body', 'body': (json.dumps(result) + '\n').encode(), 'more_body': True})
+    summary = batch_runner.summarize(results)
+    voice_response.speak(summary)
+    await send({'type': 'http.response.body', 'body': (json.dumps({'done': True, 'voice_summary': summary}) + '\n').encode()})
+
+
+async def stream_logs(scope, send):
+    query = parse_qs(scope.get('query_string', b'').decode())
+    name = query.get('name', [''])[0]
+    namespace = query.get('namespace', [None])[0]
+    try:
+        tail = int(query.get('tail', ['30'])[0])
+        max_bytes = min(int(query.get('max_bytes', [str(1024 * 1024)])[0]), MAX_STREAM_BYTES)
+        # Container lookup is a short blocking docker call
+        stream = await asyncio.to_thread(async_executor.executor.stream_logs, name, tail, max_bytes, namespace)
+    except ValueError as e:
+        await send_json(send, {'success': False, 'error': str(e)}, 400)
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache')] + CORS_HEADERS,
+    })
+    try:
+        # Awaiting send() applies the client's backpressure to the reader
+        async for line in stream.alines():
+            await send({'type': 'http.response.body', 'body': format_sse(line).encode(), 'more_body': True})
+        end = format_sse('truncated' if stream.truncated else 'eof', event='end')
+        await send({'type': 'http.response.body', 'body': end.encode()})
+    finally:
+        stream.close()
+
+
+async def send_audio(send, key):
+    path = voice_response.audio_cache.file_for(key)
+    if path is None:
+        await send_json(send, {'success': False, 'error': 'Clip not found'}, 404)
+        return
+    with open(path, 'rb') as f:
+        body = f.read()
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        # Keys are content hashes, so a clip never changes
+        'headers': [(b'content-type', b'audio/wav'), (b'cache-control', b'public, max-age=31536000')] + CORS_HEADERS,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def run_until_disconnect(receive, coroutine):
+    """Run coroutine, cancelling it (and its subprocesses) if the client goes away"""
+    work = asyncio.ensure_future(coroutine)
+
+    async def watch():
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                work.cancel()
+                return
+
+    watcher = asyncio.ensure_future(watch())
+    try:
+        return await work
+    finally:
+        watcher.cancel()
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                # Requests are done; end log followers and let CLI calls finish
+                close_all_streams()
+                await async_executor.drain(float(os.environ.get('GRACEFUL_TIMEOUT', 30)))
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+
+    if method == 'OPTIONS':
+        await send({'type': 'http.response.start', 'status': 204, 'headers': CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    if path == '/':
+        body = b'Voice DevOps Assistant is Running!'
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain')] + CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': body})
+        return
+
+    if path == '/api/health':
+        await send_json(send, {'status': 'healthy', 'service': 'voice-devops-assistant'})
+        return
+
+    if path == '/metrics':
+        body = REGISTRY.render().encode()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain; version=0.0.4; charset=utf-8')] + CORS_HEADERS})
+        await send({'type': 'http.response.body', 'body': body})
+        return
+
+    if path == '/api/tts-metrics':
+        await send_json(send, voice_response.metrics())
+        return
+
+    if path.startswith('/api/audio/') and path.endswith('.wav'):
+        await send_audio(send, path[len('/api/audio/'):-len('.wav')])
+        return
+
+    if path == '/api/system-health':
+        await send_json(send, await asyncio.to_thread(async_executor.executor.health_report))
+        return
+
+    if path == '/api/logs/stream':
+        try:
+            await run_until_disconnect(receive, stream_logs(scope, send))
+        except asyncio.CancelledError:
+            pass
+        return
+
+    if path == '/api/voice-command' and method == 'POST':
+        try:
+            data = json.loads(await read_body(receive) or b'{}')
+            result, headers = await run_until_disconnect(receive, handle_voice_command(data, header(scope, TRACE_HEADER), header(scope, SESSION_HEADER)))
+        except asyncio.CancelledError:
+            # Client disconnected; nothing left to send
+            return
+        except Exception as e:
+            log.exception("Voice command failed: %s", e)
+            await send_json(send, {'success': False, 'error': str(e)}, 500)
+            return
+        await send_json(send, result, headers=headers)
+        return
+
+    if path == '/api/voice-commands/batch' and method == 'POST':
+        try:
+            data = json.loads(await read_body(receive) or b'{}')
+            await run_until_disconnect(receive, handle_batch(data, send))
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            await send_json(send, {'success': False, 'error': str(e)}, 500)
+        return
+
+    await send_json(send, {'success': False, 'error': 'Not found'}, 404)
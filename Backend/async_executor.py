@@ -0,0 +1,295 @@
+import asyncio
+import os
+import shlex
+import signal
+import time
+from devops_executor import DevOpsExecutor, STRUCTURED_COMMANDS, structured_base, in_namespace, finish_log_query, log_target
+from log_stream import LogStream
+from log_query import LogQueryResult, MAX_QUERY_BYTES, QUERY_TIMEOUT, log_query_args
+from result_cache import normalize_command
+from cluster_fanout import ClusterResult, context_command
+from metrics import SUBPROCESSES, SUBPROCESS_TIMEOUTS, observe_execute
+
+
+class AsyncDevOpsExecutor:
+    """asyncio execution path for DevOps commands
+
+    Reuses DevOpsExecutor for command resolution, output formatting, the
+    result cache and the optional API backend, but runs the CLIs with
+    asyncio.create_subprocess_exec under a per-backend concurrency limit.
+    Cancelling a call (e.g. on client disconnect) kills its child process.
+    """
+
+    def __init__(self, executor=None, kubectl_concurrency=None, docker_concurrency=None, timeout=10):
+        self.executor = executor if executor is not None else DevOpsExecutor()
+        self.timeout = timeout
+        self.limits = {
+            'kubectl': asyncio.Semaphore(kubectl_concurrency or int(os.environ.get('KUBECTL_CONCURRENCY', 64))),
+            'docker': asyncio.Semaphore(docker_concurrency or int(os.environ.get('DOCKER_CONCURRENCY', 32))),
+        }
+        # (tool, kube context, command) -> [task, waiter count] for coalescing identical reads
+        self._inflight = {}
+        # Child processes still running, for drain() on shutdown
+        self._processes = set()
+
+    def inflight_count(self):
+        """Distinct reads currently being loaded (each shared by one or more callers)"""
+        return len(self._inflight)
+
+    async def execute_command(self, voice_command):
+        """Execute DevOps commands based on voice input"""
+        return await self.execute_step(self.executor.resolve_command(voice_command))
+
+    async def execute_step(self, step):
+        """Run a step, reporting failures as the response text"""
+        try:
+            return await self.run_step(step)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+
+    async def run_step(self, step):
+        """Run a step produced by DevOpsExecutor.resolve_analysis or resolve_command"""
+        kind, argument = step
+        if kind == 'kubectl':
+            return await self.run_kubectl(argument)
+        if kind == 'docker':
+            return await self.run_docker(argument)
+        if kind == 'health':
+            return await self.check_system_health()
+        if kind == 'logs':
+            # Try Docker first, unless a namespace says it is a pod
+            if log_target(argument)[1] is None:
+                docker_result = await self.get_docker_logs(argument)
+                if 'Error' not in docker_result:
+                    return docker_result
+            # Fallback to kubectl
+            return await self.run_kubectl(f'logs {argument} --tail=50')
+        if kind == 'log_query':
+            return (await self.query_logs(argument)).render()
+        if kind == 'clusters':
+            return (await self.query_clusters(argument)).render()
+        return argument
+
+    async def run_structured(self, step):
+        """Async DevOpsExecutor.run_structured"""
+        if step[0] == 'log_query':
+            return await self.query_logs(step[1])
+        if step[0] == 'clusters':
+            return await self.query_clusters(step[1])
+
+        base, namespace = structured_base(step)
+        spec = STRUCTURED_COMMANDS.get(base)
+        if spec is None:
+            return None
+
+        tool = step[0]
+        if self.executor.index is not None and namespace is None:
+            indexed = self.executor.index.answer_records(tool, step[1])
+            if indexed is not None:
+                return indexed
+
+        kind, command = spec
+        command = in_namespace(command, {'namespace': namespace})
+        output = await self.run_kubectl(command) if tool == 'kubectl' else await self.run_docker(command)
+        return self.executor.observe(step, self.executor.parse_structured(tool, kind, output))
+
+    async def query_clusters(self, query):
+        """Async DevOpsExecutor.query_clusters; a cluster past its timeout has its kubectl killed"""
+        kind, command, contexts, unknown = await asyncio.to_thread(self.executor.plan_clusters, query)
+        timeout = self.executor.cluster_timeout
+        result = ClusterResult(query, kind)
+        for name in unknown:
+            result.fail(name, 'no such context')
+
+        async def one(context):
+            try:
+                return await asyncio.wait_for(self.run_kubectl(context_command(command, context, timeout)), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        outputs = await asyncio.gather(*(one(context) for context in contexts))
+        for context, output in zip(contexts, outputs):
+            if output is None:
+                result.fail(context, f"timed out after {timeout:g} s")
+            else:
+                result.add(context, self.executor.parse_structured('kubectl', kind, output))
+        return result.finish()
+
+    async def run_kubectl(self, command):
+        """Execute kubectl commands"""
+        return await self._run_with_cache('kubectl', command)
+
+    async def run_docker(self, command):
+        """Execute docker commands"""
+        return await self._run_with_cache('docker', command)
+
+    async def _run_with_cache(self, tool, command):
+        if self.executor.index is not None:
+            indexed = self.executor.index.answer(tool, command)
+            if indexed is not None:
+                return indexed
+
+        cache = self.executor.cache
+        if cache.is_mutating(tool, command):
+            result = await self._run_tool(tool, command)
+            cache.invalidate_command(tool, command)
+            return result
+
+        if not cache.is_cacheable(tool, command):
+            return await self._run_tool(tool, command)
+
+        cached = cache.lookup(tool, command)
+        if cached is not None:
+            return cached
+        return await self._coalesced(tool, command)
+
+    async def _coalesced(self, tool, command):
+        """Share one load between concurrent identical reads against the same cluster"""
+        context = self.executor.cache.current_kube_context() if tool == 'kubectl' else ''
+        key = (tool, context, normalize_command(command))
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(self._load_and_store(tool, command))
+            flight = [task, 0]
+            self._inflight[key] = flight
+            task.add_done_callback(lambda _: self._inflight.pop(key, None) if self._inflight.get(key) is flight else None)
+
+        flight[1] += 1
+        try:
+            return await asyncio.shield(flight[0])
+        finally:
+            flight[1] -= 1
+            # Last interested caller went away: stop the shared subprocess
+            if flight[1] == 0 and not flight[0].done():
+                flight[0].cancel()
+                # Still unwinding; a new caller must not join a cancelled load
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+
+    async def _load_and_store(self, tool, command):
+        generation = self.executor.cache.generation(tool, command)
+        result = await self._run_tool(tool, command)
+        if not result.startswith(('❌', '⏱️')):
+            self.executor.cache.store(tool, command, result, generation)
+        return result
+
+    async def _run_tool(self, tool, command):
+        async with self.limits[tool]:
+            if self.executor.backend is not None:
+                result = await asyncio.to_thread(self.executor.run_backend, tool, command)
+                if result is not None:
+                    return result
+
+            started = time.perf_counter()
+            try:
+                completed = await self._exec([tool] + shlex.split(command), self.timeout)
+            except OSError as e:
+                return f"❌ Error running {tool}: {str(e)}"
+            finally:
+                observe_execute(tool, command, 'cli', started)
+
+        if completed is None:
+            return "⏱️ Command timeout. Please try again."
+        if tool == 'kubectl':
+            return self.executor.format_kubectl_result(*completed)
+        return self.executor.format_docker_result(*completed)
+
+    async def _exec(self, args, timeout):
+        """Run a process; returns (returncode, stdout, stderr) or None on timeout"""
+        SUBPROCESSES.inc(tool=args[0])
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True
+            )
+        except FileNotFoundError:
+            return (127, '', f"{args[0]}: command not found")
+
+        self._processes.add(process)
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            SUBPROCESS_TIMEOUTS.inc(tool=args[0])
+            await self._kill(process)
+            return None
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+        finally:
+            self._processes.discard(process)
+
+        return (process.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace'))
+
+    async def _kill(self, process):
+        if process.returncode is None:
+            # Kill the whole process group so wrapper scripts don't leak children
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                process.kill()
+            await process.wait()
+
+    async def drain(self, timeout):
+        """Let running CLI processes finish for up to timeout seconds, then kill the rest"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._processes and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        for process in list(self._processes):
+            await self._kill(process)
+
+    async def query_logs(self, query):
+        """Async DevOpsExecutor.query_logs; cancelling it kills the log reader"""
+        container = None
+        if query.namespace is None:
+            async with self.limits['docker']:
+                ps_result = await self._exec(
+                    ['docker', 'ps', '--filter', f'name={query.target}', '--format', '{{.Names}}'], 5
+                )
+            container = ps_result[1].strip().split('\n')[0] if ps_result and ps_result[0] == 0 and ps_result[1].strip() else None
+
+        args = log_query_args(query, container)
+        stream = LogStream(args, max_bytes=MAX_QUERY_BYTES, timeout=QUERY_TIMEOUT, merge_stderr=False)
+        result = LogQueryResult(query)
+        started = time.perf_counter()
+        async for line in stream.alines():
+            result.feed(line)
+        observe_execute(args[0], 'logs', 'cli', started)
+        return finish_log_query(result, stream)
+
+    async def get_docker_logs(self, container_name):
+        """Get logs from Docker container"""
+        try:
+            async with self.limits['docker']:
+                # First, find container with matching name
+                ps_result = await self._exec(
+                    ['docker', 'ps', '--filter', f'name={container_name}', '--format', '{{.Names}}'], 5
+                )
+
+                if ps_result and ps_result[0] == 0 and ps_result[1].strip():
+                    actual_name = ps_result[1].strip().split('\n')[0]
+
+                    # Get logs
+                    logs_result = await self._exec(['docker', 'logs', actual_name, '--tail', '30'], 5)
+
+                    if logs_result and logs_result[0] == 0:
+                        logs = logs_result[1].strip()
+                        if logs:
+                            return f"✅ Docker Logs for {actual_name}:\n{logs}"
+                        else:
+                            return f"✅ Container {actual_name} has no logs yet"
+
+            return f"❌ No running container found with name: {container_name}"
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return f"❌ Error getting Docker logs: {str(e)}"
+
+    async def check_system_health(self):
+        """Check system health; the probes already run concurrently"""
+        return await asyncio.to_thread(self.executor.check_system_health)
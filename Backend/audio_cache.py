@@ -0,0 +1,124 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+# Phrases the summaries start with, rendered ahead of time
+COMMON_PHRASES = [
+    "Command executed successfully",
+    "Command failed with an error",
+    "No resources found",
+    "Command completed",
+] + [f"Found {n} running {noun}{'s' if n != 1 else ''}" for noun in ('pod', 'container', 'item') for n in range(11)]
+
+KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class AudioCache:
+    """Size-bounded on-disk cache of rendered speech clips, keyed by voice + text"""
+
+    def __init__(self, renderer, directory=None, max_bytes=None, voice='default'):
+        self.renderer = renderer  # renderer(text, path) -> True on success
+        self.directory = directory or os.environ.get('TTS_AUDIO_DIR') or os.path.join(tempfile.gettempdir(), 'voice-devops-audio')
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.environ.get('TTS_AUDIO_MAX_BYTES', 64 * 1024 * 1024))
+        self.voice = voice
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> Event set when the render finishes
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def key_for(self, text):
+        return hashlib.sha256(f"{self.voice}\0{text}".encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def file_for(self, key):
+        """Path of a cached clip, or None for unknown or malformed keys"""
+        if not KEY_PATTERN.match(key):
+            return None
+        path = self.path_for(key)
+        return path if os.path.exists(path) else None
+
+    def get_or_render(self, text):
+        """Key of the clip for text, rendering it once on a miss; None if rendering failed"""
+        key = self.key_for(text)
+        path = self.path_for(key)
+
+        while True:
+            with self._lock:
+                if os.path.exists(path):
+                    self.hits += 1
+                    os.utime(path)  # mark as recently used
+                    return key
+                waiting = self._inflight.get(key)
+                if waiting is None:
+                    self.misses += 1
+                    done = self._inflight[key] = threading.Event()
+                    break
+            # Someone else is rendering the same clip: wait, then re-check
+            waiting.wait()
+            if not os.path.exists(path):
+                return None
+
+        try:
+            return key if self._render(text, path) else None
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            done.set()
+
+    def _render(self, text, path):
+        fd, tmp_path = tempfile.mkstemp(suffix='.wav', dir=self.directory)
+        os.close(fd)
+        try:
+            if not self.renderer(text, tmp_path) or os.path.getsize(tmp_path) == 0:
+                return False
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        with self._lock:
+            self._total_bytes += size
+        self._evict(keep=os.path.basename(path))
+        return True
+
+    def _entries(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.wav') and KEY_PATTERN.match(name[:-4]):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                yield name, stat.st_size, stat.st_mtime
+
+    def _evict(self, keep=None):
+        """Drop least recently used clips until the cache fits in max_bytes"""
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            for name, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+                if self._total_bytes <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                self._total_bytes -= size
+
+    def prerender(self, phrases):
+        """Render phrases in the background so first requests hit the cache"""
+        thread = threading.Thread(target=lambda: [self.get_or_render(p) for p in phrases],
+                                  name='audio-prerender', daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'bytes': self._total_bytes, 'max_bytes': self.max_bytes}
@@ -0,0 +1,148 @@
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_BATCH_COMMANDS = 50
+
+
+def split_runbook(commands):
+    """Normalize a batch payload: a list of utterances, or one string with one per line/semicolon"""
+    if isinstance(commands, str):
+        commands = re.split(r'[\n;]+', commands)
+    if not isinstance(commands, list):
+        raise ValueError("'commands' must be a list of strings")
+    commands = [str(c).strip() for c in commands if str(c).strip()]
+    if not commands:
+        raise ValueError("No commands given")
+    if len(commands) > MAX_BATCH_COMMANDS:
+        raise ValueError(f"Too many commands ({len(commands)}); the limit is {MAX_BATCH_COMMANDS}")
+    return commands
+
+
+class BatchItem:
+    """One utterance of a batch and the executor step it resolved to"""
+
+    __slots__ = ('index', 'command', 'ai_analysis', 'step')
+
+    def __init__(self, index, command, ai_analysis, step):
+        self.index = index
+        self.command = command
+        self.ai_analysis = ai_analysis
+        self.step = step
+
+
+class BatchRunner:
+    """Runs many voice commands at once, executing each distinct step only once
+
+    Read-only steps run concurrently under a worker limit. A mutating step is
+    a barrier: everything before it finishes first, everything after waits.
+    """
+
+    def __init__(self, executor, ai_processor, voice_response, max_workers=8):
+        self.executor = executor
+        self.ai_processor = ai_processor
+        self.voice_response = voice_response
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='batch')
+
+    def plan(self, commands):
+        """Parse every utterance once; returns phases of {step: [BatchItem, ...]}"""
+        phases = [{}]
+        for index, command in enumerate(commands):
+            ai_analysis = self.ai_processor.process_command(command)
+            item = BatchItem(index, command, ai_analysis, self.executor.resolve_analysis(ai_analysis))
+            if self.is_mutating(item.step):
+                phases.append({item.step: [item]})
+                phases.append({})
+            else:
+                phases[-1].setdefault(item.step, []).append(item)
+        return [phase for phase in phases if phase]
+
+    def is_mutating(self, step):
+        kind, argument = step
+        return kind in ('kubectl', 'docker') and self.executor.cache.is_mutating(kind, argument)
+
+    def run_step(self, step):
+        """Execute one distinct step: (response, result_set, elapsed_ms)"""
+        start = time.perf_counter()
+        try:
+            result_set = self.executor.run_structured(step)
+            response = result_set.render() if result_set is not None else self.executor.run_step(step)
+        except Exception as e:
+            result_set, response = None, f"Error executing command: {str(e)}"
+        return response, result_set, (time.perf_counter() - start) * 1000
+
+    async def arun_step(self, async_executor, step):
+        start = time.perf_counter()
+        try:
+            result_set = await async_executor.run_structured(step)
+            response = result_set.render() if result_set is not None else await async_executor.run_step(step)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result_set, response = None, f"Error executing command: {str(e)}"
+        return response, result_set, (time.perf_counter() - start) * 1000
+
+    def results_for(self, items, response, result_set, elapsed_ms):
+        """Per-utterance results for every item that shared one step"""
+        results = []
+        for item in items:
+            smart_response = self.ai_processor.generate_smart_response(response, item.ai_analysis, result_set)
+            results.append({
+                'index': item.index,
+                'command': item.command,
+                'success': not response.startswith('❌') and not response.startswith('Error'),
+                'response': smart_response,
+                'voice_summary': self.voice_response.generate_summary(smart_response, result_set),
+                'shared': len(items) > 1,
+                'elapsed_ms': round(elapsed_ms, 1),
+                'ai_analysis': {
+                    'command_type': item.ai_analysis['command_type'],
+                    'description': item.ai_analysis['description'],
+                    'parameters': item.ai_analysis['parameters']
+                }
+            })
+        return results
+
+    def finish_phase(self, phase):
+        for items in phase.values():
+            for item in items:
+                self.executor.invalidate_for_intent(item.ai_analysis['command_type'])
+
+    def run(self, commands):
+        """Yield per-utterance results as each distinct step completes"""
+        for phase in self.plan(commands):
+            futures = {self.pool.submit(self.run_step, step): items for step, items in phase.items()}
+            for future in as_completed(futures):
+                yield from self.results_for(futures[future], *future.result())
+            self.finish_phase(phase)
+
+    def run_ordered(self, commands):
+        return sorted(self.run(commands), key=lambda result: result['index'])
+
+    async def arun(self, async_executor, commands):
+        """Async version of run() on an AsyncDevOpsExecutor"""
+        limit = asyncio.Semaphore(self.max_workers)
+
+        async def run_limited(step, items):
+            async with limit:
+                return items, await self.arun_step(async_executor, step)
+
+        for phase in await asyncio.to_thread(self.plan, commands):
+            tasks = [asyncio.ensure_future(run_limited(step, items)) for step, items in phase.items()]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    items, outcome = await next_done
+                    for result in self.results_for(items, *outcome):
+                        yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+            self.finish_phase(phase)
+
+    def summarize(self, results):
+        """One spoken line for the whole batch"""
+        failed = sum(1 for result in results if not result['success'])
+        summary = f"Ran {len(results)} command{'s' if len(results) != 1 else ''}"
+        return summary + (f", {failed} failed" if failed else ", all succeeded")
@@ -0,0 +1,181 @@
+import math
+import os
+import re
+import shlex
+import subprocess
+from api_backend import render_table
+from records import RECORD_TYPES, ResultSet
+from metrics import SUBPROCESSES, SUBPROCESS_TIMEOUTS
+
+ALL_CONTEXTS = 'all'
+# Seconds each cluster gets before it is reported as timed out
+DEFAULT_CLUSTER_TIMEOUT = float(os.environ.get('CLUSTER_TIMEOUT', 5))
+
+
+class ClusterQuery:
+    """A kubectl listing to run against several kubeconfig contexts"""
+
+    __slots__ = ('command', 'contexts', 'failing')
+
+    def __init__(self, command, contexts=ALL_CONTEXTS, failing=False):
+        self.command = command    # executor kubectl command, e.g. "get pods -n prod"
+        self.contexts = contexts  # ALL_CONTEXTS or a tuple of spoken context names
+        self.failing = failing    # keep only records in an unhealthy state
+
+    def key(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, ClusterQuery) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"ClusterQuery{self.key()}"
+
+
+def context_command(command, context, timeout):
+    """The per-cluster command: flags go last so cache tags still see the verb"""
+    return f"{command} --context={shlex.quote(context)} --request-timeout={max(1, math.ceil(timeout))}s"
+
+
+def context_words(context):
+    """Spoken-name tokens of a context: kind-prod-eu -> {kind, prod, eu, kind-prod-eu}"""
+    return {context.lower(), *re.split(r'[-_.:/@]+', context.lower())}
+
+
+class KubeContexts:
+    """kubeconfig context names, re-listed only when the kubeconfig changes"""
+
+    def __init__(self, timeout=5):
+        self.timeout = timeout
+        self._stamp = None
+        self._names = []
+        self._namespace_stamp = None
+        self._namespace = None
+
+    def _kubeconfig_stamp(self):
+        stamp = []
+        for path in (os.environ.get('KUBECONFIG') or os.path.expanduser('~/.kube/config')).split(os.pathsep):
+            try:
+                stamp.append((path, os.path.getmtime(path)))
+            except OSError:
+                stamp.append((path, None))
+        return tuple(stamp)
+
+    def names(self):
+        stamp = self._kubeconfig_stamp()
+        if stamp != self._stamp:
+            SUBPROCESSES.inc(tool='kubectl')
+            try:
+                result = subprocess.run(['kubectl', 'config', 'get-contexts', '-o', 'name'],
+                                        capture_output=True, text=True, timeout=self.timeout)
+                names = result.stdout.split() if result.returncode == 0 else []
+            except subprocess.TimeoutExpired:
+                SUBPROCESS_TIMEOUTS.inc(tool='kubectl')
+                names = []
+            except OSError:
+                names = []
+            self._stamp, self._names = stamp, names
+        return list(self._names)
+
+    def namespace(self):
+        """Namespace kubectl uses in the current context, or None if kubectl could not say"""
+        stamp = self._kubeconfig_stamp()
+        if stamp != self._namespace_stamp:
+            SUBPROCESSES.inc(tool='kubectl')
+            try:
+                result = subprocess.run(['kubectl', 'config', 'view', '--minify', '-o', 'jsonpath={..namespace}'],
+                                        capture_output=True, text=True, timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                SUBPROCESS_TIMEOUTS.inc(tool='kubectl')
+                return None
+            except OSError:
+                return None
+            if result.returncode != 0:
+                return None
+            self._namespace_stamp, self._namespace = stamp, result.stdout.strip() or 'default'
+        return self._namespace
+
+    def select(self, wanted):
+        """(contexts to query, spoken names matching none) for ALL_CONTEXTS or a tuple of names"""
+        names = self.names()
+        if wanted == ALL_CONTEXTS:
+            return names, []
+        selected, unknown = [], []
+        for word in wanted:
+            matches = [name for name in names if name == word] or [name for name in names if word in context_words(name)]
+            if not matches:
+                unknown.append(word)
+            selected.extend(name for name in matches if name not in selected)
+        return selected, unknown
+
+
+class ClusterResult:
+    """Per-cluster outcomes of a ClusterQuery, merged into one table and one summary"""
+
+    def __init__(self, query, kind):
+        self.query = query
+        self.kind = kind
+        self.results = []   # (context, ResultSet), in context order
+        self.failures = []  # (context, reason)
+        self.error = None
+
+    def add(self, context, result_set):
+        if result_set.error:
+            self.failures.append((context, result_set.error.splitlines()[-1].strip() or 'failed'))
+            return
+        self.results.append((context, result_set.unhealthy() if self.query.failing else result_set))
+
+    def fail(self, context, reason):
+        self.failures.append((context, reason))
+
+    def finish(self):
+        if not self.results:
+            reasons = '; '.join(f"{context}: {reason}" for context, reason in self.failures)
+            self.error = f"❌ No cluster answered ({reasons})" if reasons else "❌ No kubeconfig contexts found"
+        return self
+
+    def __len__(self):
+        return sum(len(result_set) for _, result_set in self.results)
+
+    def merged(self):
+        """Every cluster's records as one ResultSet"""
+        return ResultSet(self.kind, 'kubectl', [record for _, result_set in self.results for record in result_set.records])
+
+    def _clusters(self):
+        return f"{len(self.results)} cluster{'s' if len(self.results) != 1 else ''}"
+
+    def summary(self):
+        """Spoken summary across clusters, naming the ones that did not answer"""
+        if self.error:
+            return "No cluster answered"
+        noun = RECORD_TYPES[self.kind][2]
+        clusters = self._clusters()
+        merged = self.merged()
+        if not merged.records:
+            summary = f"No {'failing ' if self.query.failing else ''}{noun}s across {clusters}"
+        elif self.query.failing:
+            counts = sorted(((n, status) for status, n in merged.status_counts().items()), reverse=True)
+            summary = (f"Found {len(merged)} failing {noun}{'s' if len(merged) != 1 else ''} across {clusters}: "
+                       + ", ".join(f"{n} {status}" for n, status in counts))
+        else:
+            summary = f"{merged.summary()} across {clusters}"
+        if self.failures:
+            summary += "; no answer from " + ", ".join(context for context, _ in self.failures)
+        return summary
+
+    def render(self):
+        """One table with a CLUSTER column, then a line per cluster that did not answer"""
+        if self.error:
+            return self.error
+        headers = ['CLUSTER'] + RECORD_TYPES[self.kind][1]
+        rows = [[context] + record.row() for context, result_set in self.results for record in result_set.records]
+        output = f"✅ Kubectl Output ({self._clusters()}):\n" + (render_table(headers, rows) if rows else "No resources found")
+        for context, reason in self.failures:
+            output += f"\n⚠️ {context}: {reason}"
+        return output
+
+    def to_dicts(self):
+        return [dict(record, cluster=context) for context, result_set in self.results for record in result_set.to_dicts()]
@@ -0,0 +1,196 @@
+import asyncio
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from result_cache import INTENT_INVALIDATIONS
+
+# Clause separators; "then"/"after that" also order the clauses around them
+SEPARATOR = re.compile(r'(?<![\w-])(and then|after that|then|and)(?![\w-])|[,;]', re.IGNORECASE)
+SEQUENTIAL_WORDS = {'then', 'and then', 'after that'}
+
+# Verbs carried over to clauses that leave them out ("show pods and services")
+VERBS = {'show', 'list', 'get', 'describe', 'check', 'display', 'scale', 'delete', 'restart', 'stop', 'what', 'which'}
+
+# "clusters prod and staging" names contexts; its separators do not split clauses
+CLUSTER_LIST = re.compile(
+    rf'\b(?:cluster|context)s?\s+[\w.-]+(?:\s*(?:,|\band\b)\s*(?!(?:{"|".join(VERBS)})\b)[\w.-]+)+', re.IGNORECASE)
+
+
+class PlanStep:
+    """One clause of a compound utterance and the steps it must wait for"""
+
+    __slots__ = ('id', 'clause', 'ai_analysis', 'step', 'depends_on')
+
+    def __init__(self, id, clause, ai_analysis, step, depends_on):
+        self.id = id
+        self.clause = clause
+        self.ai_analysis = ai_analysis
+        self.step = step
+        self.depends_on = depends_on
+
+
+def split_clauses(utterance):
+    """Split an utterance into (clause, sequential) pairs
+
+    sequential is True when the clause must wait for everything before it.
+    """
+    clauses = []
+    sequential = False
+    verb = None
+    position = 0
+    protected = [m.span() for m in CLUSTER_LIST.finditer(utterance)]
+    separators = [m for m in SEPARATOR.finditer(utterance) if not any(start < m.start() < end for start, end in protected)]
+    for match in separators + [None]:
+        end = match.start() if match else len(utterance)
+        clause = utterance[position:end].strip()
+        if clause:
+            words = clause.lower().split()
+            if words[0] in VERBS:
+                verb = words[0]
+            elif verb is not None and not VERBS.intersection(words):
+                clause = f"{verb} {clause}"
+            clauses.append((clause, sequential))
+            sequential = False
+        if match is None:
+            break
+        if match.group(1) and match.group(1).lower() in SEQUENTIAL_WORDS:
+            sequential = True
+        position = match.end()
+    return clauses
+
+
+class CommandPlanner:
+    """Plans a compound utterance as a dependency graph and runs it in parallel
+
+    Independent clauses run at once; "then" and mutating intents (scale,
+    delete, restart, stop) order everything around them.
+    """
+
+    def __init__(self, batch_runner):
+        # Shares the batch runner's executor, parsers and worker pool
+        self.runner = batch_runner
+
+    def plan(self, utterance, context=None):
+        """Plan steps for each clause, or None unless every clause is a command on its own
+
+        "logs for web, last hour" is one request with a comma in it, not two.
+        Clauses resolve follow-ups ("describe that") against context.
+        """
+        clauses = split_clauses(utterance)
+        if len(clauses) < 2:
+            return None
+        analyses = [self.runner.ai_processor.process_command(clause, context) for clause, _ in clauses]
+        if any(ai_analysis['command_type'] == 'unknown' for ai_analysis in analyses):
+            return None
+
+        steps = []
+        previous_group, group = [], []
+        for (clause, sequential), ai_analysis in zip(clauses, analyses):
+            step = self.runner.executor.resolve_analysis(ai_analysis)
+            mutating = ai_analysis['command_type'] in INTENT_INVALIDATIONS or self.runner.is_mutating(step)
+
+            # Start a new group when this clause must follow the ones before it
+            if (sequential or mutating) and group:
+                previous_group, group = group, []
+            plan_step = PlanStep(len(steps), clause, ai_analysis, step, [s.id for s in previous_group])
+            steps.append(plan_step)
+            group.append(plan_step)
+            if mutating:
+                previous_group, group = group, []
+        return steps
+
+    def is_compound(self, utterance):
+        """Whether the utterance has several clauses; plan() decides if they are separate commands"""
+        return len(split_clauses(utterance)) > 1
+
+    def execute(self, steps, context=None, diff=False):
+        """Run a plan, starting each step as soon as its dependencies finish"""
+        started = time.perf_counter()
+        outcomes = {}
+        running = {}
+        shared = {}  # identical read steps with the same dependencies run once
+        waiting = list(steps)
+
+        while waiting or running:
+            for plan_step in [s for s in waiting if all(d in outcomes for d in s.depends_on)]:
+                waiting.remove(plan_step)
+                key = (plan_step.step, tuple(plan_step.depends_on))
+                if key in shared and not self.runner.is_mutating(plan_step.step):
+                    shared[key].append(plan_step)
+                    continue
+                shared[key] = [plan_step]
+                future = self.runner.pool.submit(self._timed, plan_step.step, started)
+                running[future] = key
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for plan_step in shared[running.pop(future)]:
+                    outcomes[plan_step.id] = future.result()
+                    self.runner.executor.invalidate_for_intent(plan_step.ai_analysis['command_type'])
+
+        return self.merge(steps, outcomes, started, context, diff)
+
+    async def aexecute(self, async_executor, steps, context=None, diff=False):
+        """Async version of execute() on an AsyncDevOpsExecutor"""
+        started = time.perf_counter()
+        tasks = {}
+        shared = {}
+
+        async def run(plan_step):
+            await asyncio.gather(*(tasks[d] for d in plan_step.depends_on))
+            start = time.perf_counter()
+            response, result_set, _ = await self.runner.arun_step(async_executor, plan_step.step)
+            self.runner.executor.invalidate_for_intent(plan_step.ai_analysis['command_type'])
+            return response, result_set, start - started, time.perf_counter() - started
+
+        for plan_step in steps:
+            key = (plan_step.step, tuple(plan_step.depends_on))
+            if key in shared and not self.runner.is_mutating(plan_step.step):
+                tasks[plan_step.id] = shared[key]
+                continue
+            tasks[plan_step.id] = shared[key] = asyncio.ensure_future(run(plan_step))
+
+        try:
+            results = await asyncio.gather(*(tasks[s.id] for s in steps))
+        finally:
+            for task in tasks.values():
+                task.cancel()
+        return self.merge(steps, dict(zip([s.id for s in steps], results)), started, context, diff)
+
+    def _timed(self, step, started):
+        start = time.perf_counter()
+        response, result_set, _ = self.runner.run_step(step)
+        return response, result_set, start - started, time.perf_counter() - started
+
+    def merge(self, steps, outcomes, started, context=None, diff=False):
+        """One response for the whole utterance, with per-step timings (ms from start)
+
+        With a session context, listings are snapshotted (and diffed in diff
+        mode) and remembered in clause order, as for a single command.
+        """
+        sections, summaries, timings = [], [], []
+        for plan_step in steps:
+            response, result_set, start, end = outcomes[plan_step.id]
+            if context is not None:
+                ai_analysis = plan_step.ai_analysis
+                changed = context.changes(ai_analysis['command_type'], ai_analysis['parameters'], result_set, diff)
+                if changed is not result_set:
+                    response, result_set = changed.render(), changed
+                context.remember(result_set)
+            smart_response = self.runner.ai_processor.generate_smart_response(response, plan_step.ai_analysis, result_set)
+            sections.append(f"▶ {plan_step.clause} ({(end - start) * 1000:.0f} ms)\n{smart_response}")
+            summaries.append(self.runner.voice_response.generate_summary(smart_response, result_set))
+            timings.append({
+                'id': plan_step.id,
+                'command': plan_step.clause,
+                'command_type': plan_step.ai_analysis['command_type'],
+                'depends_on': plan_step.depends_on,
+                'start_ms': round(start * 1000, 1),
+                'end_ms': round(end * 1000, 1),
+            })
+        return {
+            'response': "\n\n".join(sections),
+            'voice_summary': ". ".join(summaries),
+            'steps': timings,
+            'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
@@ -1,96 +1,436 @@
 import subprocess
 import json
+import re
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from result_cache import ResultCache
+from api_backend import BackendError, BackendUnavailable, POD_JSONPATH
+from log_stream import LogStream
+from log_query import LogQuery, LogQueryResult, MAX_QUERY_BYTES, QUERY_TIMEOUT, log_query_args
+from health_probes import HealthChecker, format_health_report
+from records import ResultSet, parse_kubectl_json, parse_pod_lines, parse_docker_json_lines
+from speech_corrector import SpeechCorrector
+from cluster_fanout import ClusterQuery, ClusterResult, KubeContexts, DEFAULT_CLUSTER_TIMEOUT, context_command
+from metrics import SUBPROCESSES, SUBPROCESS_TIMEOUTS, observe_execute
+
+# Listing steps that can be fetched as JSON and parsed into typed records.
+# Pods, the listing that gets large, come as one short line each instead.
+STRUCTURED_COMMANDS = {
+    ('kubectl', 'get pods'): ('pods', f"get pods -o {shlex.quote('jsonpath=' + POD_JSONPATH)}"),
+    ('kubectl', 'get services'): ('services', 'get services -o json'),
+    ('kubectl', 'get deployments'): ('deployments', 'get deployments -o json'),
+    ('kubectl', 'get nodes'): ('nodes', 'get nodes -o json'),
+    ('kubectl', 'get namespaces'): ('namespaces', 'get namespaces -o json'),
+    ('docker', 'ps -a'): ('containers', "ps -a --format '{{json .}}'"),
+    ('docker', 'ps'): ('containers', "ps --format '{{json .}}'"),
+    ('docker', 'images'): ('images', "images --format '{{json .}}'"),
+}
+
+# Container/pod names accepted from voice input before they reach a command line
+RESOURCE_NAME = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_.-]*$')
+
+
+def in_namespace(command, params):
+    namespace = params.get('namespace')
+    return f"{command} -n {namespace}" if namespace else command
+
+
+def log_target(argument):
+    """(name, namespace or None) of a 'logs' step's argument, e.g. "web -n prod" """
+    name, _, namespace = argument.partition(' -n ')
+    return name, namespace or None
+
+
+def log_stream_url(argument):
+    """Live tail URL for a 'logs' step"""
+    name, namespace = log_target(argument)
+    return f"/api/logs/stream?name={name}" + (f"&namespace={namespace}" if namespace else '')
+
+
+def named(template, params, example):
+    """Step for an action on a named object, or a prompt if no usable name was heard
+
+    A template with {replicas} also needs a spoken replica count; none is assumed.
+    """
+    tool, command = template
+    if not params.get('name'):
+        return ('message', f"Please specify a name. Example: '{example}'")
+    if '{replicas}' in command and params.get('replicas') is None:
+        return ('message', f"Please specify the number of replicas. Example: '{example}'")
+    return (tool, in_namespace(command.format(name=params['name'], replicas=params.get('replicas')), params))
+
+
+# AIProcessor intent -> executor step built from its parameters.
+# A handler returning None falls back to keyword matching on the raw text.
+INTENT_STEPS = {
+    'get_pods': lambda p: ('kubectl', in_namespace('get pods', p)),
+    'describe_pod': lambda p: named(('kubectl', 'describe pod {name}'), p, 'describe pod web-1') if p.get('name') else ('kubectl', in_namespace('describe pods', p)),
+    'delete_pod': lambda p: named(('kubectl', 'delete pod {name}'), p, 'delete pod web-1'),
+    'restart_pod': lambda p: named(('kubectl', 'rollout restart deployment {name}'), p, 'restart pod web'),
+    'list_containers': lambda p: ('docker', 'ps -a'),
+    'list_images': lambda p: ('docker', 'images'),
+    'stop_container': lambda p: named(('docker', 'stop {name}'), p, 'stop container backend'),
+    'get_services': lambda p: ('kubectl', in_namespace('get services', p)),
+    'get_deployments': lambda p: ('kubectl', in_namespace('get deployments', p)),
+    'scale_deployment': lambda p: named(('kubectl', 'scale deployment {name} --replicas={replicas}'), p, 'scale deployment web to 3 replicas'),
+    'get_logs': lambda p: ('logs', in_namespace(p['name'], p)) if p.get('name') else None,
+    'search_logs': lambda p: ('log_query', LogQuery(
+        p['name'], since=p.get('since', '1h'), level=p.get('level'), pattern=p.get('pattern'),
+        status=p.get('status'), aggregate=p.get('aggregate', 'list'), namespace=p.get('namespace'),
+    )) if p.get('name') else ('message', "Please specify container/pod name. Example: 'show errors in backend logs'"),
+    'health_check': lambda p: ('health', None),
+    'get_nodes': lambda p: ('kubectl', 'get nodes'),
+    'get_namespaces': lambda p: ('kubectl', 'get namespaces'),
+    'get_configmaps': lambda p: ('kubectl', in_namespace('get configmaps', p)),
+    'get_secrets': lambda p: ('kubectl', in_namespace('get secrets', p)),
+}
+
+def structured_base(step):
+    """Split a trailing `-n <namespace>` off a step: (step without it, namespace or None)"""
+    kind, argument = step
+    words = argument.split() if kind == 'kubectl' and argument else []
+    if len(words) > 2 and words[-2] == '-n':
+        return (kind, ' '.join(words[:-2])), words[-1]
+    return step, None
+
+def finish_log_query(result, stream):
+    """Record truncation and timeout, or turn a failed log command into the result's error"""
+    result.truncated = stream.truncated
+    result.timed_out = stream.timed_out
+    if stream.process is None or stream.process.returncode not in (0, None, -9):
+        reason = stream.stderr or f"exit status {stream.process.returncode}"
+        result.error = f"❌ Could not read logs for {result.query.target}: {reason}"
+    return result
 
 class DevOpsExecutor:
+    def __init__(self, cache=None, backend=None, health_checker=None, index=None, corrector=None):
+        # Shared cache for read-only kubectl/docker output
+        self.cache = cache if cache is not None else ResultCache()
+        # Optional native API backend; the CLI subprocess path is the fallback
+        self.backend = backend
+        # Health probes run in parallel under one deadline
+        self.health_checker = health_checker if health_checker is not None else HealthChecker()
+        # "index" mode: answer listings from a background-polled ResourceIndex
+        self.index = index
+        # Speech correction learns resource names from every listing we see
+        self.corrector = corrector if corrector is not None else SpeechCorrector()
+        if index is not None:
+            index.listeners.append(self.corrector.update)
+        # Multi-cluster listings: one kubectl per kubeconfig context, in parallel
+        self.contexts = KubeContexts()
+        self.cluster_timeout = DEFAULT_CLUSTER_TIMEOUT
+        self._cluster_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='cluster')
+    
     def execute_command(self, voice_command):
         """Execute DevOps commands based on voice input"""
-        command_lower = voice_command.lower()
+        return self.execute_step(self.resolve_command(voice_command))
+    
+    def execute_step(self, step):
+        """Run a step, reporting failures as the response text"""
+        try:
+            return self.run_step(step)
+        except Exception as e:
+            return f"Error executing command: {str(e)}"
+    
+    def resolve_analysis(self, ai_analysis):
+        """Map an AIProcessor analysis to an executor step
         
-        # Fix common voice recognition errors
-        command_lower = command_lower.replace('boats', 'pods')
-        command_lower = command_lower.replace('ports', 'pods')
-        command_lower = command_lower.replace('pots', 'pods')
+        Intents the processor did not recognise fall back to keyword
+        matching on the raw text (resolve_command).
+        """
+        params = ai_analysis['parameters']
+        for key in ('name', 'namespace'):
+            if key in params and not RESOURCE_NAME.match(str(params[key])):
+                return ('message', f"❌ Invalid {key}: {params[key]}")
+        
+        handler = INTENT_STEPS.get(ai_analysis['command_type'])
+        step = handler(params) if handler is not None else None
+        if step is None:
+            step = self.resolve_command(ai_analysis['original_command'])
+        if params.get('clusters'):
+            return self.across_clusters(step, params)
+        return step
+    
+    def across_clusters(self, step, params):
+        """Point a kubectl step at the contexts the user named
+        
+        Listings fan out as a ClusterQuery; other kubectl commands can
+        target a single context.
+        """
+        if step[0] != 'kubectl':
+            return step
+        clusters = params['clusters']
+        if structured_base(step)[0] in STRUCTURED_COMMANDS:
+            return ('clusters', ClusterQuery(step[1], clusters, bool(params.get('failing'))))
+        
+        contexts, unknown = self.contexts.select(clusters)
+        if unknown or len(contexts) != 1:
+            return ('message', "⚠️ Only listings (pods, services, deployments, nodes, namespaces) can run on several clusters at once")
+        return ('kubectl', f"{step[1]} --context={contexts[0]}")
+    
+    def resolve_command(self, voice_command):
+        """Map raw voice input to an executor step by keyword: (kind, argument)
+        
+        kind is one of 'kubectl', 'docker', 'logs', 'health' or 'message'.
+        """
+        # Fix voice recognition errors
+        command_lower = self.corrector.correct(voice_command.lower())
         command_lower = command_lower.replace('what', 'show')
         command_lower = command_lower.replace('which', 'show')
         
-        try:
-            # Kubernetes Commands  
-            if 'pod' in command_lower or 'pods' in command_lower or 'running' in command_lower:
-                if 'show' in command_lower or 'list' in command_lower or 'get' in command_lower:
-                    return self.run_kubectl('get pods')
-                elif 'describe' in command_lower:
-                    return self.run_kubectl('describe pods')
-            
-            # Docker Commands
-            elif 'container' in command_lower or 'containers' in command_lower:
-                if 'list' in command_lower or 'show' in command_lower:
-                    return self.run_docker('ps -a')
-                elif 'running' in command_lower:
-                    return self.run_docker('ps')
-            
-            elif 'image' in command_lower or 'images' in command_lower:
-                return self.run_docker('images')
-            
-            # System Commands
-            elif 'health' in command_lower or 'status' in command_lower:
-                return self.check_system_health()
-            
-            # Kubernetes Services
-            elif 'service' in command_lower or 'services' in command_lower:
-                return self.run_kubectl('get services')
-            
-            # Kubernetes Deployments
-            elif 'deployment' in command_lower or 'deployments' in command_lower:
-                return self.run_kubectl('get deployments')
-            
-            # Kubernetes Nodes
-            elif 'node' in command_lower or 'nodes' in command_lower:
-                return self.run_kubectl('get nodes')
-            
-            # Logs
-            elif 'log' in command_lower:
-                # Extract container/pod name
-                words = voice_command.lower().replace('-', ' ').split()
-                container_name = None
-                
-                # Look for common names
-                for word in words:
-                    if word in ['backend', 'frontend', 'database', 'redis', 'nginx', 'mysql']:
-                        container_name = word
-                        break
-                
-                if container_name:
-                    # Try Docker first
-                    docker_result = self.get_docker_logs(container_name)
-                    if 'Error' not in docker_result:
-                        return docker_result
-                    # Fallback to kubectl
-                    return self.run_kubectl(f'logs {container_name} --tail=50')
-                else:
-                    return "Please specify container/pod name. Example: 'show logs of backend'"
-            
-            # Namespaces
-            elif 'namespace' in command_lower:
-                return self.run_kubectl('get namespaces')
-            
-            # ConfigMaps
-            elif 'configmap' in command_lower:
-                return self.run_kubectl('get configmaps')
+        # Kubernetes Commands  
+        if 'pod' in command_lower or 'pods' in command_lower or 'running' in command_lower:
+            if 'show' in command_lower or 'list' in command_lower or 'get' in command_lower:
+                return ('kubectl', 'get pods')
+            elif 'describe' in command_lower:
+                return ('kubectl', 'describe pods')
+        
+        # Docker Commands
+        elif 'container' in command_lower or 'containers' in command_lower:
+            if 'list' in command_lower or 'show' in command_lower:
+                return ('docker', 'ps -a')
+            elif 'running' in command_lower:
+                return ('docker', 'ps')
+        
+        elif 'image' in command_lower or 'images' in command_lower:
+            return ('docker', 'images')
+        
+        # System Commands
+        elif 'health' in command_lower or 'status' in command_lower:
+            return ('health', None)
+        
+        # Kubernetes Services
+        elif 'service' in command_lower or 'services' in command_lower:
+            return ('kubectl', 'get services')
+        
+        # Kubernetes Deployments
+        elif 'deployment' in command_lower or 'deployments' in command_lower:
+            return ('kubectl', 'get deployments')
+        
+        # Kubernetes Nodes
+        elif 'node' in command_lower or 'nodes' in command_lower:
+            return ('kubectl', 'get nodes')
+        
+        # Logs
+        elif 'log' in command_lower:
+            # Extract container/pod name
+            words = command_lower.split()
+            container_name = None
             
-            # Secrets
-            elif 'secret' in command_lower:
-                return self.run_kubectl('get secrets')
+            # Look for known container/pod names
+            for word in words:
+                if self.corrector.is_resource_name(word):
+                    container_name = word
+                    break
             
+            if container_name:
+                return ('logs', container_name)
             else:
-                return f"Command '{voice_command}' recognized but not implemented yet. Try: show pods, list containers, get services, show logs"
-                
-        except Exception as e:
-            return f"Error executing command: {str(e)}"
+                return ('message', "Please specify container/pod name. Example: 'show logs of backend'")
+        
+        # Namespaces
+        elif 'namespace' in command_lower:
+            return ('kubectl', 'get namespaces')
+        
+        # ConfigMaps
+        elif 'configmap' in command_lower:
+            return ('kubectl', 'get configmaps')
+        
+        # Secrets
+        elif 'secret' in command_lower:
+            return ('kubectl', 'get secrets')
+        
+        else:
+            return ('message', f"Command '{voice_command}' recognized but not implemented yet. Try: show pods, list containers, get services, show logs")
+        
+        # Matched a resource but no verb we handle
+        return ('message', None)
+    
+    def run_step(self, step):
+        """Run a step produced by resolve_analysis or resolve_command"""
+        kind, argument = step
+        if kind == 'kubectl':
+            return self.run_kubectl(argument)
+        if kind == 'docker':
+            return self.run_docker(argument)
+        if kind == 'health':
+            return self.check_system_health()
+        if kind == 'logs':
+            # Try Docker first, unless a namespace says it is a pod
+            if log_target(argument)[1] is None:
+                docker_result = self.get_docker_logs(argument)
+                if 'Error' not in docker_result:
+                    return docker_result
+            # Fallback to kubectl
+            return self.run_kubectl(f'logs {argument} --tail=50')
+        if kind == 'log_query':
+            return self.query_logs(argument).render()
+        if kind == 'clusters':
+            return self.query_clusters(argument).render()
+        return argument
+    
+    def run_structured(self, step):
+        """Run a listing step as JSON and return a ResultSet, or None if the step has no structured form"""
+        if step[0] == 'log_query':
+            return self.query_logs(step[1])
+        if step[0] == 'clusters':
+            return self.query_clusters(step[1])
+        
+        base, namespace = structured_base(step)
+        spec = STRUCTURED_COMMANDS.get(base)
+        if spec is None:
+            return None
+        
+        tool = step[0]
+        if self.index is not None and namespace is None:
+            indexed = self.index.answer_records(tool, step[1])
+            if indexed is not None:
+                return indexed
+        
+        kind, command = spec
+        command = in_namespace(command, {'namespace': namespace})
+        output = self.run_kubectl(command) if tool == 'kubectl' else self.run_docker(command)
+        return self.observe(step, self.parse_structured(tool, kind, output))
+    
+    def plan_clusters(self, query):
+        """(kind, JSON listing command, contexts to query, names matching no context)"""
+        base, namespace = structured_base(('kubectl', query.command))
+        kind, command = STRUCTURED_COMMANDS[base]
+        contexts, unknown = self.contexts.select(query.contexts)
+        return kind, in_namespace(command, {'namespace': namespace}), contexts, unknown
+    
+    def query_clusters(self, query):
+        """Run a listing on every selected context at once; slow or failing clusters are reported, not awaited"""
+        kind, command, contexts, unknown = self.plan_clusters(query)
+        result = ClusterResult(query, kind)
+        for name in unknown:
+            result.fail(name, 'no such context')
+        
+        futures = [(context, self._cluster_pool.submit(self.run_kubectl, context_command(command, context, self.cluster_timeout)))
+                   for context in contexts]
+        wait([future for _, future in futures], timeout=self.cluster_timeout)
+        for context, future in futures:
+            if future.done():
+                result.add(context, self.parse_structured('kubectl', kind, future.result()))
+            else:
+                future.cancel()
+                result.fail(context, f"timed out after {self.cluster_timeout:g} s")
+        return result.finish()
+    
+    def observe(self, step, result_set):
+        """Teach the speech corrector the names in a successful listing"""
+        if not result_set.error:
+            self.corrector.sync(step, result_set.kind, [record.name for record in result_set.records])
+        return result_set
+    
+    def parse_structured(self, tool, kind, output):
+        """Parse executor output of a JSON listing into a ResultSet"""
+        prefix = '✅ Kubectl Output:\n' if tool == 'kubectl' else '✅ Docker Output:\n'
+        if output.startswith(prefix):
+            payload = output[len(prefix):]
+        elif output.startswith('✅') or output.startswith('No resources found'):
+            payload = ''
+        else:
+            return ResultSet(kind, tool, error=output)
+        
+        try:
+            if tool == 'kubectl' and kind == 'pods':
+                return parse_pod_lines(payload)
+            if tool == 'kubectl':
+                return parse_kubectl_json(kind, payload)
+            return parse_docker_json_lines(kind, payload)
+        except ValueError as e:
+            return ResultSet(kind, tool, error=f"❌ Could not parse {tool} output: {str(e)}")
     
     def run_kubectl(self, command):
         """Execute kubectl commands"""
+        if self.index is not None:
+            indexed = self.index.answer('kubectl', command)
+            if indexed is not None:
+                return indexed
+        return self._run_with_cache('kubectl', command, self._run_kubectl_uncached)
+    
+    def run_docker(self, command):
+        """Execute docker commands"""
+        if self.index is not None:
+            indexed = self.index.answer('docker', command)
+            if indexed is not None:
+                return indexed
+        return self._run_with_cache('docker', command, self._run_docker_uncached)
+    
+    def invalidate_for_intent(self, command_type):
+        """Drop cached listings affected by a mutating intent"""
+        self.cache.invalidate_intent(command_type)
+        if self.index is not None:
+            self.index.mark_stale_for_intent(command_type)
+    
+    def _run_with_cache(self, tool, command, runner):
+        """Serve read-only commands from cache, invalidate on mutations"""
+        if self.cache.is_mutating(tool, command):
+            result = runner(command)
+            self.cache.invalidate_command(tool, command)
+            return result
+        
+        if not self.cache.is_cacheable(tool, command):
+            return runner(command)
+        
+        return self.cache.get_or_load(
+            tool,
+            command,
+            lambda: runner(command),
+            should_store=lambda result: not result.startswith(('❌', '⏱️'))
+        )
+    
+    def run_backend(self, tool, command):
+        """Run a command through the API backend; None means use the CLI"""
+        if self.backend is None:
+            return None
+        
+        label = 'Kubectl' if tool == 'kubectl' else 'Docker'
+        started = time.perf_counter()
+        try:
+            output = self.backend.run_kubectl(command) if tool == 'kubectl' else self.backend.run_docker(command)
+        except BackendError as e:
+            observe_execute(tool, command, 'api', started)
+            return f"❌ {label} Error:\n{e}"
+        except BackendUnavailable:
+            return None
+        
+        if output is None:
+            return None
+        observe_execute(tool, command, 'api', started)
+        output = output.strip()
+        if output:
+            return f"✅ {label} Output:\n{output}"
+        if tool == 'kubectl':
+            return "No resources found"
+        return "✅ No containers found or command executed successfully"
+    
+    def format_kubectl_result(self, returncode, stdout, stderr):
+        """Turn kubectl process output into the user-facing message"""
+        if returncode == 0:
+            output = stdout.strip()
+            if output:
+                return f"✅ Kubectl Output:\n{output}"
+            else:
+                return "✅ Command executed successfully (no output)"
+        else:
+            error = stderr.strip()
+            if 'not found' in error.lower() or 'is not recognized' in error.lower():
+                return "❌ kubectl not installed. Install kubectl or use Docker commands instead."
+            return f"❌ Kubectl Error:\n{error}"
+    
+    def _run_kubectl_uncached(self, command):
+        """Run kubectl through the API backend, falling back to a subprocess"""
+        result = self.run_backend('kubectl', command)
+        if result is not None:
+            return result
+        
+        started = time.perf_counter()
         try:
             full_command = f"kubectl {command}"
+            SUBPROCESSES.inc(tool='kubectl')
             result = subprocess.run(
                 full_command, 
                 shell=True, 
@@ -98,28 +438,40 @@ class DevOpsExecutor:
                 text=True,
                 timeout=10
             )
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if output:
-                    return f"✅ Kubectl Output:\n{output}"
-                else:
-                    return "✅ Command executed successfully (no output)"
-            else:
-                error = result.stderr.strip()
-                if 'not found' in error.lower() or 'is not recognized' in error.lower():
-                    return "❌ kubectl not installed. Install kubectl or use Docker commands instead."
-                return f"❌ Kubectl Error:\n{error}"
+            return self.format_kubectl_result(result.returncode, result.stdout, result.stderr)
                 
         except subprocess.TimeoutExpired:
+            SUBPROCESS_TIMEOUTS.inc(tool='kubectl')
             return "⏱️ Command timeout. Please try again."
         except Exception as e:
             return f"❌ Error running kubectl: {str(e)}"
+        finally:
+            observe_execute('kubectl', command, 'cli', started)
     
-    def run_docker(self, command):
-        """Execute docker commands"""
+    def format_docker_result(self, returncode, stdout, stderr):
+        """Turn docker process output into the user-facing message"""
+        if returncode == 0:
+            output = stdout.strip()
+            if output:
+                return f"✅ Docker Output:\n{output}"
+            else:
+                return "✅ No containers found or command executed successfully"
+        else:
+            error = stderr.strip()
+            if 'not found' in error.lower() or 'is not recognized' in error.lower():
+                return "❌ Docker not installed or not running. Please start Docker Desktop."
+            return f"❌ Docker Error:\n{error}"
+    
+    def _run_docker_uncached(self, command):
+        """Run docker through the API backend, falling back to a subprocess"""
+        result = self.run_backend('docker', command)
+        if result is not None:
+            return result
+        
+        started = time.perf_counter()
         try:
             full_command = f"docker {command}"
+            SUBPROCESSES.inc(tool='docker')
             result = subprocess.run(
                 full_command, 
                 shell=True, 
@@ -127,40 +479,78 @@ class DevOpsExecutor:
                 text=True,
                 timeout=10
             )
-            
-            if result.returncode == 0:
-                output = result.stdout.strip()
-                if output:
-                    return f"✅ Docker Output:\n{output}"
-                else:
-                    return "✅ No containers found or command executed successfully"
-            else:
-                error = result.stderr.strip()
-                if 'not found' in error.lower() or 'is not recognized' in error.lower():
-                    return "❌ Docker not installed or not running. Please start Docker Desktop."
-                return f"❌ Docker Error:\n{error}"
+            return self.format_docker_result(result.returncode, result.stdout, result.stderr)
                 
         except subprocess.TimeoutExpired:
+            SUBPROCESS_TIMEOUTS.inc(tool='docker')
             return "⏱️ Command timeout. Please try again."
         except Exception as e:
             return f"❌ Error running docker: {str(e)}"
+        finally:
+            observe_execute('docker', command, 'cli', started)
+    
+    def find_docker_container(self, container_name):
+        """Name of the first running container matching container_name, or None"""
+        SUBPROCESSES.inc(tool='docker')
+        ps_result = subprocess.run(
+            f'docker ps --filter "name={container_name}" --format "{{{{.Names}}}}"',
+            shell=True,
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if ps_result.returncode == 0 and ps_result.stdout.strip():
+            return ps_result.stdout.strip().split('\n')[0]
+        return None
+    
+    def stream_logs(self, container_name, tail=30, max_bytes=1024 * 1024, namespace=None):
+        """Follow logs of a Docker container, or a pod if no container matches or a namespace is given"""
+        if not RESOURCE_NAME.match(container_name or ''):
+            raise ValueError(f"Invalid container/pod name: {container_name}")
+        if namespace is not None and not RESOURCE_NAME.match(namespace):
+            raise ValueError(f"Invalid namespace: {namespace}")
+        
+        actual_name = None
+        if namespace is None:
+            try:
+                actual_name = self.find_docker_container(container_name)
+            except Exception:
+                actual_name = None
+        
+        if actual_name:
+            args = ['docker', 'logs', '-f', '--tail', str(tail), actual_name]
+        else:
+            args = ['kubectl', 'logs', '-f', f'--tail={tail}', container_name]
+            if namespace is not None:
+                args += ['-n', namespace]
+        return LogStream(args, max_bytes=max_bytes)
+    
+    def query_logs(self, query):
+        """Filter and aggregate a container's/pod's logs in one streaming pass"""
+        try:
+            container = self.find_docker_container(query.target) if query.namespace is None else None
+        except Exception:
+            container = None
+        
+        args = log_query_args(query, container)
+        # stderr is kept apart so CLI errors aren't counted as log lines
+        stream = LogStream(args, max_bytes=MAX_QUERY_BYTES, timeout=QUERY_TIMEOUT, merge_stderr=False)
+        result = LogQueryResult(query)
+        started = time.perf_counter()
+        for line in stream.lines():
+            result.feed(line)
+        observe_execute(args[0], 'logs', 'cli', started)
+        return finish_log_query(result, stream)
     
     def get_docker_logs(self, container_name):
         """Get logs from Docker container"""
         try:
             # First, find container with matching name
-            ps_result = subprocess.run(
-                f'docker ps --filter "name={container_name}" --format "{{{{.Names}}}}"',
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+            actual_name = self.find_docker_container(container_name)
             
-            if ps_result.returncode == 0 and ps_result.stdout.strip():
-                actual_name = ps_result.stdout.strip().split('\n')[0]
-                
+            if actual_name:
                 # Get logs
+                SUBPROCESSES.inc(tool='docker')
                 logs_result = subprocess.run(
                     f'docker logs {actual_name} --tail 30',
                     shell=True,
@@ -183,38 +573,8 @@ class DevOpsExecutor:
     
     def check_system_health(self):
         """Check system health"""
-        health_info = []
-        
-        # Check Docker
-        try:
-            docker_result = subprocess.run(
-                "docker info", 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                timeout=5
-            )
-            if docker_result.returncode == 0:
-                health_info.append("✅ Docker: Running")
-            else:
-                health_info.append("❌ Docker: Not running")
-        except:
-            health_info.append("❌ Docker: Not available")
-        
-        # Check Kubectl
-        try:
-            kubectl_result = subprocess.run(
-                "kubectl version --client", 
-                shell=True, 
-                capture_output=True, 
-                text=True,
-                timeout=5
-            )
-            if kubectl_result.returncode == 0:
-                health_info.append("✅ Kubectl: Installed")
-            else:
-                health_info.append("❌ Kubectl: Not installed")
-        except:
-            health_info.append("❌ Kubectl: Not available")
-        
-        return "System Health Check:\n" + "\n".join(health_info)
+        return format_health_report(self.health_report())
+    
+    def health_report(self):
+        """Run all health probes concurrently and return the structured report"""
+        return self.health_checker.report()
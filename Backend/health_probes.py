@@ -0,0 +1,154 @@
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from metrics import SUBPROCESSES, SUBPROCESS_TIMEOUTS
+
+
+class ProbeResult:
+    """Outcome of one health probe"""
+
+    __slots__ = ('name', 'ok', 'status', 'detail', 'latency_ms')
+
+    def __init__(self, name, ok, status, detail='', latency_ms=0.0):
+        self.name = name
+        self.ok = ok
+        self.status = status
+        self.detail = detail
+        self.latency_ms = latency_ms
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'ok': self.ok,
+            'status': self.status,
+            'detail': self.detail,
+            'latency_ms': round(self.latency_ms, 1),
+        }
+
+
+def run_probe_command(args, timeout):
+    """Run a probe command without a shell; returns CompletedProcess or None if missing"""
+    SUBPROCESSES.inc(tool=args[0])
+    try:
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError:
+        return None
+    except subprocess.TimeoutExpired:
+        SUBPROCESS_TIMEOUTS.inc(tool=args[0])
+        raise
+
+
+def docker_probe(timeout):
+    result = run_probe_command(['docker', 'info'], timeout)
+    if result is None:
+        return False, 'Not available'
+    if result.returncode == 0:
+        return True, 'Running'
+    return False, 'Not running'
+
+
+def kubectl_probe(timeout):
+    result = run_probe_command(['kubectl', 'version', '--client'], timeout)
+    if result is None:
+        return False, 'Not available'
+    if result.returncode == 0:
+        return True, 'Installed'
+    return False, 'Not installed'
+
+
+def api_server_probe(timeout):
+    result = run_probe_command(['kubectl', 'get', '--raw', '/readyz', f'--request-timeout={max(1, int(timeout))}s'], timeout)
+    if result is None:
+        return False, 'kubectl not available'
+    if result.returncode == 0:
+        return True, 'Reachable'
+    return False, 'Unreachable'
+
+
+def node_probe(timeout):
+    result = run_probe_command(['kubectl', 'get', 'nodes', '--no-headers', f'--request-timeout={max(1, int(timeout))}s'], timeout)
+    if result is None:
+        return False, 'kubectl not available'
+    if result.returncode != 0:
+        return False, 'Unknown'
+    statuses = [line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1]
+    ready = sum(1 for status in statuses if status == 'Ready')
+    return bool(statuses) and ready == len(statuses), f"{ready}/{len(statuses)} Ready"
+
+
+def disk_probe(timeout, path='/', min_free_ratio=0.1):
+    usage = shutil.disk_usage(path)
+    free_ratio = usage.free / usage.total if usage.total else 0
+    return free_ratio >= min_free_ratio, f"{free_ratio * 100:.0f}% free"
+
+
+# Display label and probe function, in report order
+DEFAULT_PROBES = [
+    ('Docker', docker_probe),
+    ('Kubectl', kubectl_probe),
+    ('API Server', api_server_probe),
+    ('Nodes', node_probe),
+    ('Disk', disk_probe),
+]
+
+
+class HealthChecker:
+    """Registry of health probes run concurrently under one deadline"""
+
+    def __init__(self, probes=None, deadline=5.0):
+        self.probes = list(DEFAULT_PROBES if probes is None else probes)
+        self.deadline = deadline
+        # Probes are I/O bound; one thread each keeps them fully parallel
+        self._pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='health-probe')
+
+    def register(self, name, probe):
+        """Add a probe: probe(timeout) -> (ok, status text)"""
+        self.probes.append((name, probe))
+
+    def run(self, deadline=None):
+        """Run every probe at once; returns ProbeResults in registration order"""
+        deadline = self.deadline if deadline is None else deadline
+        started = time.perf_counter()
+        futures = [self._pool.submit(self._timed, name, probe, deadline) for name, probe in self.probes]
+        wait(futures, timeout=deadline)
+
+        results = []
+        for (name, _), future in zip(self.probes, futures):
+            if future.done():
+                results.append(future.result())
+            else:
+                future.cancel()
+                elapsed = (time.perf_counter() - started) * 1000
+                results.append(ProbeResult(name, False, 'Timed out', latency_ms=elapsed))
+        return results
+
+    def _timed(self, name, probe, timeout):
+        start = time.perf_counter()
+        try:
+            ok, status = probe(timeout)
+            detail = ''
+        except subprocess.TimeoutExpired:
+            ok, status, detail = False, 'Timed out', ''
+        except Exception as e:
+            ok, status, detail = False, 'Not available', str(e)
+        return ProbeResult(name, ok, status, detail, (time.perf_counter() - start) * 1000)
+
+    def report(self, deadline=None):
+        """Structured report: overall status plus per-probe results"""
+        start = time.perf_counter()
+        results = self.run(deadline)
+        return {
+            'healthy': all(result.ok for result in results),
+            'total_ms': round((time.perf_counter() - start) * 1000, 1),
+            'probes': [result.to_dict() for result in results],
+        }
+
+
+def format_health_report(report):
+    """Render a health report as the voice/text summary"""
+    lines = []
+    for probe in report['probes']:
+        icon = '✅' if probe['ok'] else '❌'
+        lines.append(f"{icon} {probe['name']}: {probe['status']} ({probe['latency_ms']:.0f} ms)")
+    return "System Health Check:\n" + "\n".join(lines)
@@ -0,0 +1,48 @@
+import re
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants  # Python 3.11+
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+def required_literal(pattern):
+    """Longest literal text every match of pattern must contain, or None
+
+    Only top-level literal runs count ("pod" in "(show|list).*pod"); groups,
+    classes, repeats and anchors end a run, so the result is conservative.
+    """
+    runs, run = [], []
+    for op, av in sre_parse.parse(pattern):
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+        else:
+            runs.append(''.join(run))
+            run = []
+    runs.append(''.join(run))
+    longest = max(runs, key=len)
+    return longest.lower() or None
+
+
+class IntentMatcher:
+    """Precompiled intent patterns behind a keyword prefilter"""
+
+    def __init__(self, command_patterns):
+        self.intents = list(command_patterns.keys())
+
+        # (intent, keyword, compiled pattern) in priority order. A pattern is
+        # only run when its keyword is in the command, so most of them cost a
+        # substring check instead of a regex search.
+        self.checks = []
+        for cmd_type, patterns in command_patterns.items():
+            for pattern in patterns:
+                self.checks.append((cmd_type, required_literal(pattern), re.compile(pattern, re.IGNORECASE)))
+
+    def match(self, command):
+        """Return the first intent whose patterns match, or 'unknown'"""
+        lowered = command.lower()
+        for cmd_type, keyword, regex in self.checks:
+            if (keyword is None or keyword in lowered) and regex.search(command):
+                return cmd_type
+        return 'unknown'
@@ -0,0 +1,238 @@
+import os
+import re
+from collections import deque
+from datetime import datetime
+
+# Bytes one query may scan before it stops (the CLI window should come first)
+MAX_QUERY_BYTES = int(os.environ.get('LOG_QUERY_MAX_BYTES', 64 * 1024 ** 2))
+# Seconds one query may read for; a hung `kubectl logs` is killed after this
+QUERY_TIMEOUT = float(os.environ.get('LOG_QUERY_TIMEOUT', 30))
+
+# Level words, matched against the lowercased line
+LEVEL_PATTERNS = {
+    'error': r'\b(?:error|err|fatal|critical|crit|panic|exception|traceback)\b',
+    'warn': r'\b(?:warn|warning)\b',
+    'info': r'\binfo\b',
+    'debug': r'\b(?:debug|trace)\b',
+}
+# Substrings every match contains; `in` checks reject most lines before the regex runs
+LEVEL_KEYWORDS = {
+    'error': ('err', 'fatal', 'crit', 'panic', 'exception', 'traceback'),
+    'warn': ('warn',),
+    'info': ('info',),
+    'debug': ('debug', 'trace'),
+}
+LEVEL_NOUNS = {'error': 'error', 'warn': 'warning', 'info': 'info line', 'debug': 'debug line'}
+
+# RFC3339 prefix added by `--timestamps`; [:16] of it is the minute
+TIMESTAMP = re.compile(r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\S*\s')
+# Numbers in a message, collapsed so repeats count as one message
+VARIABLE_PARTS = re.compile(r'\d+')
+
+
+class LogQuery:
+    """What to look for in one container's/pod's logs"""
+
+    __slots__ = ('target', 'since', 'level', 'pattern', 'status', 'aggregate', 'limit', 'namespace')
+
+    def __init__(self, target, since='1h', level=None, pattern=None, status=None, aggregate='list', limit=50,
+                 namespace=None):
+        self.target = target
+        self.since = since          # CLI window, e.g. 10m / 2h
+        self.level = level          # error / warn / info / debug
+        self.pattern = pattern      # literal text to contain
+        self.status = status        # HTTP status: "500" or "5xx"
+        self.aggregate = aggregate  # list: show matches; count: just the numbers
+        self.limit = limit
+        self.namespace = namespace  # pod namespace; a namespaced query never reads Docker logs
+
+    def key(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, LogQuery) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"LogQuery{self.key()}"
+
+    def describe(self):
+        """Spoken description of the filter, e.g. "500s in nginx logs in the last 10m" """
+        if self.status:
+            what = f"{self.status}s"
+        elif self.level:
+            what = f"{LEVEL_NOUNS[self.level]}s"
+        elif self.pattern:
+            what = f"lines containing '{self.pattern}'"
+        else:
+            what = "lines"
+        window = f" in the last {self.since}" if self.since else ''
+        return f"{what} in {self.target} logs{window}"
+
+    def compile(self):
+        """Line predicates, cheapest first"""
+        predicates = []
+        if self.pattern:
+            needle = self.pattern.lower()
+            predicates.append(lambda line: needle in line.lower())
+        if self.status:
+            code = re.escape(self.status).replace('x', r'\d')
+            predicates.append(re.compile(rf'(?<![\w.]){code}(?![\w.])').search)
+        if self.level:
+            keywords = LEVEL_KEYWORDS[self.level]
+            level = re.compile(LEVEL_PATTERNS[self.level])
+
+            def level_match(line):
+                lowered = line.lower()
+                for keyword in keywords:
+                    if keyword in lowered:
+                        return level.search(lowered)
+                return None
+            predicates.append(level_match)
+        return predicates
+
+
+class TopMessages:
+    """Space-Saving heavy hitters: approximate top-k counts in fixed memory"""
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, message):
+        counts = self.counts
+        if message in counts:
+            counts[message] += 1
+        elif len(counts) < self.capacity:
+            counts[message] = 1
+        else:
+            # Replace the rarest message; its count bounds the newcomer's error
+            rarest = min(counts, key=counts.get)
+            counts[message] = counts.pop(rarest) + 1
+
+    def top(self, n=5):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class LogQueryResult:
+    """Single-pass aggregate of a log query in bounded memory
+
+    Quacks like records.ResultSet (error, len, summary, render, to_dicts)
+    so it flows through the same response and voice paths.
+    """
+
+    def __init__(self, query, max_minutes=1440):
+        self.query = query
+        self.kind = 'logs'
+        self.error = None
+        self.truncated = False
+        self.timed_out = False
+        self.scanned = 0
+        self.matched = 0
+        self.samples = deque(maxlen=query.limit)   # last matching lines
+        self.per_minute = deque(maxlen=max_minutes)  # [minute, count], oldest first
+        self.first_minute = None
+        self.top_messages = TopMessages()
+        self._predicates = query.compile()
+
+    def __len__(self):
+        return self.matched
+
+    def feed(self, line):
+        self.scanned += 1
+        for predicate in self._predicates:
+            if not predicate(line):
+                return
+        self.matched += 1
+        self.samples.append(line)
+
+        stamp = TIMESTAMP.match(line)
+        if stamp:
+            minute = line[:16]
+            if self.first_minute is None:
+                self.first_minute = minute
+            if self.per_minute and self.per_minute[-1][0] == minute:
+                self.per_minute[-1][1] += 1
+            else:
+                self.per_minute.append([minute, 1])
+            line = line[stamp.end():]
+        self.top_messages.add(VARIABLE_PARTS.sub('#', line[:120].strip()))
+
+    def feed_all(self, lines):
+        for line in lines:
+            self.feed(line)
+        return self
+
+    def rate_per_minute(self):
+        """Average matches per minute from the first to the last match, and the peak minute"""
+        if not self.per_minute:
+            return 0.0, None
+        try:
+            span = datetime.fromisoformat(self.per_minute[-1][0]) - datetime.fromisoformat(self.first_minute)
+            minutes = span.total_seconds() / 60 + 1
+        except ValueError:
+            minutes = len(self.per_minute)
+        peak = max(self.per_minute, key=lambda bucket: bucket[1])
+        return self.matched / minutes, (peak[0][11:16], peak[1])
+
+    def summary(self):
+        if self.error:
+            return "Log query failed"
+        description = self.query.describe()
+        if not self.matched:
+            return f"No {description}"
+        summary = f"Found {self.matched} {description}"
+        top = self.top_messages.top(1)
+        if top and self.query.aggregate != 'count':
+            summary += f", most often: {top[0][0][:60]}"
+        return summary
+
+    def render(self):
+        if self.error:
+            return self.error
+        rate, peak = self.rate_per_minute()
+        lines = [f"✅ Log query: {self.matched} matching of {self.scanned} lines ({self.query.describe()})"]
+        if self.truncated:
+            lines.append(f"⚠️ Stopped after {MAX_QUERY_BYTES} bytes; narrow the time window for full counts")
+        if self.timed_out:
+            lines.append(f"⚠️ Stopped after {QUERY_TIMEOUT:g} s; narrow the time window for full counts")
+        if peak:
+            lines.append(f"Rate: {rate:.1f}/min, peak {peak[1]} at {peak[0]}")
+        if self.matched:
+            lines.append("Top messages:")
+            lines.extend(f"  {count}× {message}" for message, count in self.top_messages.top())
+            if self.query.aggregate != 'count':
+                lines.append(f"\nLast {len(self.samples)} matching lines:")
+                lines.extend(self.samples)
+        return "\n".join(lines)
+
+    def to_dicts(self):
+        rate, peak = self.rate_per_minute()
+        return [{
+            'query': self.query.describe(),
+            'scanned': self.scanned,
+            'matched': self.matched,
+            'truncated': self.truncated,
+            'timed_out': self.timed_out,
+            'rate_per_minute': round(rate, 2),
+            'per_minute': [{'minute': minute, 'count': count} for minute, count in self.per_minute],
+            'top_messages': [{'message': message, 'count': count} for message, count in self.top_messages.top()],
+            'lines': list(self.samples),
+        }]
+
+
+def log_query_args(query, container=None):
+    """CLI arguments for a query: docker if a container matched, else kubectl"""
+    if container:
+        args = ['docker', 'logs', '--timestamps']
+        if query.since:
+            args += ['--since', query.since]
+        return args + [container]
+    args = ['kubectl', 'logs', query.target, '--timestamps']
+    if query.since:
+        args.append(f'--since={query.since}')
+    if query.namespace:
+        args += ['-n', query.namespace]
+    return args
@@ -0,0 +1,186 @@
+import asyncio
+import os
+import signal
+import subprocess
+import tempfile
+import threading
+import weakref
+from metrics import SUBPROCESSES
+
+# Upper bound a client may request for one stream
+MAX_STREAM_BYTES = 16 * 1024 * 1024
+
+# Streams with a live child process, so shutdown can end them all
+ACTIVE_STREAMS = weakref.WeakSet()
+
+
+class LogStream:
+    """Follow a `docker logs -f` / `kubectl logs -f` process line by line
+
+    Lines are read only as fast as the consumer pulls them, so a slow client
+    backs up into the pipe and the child blocks instead of us buffering.
+    The stream stops after max_bytes or timeout seconds, and the child
+    process is killed whenever the consumer stops iterating. With
+    merge_stderr=False, stderr is kept out of the lines and left in .stderr
+    once the stream ends.
+    """
+
+    def __init__(self, args, max_bytes=1024 * 1024, max_line=8192, timeout=None, merge_stderr=True):
+        self.args = args
+        self.max_bytes = max_bytes
+        self.max_line = max_line
+        self.timeout = timeout
+        self.merge_stderr = merge_stderr
+        self.bytes_sent = 0
+        self.truncated = False
+        self.timed_out = False
+        self.stderr = ''
+        self.process = None
+
+    def lines(self):
+        """Yield decoded log lines until EOF, max_bytes or close()"""
+        SUBPROCESSES.inc(tool=self.args[0])
+        stderr_file = self._stderr_file()
+        try:
+            self.process = subprocess.Popen(
+                self.args,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                start_new_session=True
+            )
+        except OSError as e:
+            self._read_stderr(stderr_file)
+            self.stderr = str(e)
+            yield f"❌ Error starting log stream: {str(e)}"
+            return
+        ACTIVE_STREAMS.add(self)
+        # Killing the child ends readline() with EOF, so a hung CLI can't block us
+        timer = threading.Timer(self.timeout, self._expire) if self.timeout else None
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+
+        try:
+            while True:
+                line = self.process.stdout.readline(self.max_line)
+                if not line:
+                    # EOF: let the child exit on its own so its status is kept
+                    try:
+                        self.process.wait(timeout=1)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    break
+                if not self._account(line):
+                    break
+                yield line.decode(errors='replace').rstrip('\r\n')
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.close()
+            self._read_stderr(stderr_file)
+
+    async def alines(self):
+        """Async version of lines() for the ASGI path"""
+        SUBPROCESSES.inc(tool=self.args[0])
+        stderr_file = self._stderr_file()
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr_file,
+                limit=self.max_line,
+                start_new_session=True
+            )
+        except OSError as e:
+            self._read_stderr(stderr_file)
+            self.stderr = str(e)
+            yield f"❌ Error starting log stream: {str(e)}"
+            return
+        ACTIVE_STREAMS.add(self)
+        timer = asyncio.get_running_loop().call_later(self.timeout, self._expire) if self.timeout else None
+
+        try:
+            while True:
+                try:
+                    line = await self.process.stdout.readline()
+                except ValueError:
+                    # Line longer than max_line: emit it in pieces
+                    line = await self.process.stdout.read(self.max_line)
+                if not line:
+                    try:
+                        await asyncio.wait_for(self.process.wait(), 1)
+                    except asyncio.TimeoutError:
+                        pass
+                    break
+                if not self._account(line):
+                    break
+                yield line.decode(errors='replace').rstrip('\r\n')
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.close()
+            await self.process.wait()
+            self._read_stderr(stderr_file)
+
+    def _stderr_file(self):
+        """Where the child's stderr goes: into the lines, or a file read once it exits
+
+        A file rather than a pipe, so a chatty stderr can't fill up and stall the child.
+        """
+        return subprocess.STDOUT if self.merge_stderr else tempfile.TemporaryFile()
+
+    def _read_stderr(self, stderr_file):
+        if stderr_file is subprocess.STDOUT:
+            return
+        stderr_file.seek(0)
+        self.stderr = stderr_file.read(self.max_line).decode(errors='replace').strip()
+        stderr_file.close()
+
+    def _expire(self):
+        if self.process is not None and self.process.returncode is None:
+            self.timed_out = True
+            self.kill()
+
+    def _account(self, line):
+        self.bytes_sent += len(line)
+        if self.bytes_sent > self.max_bytes:
+            self.truncated = True
+            return False
+        return True
+
+    def close(self):
+        """Kill the follower process (and anything it spawned)"""
+        ACTIVE_STREAMS.discard(self)
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.kill()
+        if isinstance(self.process, subprocess.Popen):
+            self.process.wait()
+            self.process.stdout.close()
+
+    def kill(self):
+        """Kill the process group; the reader then sees EOF and finishes normally"""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+
+def close_all_streams():
+    """End every open log stream (on shutdown, so followers don't hold workers open)"""
+    for stream in list(ACTIVE_STREAMS):
+        if stream.process is not None and stream.process.returncode is None:
+            stream.kill()
+
+
+def format_sse(data, event=None):
+    """Encode one Server-Sent Events message"""
+    message = ''
+    if event:
+        message += f"event: {event}\n"
+    for line in data.split('\n'):
+        message += f"data: {line}\n"
+    return message + '\n'
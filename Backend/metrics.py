@@ -0,0 +1,261 @@
+import contextvars
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Seconds; spans a cache hit (sub-ms) to a slow CLI call near its timeout
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Request ID clients may send to get a stage-by-stage breakdown back
+TRACE_HEADER = 'X-Request-ID'
+REQUEST_ID = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+def format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label set"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(tuple(labels.get(name, '') for name in self.labelnames), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self.labelnames, key, value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            items = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        names = self.labelnames + ('le',)
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", names, key + (bound,), cumulative
+            yield f"{self.name}_sum", self.labelnames, key, total
+            yield f"{self.name}_count", self.labelnames, key, cumulative
+
+
+class Gauge:
+    """Values read from a callback at scrape time
+
+    kind='counter' exports a count a component already keeps (cache hits).
+    """
+
+    def __init__(self, name, help, collect, labelnames=(), kind='gauge'):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.collect = collect  # collect() -> [(label values, value), ...]
+        self.kind = kind
+
+    def samples(self):
+        try:
+            values = list(self.collect())
+        except Exception:
+            # A broken component must not break the whole scrape
+            values = []
+        for key, value in values:
+            yield self.name, self.labelnames, tuple(key), value
+
+
+class MetricsRegistry:
+    """Named metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Re-registering (e.g. a second app instance) replaces the collector
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, collect, labelnames=(), kind='gauge'):
+        return self.register(Gauge(name, help, collect, labelnames, kind))
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, key, value in metric.samples():
+                lines.append(f"{name}{format_labels(labelnames, key)} {format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'voice_stage_duration_seconds', 'Time spent in each request pipeline stage', ('stage',))
+REQUEST_SECONDS = REGISTRY.histogram(
+    'voice_request_duration_seconds', 'End-to-end voice command latency by intent', ('intent',))
+EXECUTE_SECONDS = REGISTRY.histogram(
+    'voice_execute_duration_seconds', 'Uncached kubectl/docker execution time', ('tool', 'verb', 'backend'))
+TTS_SECONDS = REGISTRY.histogram(
+    'voice_tts_duration_seconds', 'Speech worker queue wait and synthesis time', ('job', 'phase'))
+SUBPROCESSES = REGISTRY.counter(
+    'voice_subprocesses_total', 'CLI processes started', ('tool',))
+SUBPROCESS_TIMEOUTS = REGISTRY.counter(
+    'voice_subprocess_timeouts_total', 'CLI processes killed or abandoned at their timeout', ('tool',))
+
+_current_trace = contextvars.ContextVar('voice_trace', default=None)
+
+
+class Trace:
+    """Stage timings of one request, returned to clients that send a request ID"""
+
+    def __init__(self, request_id=None):
+        # Echoed in a response header, so anything unusual is replaced
+        self.request_id = request_id if request_id and REQUEST_ID.match(request_id) else uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.stages = []  # (name, start ms from request start, duration ms)
+
+    def add(self, name, started, duration):
+        self.stages.append((name, (started - self.started) * 1000, duration * 1000))
+
+    def ordered(self):
+        """Stages by start time; nested ones (kubectl get) follow their parent"""
+        return sorted(self.stages, key=lambda entry: entry[1])
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self):
+        """Server-Timing header value: parse;dur=1.2, execute;dur=40.3, ..."""
+        return ', '.join(f"{name.replace(' ', '-')};dur={duration:.1f}" for name, _, duration in self.ordered())
+
+    def to_dict(self):
+        return {
+            'request_id': self.request_id,
+            'total_ms': round(self.elapsed_ms(), 1),
+            'stages': [{'stage': name, 'start_ms': round(start, 1), 'duration_ms': round(duration, 1)}
+                       for name, start, duration in self.ordered()],
+        }
+
+
+@contextmanager
+def traced(request_id=None):
+    """Make a new Trace current for this request (thread or asyncio task)"""
+    trace = Trace(request_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage into the stage histogram and the current trace"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started
+        STAGE_SECONDS.observe(duration, stage=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, started, duration)
+
+
+def observe_execute(tool, command, backend, started):
+    """Record one uncached kubectl/docker call that began at perf_counter() == started"""
+    duration = time.perf_counter() - started
+    verb = command.split(None, 1)[0] if command and command.strip() else ''
+    EXECUTE_SECONDS.observe(duration, tool=tool, verb=verb, backend=backend)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(f"{tool} {verb}", started, duration)
+
+
+def register_component_metrics(executor, voice_response, async_executor=None, registry=REGISTRY):
+    """Gauges for cache hit ratios and queue depths, read from the components at scrape time"""
+    def cache_stats():
+        yield 'result', executor.cache.stats()
+        # From metrics(): in multi-worker mode the speech service owns the audio cache
+        yield 'audio', voice_response.metrics()['audio_cache']
+
+    def hit_ratio(stats):
+        lookups = stats['hits'] + stats['misses']
+        return stats['hits'] / lookups if lookups else 0.0
+
+    registry.gauge('voice_cache_hits_total', 'Cache hits', lambda: [((name,), s['hits']) for name, s in cache_stats()], ('cache',), 'counter')
+    registry.gauge('voice_cache_misses_total', 'Cache misses', lambda: [((name,), s['misses']) for name, s in cache_stats()], ('cache',), 'counter')
+    registry.gauge('voice_cache_hit_ratio', 'Cache hits / lookups since start', lambda: [((name,), hit_ratio(s)) for name, s in cache_stats()], ('cache',))
+    registry.gauge('voice_cache_bytes', 'Bytes held by each cache', lambda: [((name,), s['bytes']) for name, s in cache_stats()], ('cache',))
+
+    def queue_depths():
+        yield ('tts',), voice_response.metrics()['queue_depth']
+        if async_executor is not None:
+            yield ('inflight_loads',), async_executor.inflight_count()
+
+    registry.gauge('voice_queue_depth', 'Items waiting in each queue', queue_depths, ('queue',))
+    registry.gauge('voice_tts_events_total', 'Speech worker events (spoken, dropped, errors, ...)', lambda: [
+        ((name,), value) for name, value in voice_response.metrics().items() if isinstance(value, int) and not isinstance(value, bool) and name != 'queue_depth'
+    ], ('event',), 'counter')
@@ -0,0 +1,269 @@
+import json
+from collections import Counter
+from api_backend import render_table, pod_status, node_status, format_age
+
+
+class PodRecord:
+    __slots__ = ('namespace', 'name', 'ready', 'total', 'status', 'restarts', 'created')
+
+    def __init__(self, item):
+        metadata = item.get('metadata', {})
+        statuses = item.get('status', {}).get('containerStatuses', [])
+        self.namespace = metadata.get('namespace', '')
+        self.name = metadata.get('name', '')
+        self.ready = sum(1 for s in statuses if s.get('ready'))
+        self.total = len(statuses)
+        self.status = pod_status(item)
+        self.restarts = sum(s.get('restartCount', 0) for s in statuses)
+        self.created = metadata.get('creationTimestamp')
+
+    @classmethod
+    def from_line(cls, line):
+        """Record from one POD_JSONPATH line"""
+        record = cls.__new__(cls)
+        record.namespace, phase, waiting, created, ready, restarts, record.name = line.split('\t')
+        readies = ready.split()
+        record.ready = readies.count('true')
+        record.total = len(readies)
+        record.restarts = sum(map(int, restarts.split()))
+        record.status = pod_line_status(phase, waiting)
+        record.created = created or None
+        return record
+
+    def row(self):
+        return [self.name, f"{self.ready}/{self.total}", self.status, str(self.restarts), format_age(self.created)]
+
+
+def pod_line_status(phase, waiting):
+    """pod_status from a POD_JSONPATH line's phase and waiting reasons"""
+    return waiting.rsplit(' ', 1)[-1] if waiting else phase or 'Unknown'
+
+
+class ServiceRecord:
+    __slots__ = ('namespace', 'name', 'type', 'cluster_ip', 'ports', 'created', 'status')
+
+    def __init__(self, item):
+        metadata = item.get('metadata', {})
+        spec = item.get('spec', {})
+        self.namespace = metadata.get('namespace', '')
+        self.name = metadata.get('name', '')
+        self.type = spec.get('type', '')
+        self.cluster_ip = spec.get('clusterIP', '')
+        self.ports = ','.join(f"{p.get('port')}/{p.get('protocol', 'TCP')}" for p in spec.get('ports', []))
+        self.created = metadata.get('creationTimestamp')
+        self.status = None
+
+    def row(self):
+        return [self.name, self.type, self.cluster_ip, self.ports or '<none>', format_age(self.created)]
+
+
+class DeploymentRecord:
+    __slots__ = ('namespace', 'name', 'ready', 'desired', 'updated', 'available', 'created', 'status')
+
+    def __init__(self, item):
+        metadata = item.get('metadata', {})
+        status = item.get('status', {})
+        self.namespace = metadata.get('namespace', '')
+        self.name = metadata.get('name', '')
+        self.ready = status.get('readyReplicas', 0)
+        self.desired = item.get('spec', {}).get('replicas', 0)
+        self.updated = status.get('updatedReplicas', 0)
+        self.available = status.get('availableReplicas', 0)
+        self.created = metadata.get('creationTimestamp')
+        self.status = 'Available' if self.ready >= self.desired else 'Progressing'
+
+    def row(self):
+        return [self.name, f"{self.ready}/{self.desired}", str(self.updated), str(self.available), format_age(self.created)]
+
+
+class NodeRecord:
+    __slots__ = ('namespace', 'name', 'status', 'roles', 'created', 'version')
+
+    def __init__(self, item):
+        metadata = item.get('metadata', {})
+        labels = metadata.get('labels', {})
+        self.namespace = ''
+        self.name = metadata.get('name', '')
+        self.status = node_status(item)
+        self.roles = ','.join(sorted(k.split('/', 1)[1] for k in labels if k.startswith('node-role.kubernetes.io/')))
+        self.created = metadata.get('creationTimestamp')
+        self.version = item.get('status', {}).get('nodeInfo', {}).get('kubeletVersion', '')
+
+    def row(self):
+        return [self.name, self.status, self.roles or '<none>', format_age(self.created), self.version]
+
+
+class NamespaceRecord:
+    __slots__ = ('namespace', 'name', 'status', 'created')
+
+    def __init__(self, item):
+        metadata = item.get('metadata', {})
+        self.namespace = ''
+        self.name = metadata.get('name', '')
+        self.status = item.get('status', {}).get('phase', '')
+        self.created = metadata.get('creationTimestamp')
+
+    def row(self):
+        return [self.name, self.status, format_age(self.created)]
+
+
+class ContainerRecord:
+    __slots__ = ('namespace', 'id', 'name', 'image', 'status', 'state')
+
+    def __init__(self, obj):
+        self.namespace = ''
+        self.id = obj.get('ID', '')
+        self.name = obj.get('Names', '')
+        self.image = obj.get('Image', '')
+        self.state = obj.get('State', '')
+        # Normalized like pod phases so summaries can treat them alike
+        self.status = self.state.capitalize()
+
+    def row(self):
+        return [self.id, self.image, self.state, self.name]
+
+
+class ImageRecord:
+    __slots__ = ('namespace', 'name', 'repository', 'tag', 'id', 'created', 'size', 'status')
+
+    def __init__(self, obj):
+        self.namespace = ''
+        self.repository = obj.get('Repository', '')
+        self.tag = obj.get('Tag', '')
+        self.name = f"{self.repository}:{self.tag}"
+        self.id = obj.get('ID', '')
+        self.created = obj.get('CreatedSince', '')
+        self.size = obj.get('Size', '')
+        self.status = None
+
+    def row(self):
+        return [self.repository, self.tag, self.id, self.created, self.size]
+
+
+# kind -> (record class, table headers, noun used in summaries)
+RECORD_TYPES = {
+    'pods': (PodRecord, ['NAME', 'READY', 'STATUS', 'RESTARTS', 'AGE'], 'pod'),
+    'services': (ServiceRecord, ['NAME', 'TYPE', 'CLUSTER-IP', 'PORT(S)', 'AGE'], 'service'),
+    'deployments': (DeploymentRecord, ['NAME', 'READY', 'UP-TO-DATE', 'AVAILABLE', 'AGE'], 'deployment'),
+    'nodes': (NodeRecord, ['NAME', 'STATUS', 'ROLES', 'AGE', 'VERSION'], 'node'),
+    'namespaces': (NamespaceRecord, ['NAME', 'STATUS', 'AGE'], 'namespace'),
+    'containers': (ContainerRecord, ['CONTAINER ID', 'IMAGE', 'STATE', 'NAMES'], 'container'),
+    'images': (ImageRecord, ['REPOSITORY', 'TAG', 'IMAGE ID', 'CREATED', 'SIZE'], 'image'),
+}
+
+# Statuses that count as healthy when summarizing, and how to say it per kind
+HEALTHY_STATUSES = {'Running', 'Ready', 'Active', 'Available', 'Succeeded'}
+HEALTHY_WORDS = {'nodes': 'ready', 'deployments': 'available', 'namespaces': 'active'}
+
+
+class ResultSet:
+    """Typed records from one listing command, plus the tool that produced them
+
+    Built from output lines and their status counts, records are only
+    created when something needs more than the summary.
+    """
+
+    __slots__ = ('kind', 'tool', '_records', '_lines', '_counts', 'error', 'note')
+
+    def __init__(self, kind, tool, records=None, error=None, lines=None, counts=None, note=None):
+        self.kind = kind
+        self.tool = tool
+        self._records = records if records is not None or lines is not None else []
+        self._lines = lines
+        self._counts = counts
+        self.error = error
+        self.note = note  # shown under the table, e.g. the age of a snapshot
+
+    @property
+    def records(self):
+        if self._records is None:
+            from_line = RECORD_TYPES[self.kind][0].from_line
+            self._records = [from_line(line) for line in self._lines]
+            self._lines = None
+        return self._records
+
+    def __len__(self):
+        return len(self._records) if self._records is not None else len(self._lines)
+
+    def status_counts(self):
+        """Count records per status in one pass"""
+        if self._counts is not None:
+            return dict(self._counts)
+        counts = {}
+        for record in self.records:
+            counts[record.status] = counts.get(record.status, 0) + 1
+        return counts
+
+    def filter(self, status=None, namespace=None):
+        records = [
+            r for r in self.records
+            if (status is None or r.status == status) and (namespace is None or r.namespace == namespace)
+        ]
+        return ResultSet(self.kind, self.tool, records, note=self.note)
+
+    def unhealthy(self):
+        """Records in a state that needs attention (kinds without a status have none)"""
+        records = [r for r in self.records if r.status is not None and r.status not in HEALTHY_STATUSES]
+        return ResultSet(self.kind, self.tool, records, note=self.note)
+
+    def summary(self):
+        """Short spoken-style summary of the listing"""
+        if self.error:
+            return "Command failed with an error"
+        noun = RECORD_TYPES[self.kind][2]
+        if not len(self):
+            return "No resources found"
+
+        counts = self.status_counts()
+        if None in counts:
+            return f"Found {len(self)} {noun}{'s' if len(self) != 1 else ''}"
+
+        healthy = sum(n for status, n in counts.items() if status in HEALTHY_STATUSES)
+        summary = f"Found {healthy} {HEALTHY_WORDS.get(self.kind, 'running')} {noun}{'s' if healthy != 1 else ''}"
+        unhealthy = [(n, status) for status, n in counts.items() if status not in HEALTHY_STATUSES]
+        if unhealthy:
+            summary += ", " + ", ".join(f"{n} {status}" for n, status in sorted(unhealthy, reverse=True))
+        return summary
+
+    def render(self):
+        """Human-readable output in the same layout as the plain executor"""
+        if self.error:
+            return self.error
+        note = f"\nℹ️ {self.note}" if self.note else ''
+        if not len(self):
+            return "No resources found" + note
+        label = 'Kubectl' if self.tool == 'kubectl' else 'Docker'
+        headers = RECORD_TYPES[self.kind][1]
+        return f"✅ {label} Output:\n" + render_table(headers, [record.row() for record in self.records]) + (f"\n{note}" if note else '')
+
+    def to_dicts(self):
+        return [{slot: getattr(record, slot) for slot in record.__slots__} for record in self.records]
+
+
+def parse_kubectl_json(kind, output):
+    """Records from `kubectl get <kind> -o json` output"""
+    record_class = RECORD_TYPES[kind][0]
+    data = json.loads(output) if output.strip() else {}
+    return ResultSet(kind, 'kubectl', [record_class(item) for item in data.get('items', [])])
+
+
+def parse_pod_lines(output):
+    """Pods from `kubectl get pods -o jsonpath=POD_JSONPATH`
+
+    Statuses are counted from a partial split of each line; PodRecords are
+    only built if the listing is rendered or its records are used.
+    """
+    lines = [line for line in output.splitlines() if line]
+    if output.count('\t') != 6 * len(lines):
+        raise ValueError("unexpected pod lines: expected 7 tab-separated fields each")
+    # Namespace, phase, waiting reasons and the rest: enough for the status
+    heads = [line.split('\t', 3) for line in lines]
+    # pod_line_status, inlined: this is the per-pod hot loop
+    counts = Counter([head[2].rsplit(' ', 1)[-1] if head[2] else head[1] or 'Unknown' for head in heads])
+    return ResultSet('pods', 'kubectl', lines=lines, counts=counts)
+
+
+def parse_docker_json_lines(kind, output):
+    """Records from `docker ... --format '{{json .}}'` output"""
+    record_class = RECORD_TYPES[kind][0]
+    return ResultSet(kind, 'docker', [record_class(json.loads(line)) for line in output.splitlines() if line.strip()])
@@ -0,0 +1,290 @@
+import json
+import os
+import subprocess
+import threading
+import time
+from api_backend import KUBE_TABLES, render_table
+from cluster_fanout import KubeContexts
+from records import RECORD_TYPES, ResultSet
+
+# docker CLI `--format '{{json .}}'` rows
+DOCKER_TABLES = {
+    'containers': (
+        ['CONTAINER ID', 'IMAGE', 'STATUS', 'NAMES'],
+        lambda c: [c.get('ID', ''), c.get('Image', ''), c.get('Status', ''), c.get('Names', '')],
+    ),
+    'images': (
+        ['REPOSITORY', 'TAG', 'IMAGE ID', 'CREATED', 'SIZE'],
+        lambda i: [i.get('Repository', ''), i.get('Tag', ''), i.get('ID', ''), i.get('CreatedSince', ''), i.get('Size', '')],
+    ),
+}
+
+# Stands for the namespace kubectl would use: the current context's, else 'default'
+CONTEXT_NAMESPACE = 'context'
+
+# Executor commands the index can answer: (tool, command) -> (kind, namespace, status)
+INDEXED_COMMANDS = {
+    ('kubectl', 'get pods'): ('pods', CONTEXT_NAMESPACE, None),
+    ('kubectl', 'get services'): ('services', CONTEXT_NAMESPACE, None),
+    ('kubectl', 'get deployments'): ('deployments', CONTEXT_NAMESPACE, None),
+    ('kubectl', 'get nodes'): ('nodes', None, None),
+    ('kubectl', 'get namespaces'): ('namespaces', None, None),
+    ('docker', 'ps -a'): ('containers', None, None),
+    ('docker', 'ps'): ('containers', None, 'running'),
+    ('docker', 'images'): ('images', None, None),
+}
+
+# Index kinds made stale by a mutating AIProcessor intent
+INTENT_KINDS = {
+    'delete_pod': ['pods'],
+    'restart_pod': ['pods', 'deployments'],
+    'scale_deployment': ['deployments', 'pods'],
+    'stop_container': ['containers'],
+}
+
+
+class ResourceIndex:
+    """In-memory index of cluster/daemon resources by kind, namespace, name and status"""
+
+    def __init__(self, max_age=15, contexts=None):
+        self.max_age = max_age
+        # Resolves CONTEXT_NAMESPACE, re-read only when the kubeconfig changes
+        self.contexts = contexts if contexts is not None else KubeContexts()
+        self._lock = threading.Lock()
+        self._objects = {}      # kind -> {(namespace, name): (fingerprint, status, obj)}
+        self._by_namespace = {}  # kind -> namespace -> set(name)
+        self._by_status = {}     # kind -> status -> set((namespace, name))
+        self._updated_at = {}    # kind -> time.monotonic() of last snapshot
+        # kind -> stale-marking count; a snapshot taken under an older count is dropped
+        self._generations = {}
+        # Called as listener(kind, added_names, removed_names) after each changed snapshot
+        self.listeners = []
+
+    def generation(self, kind):
+        """Take before listing kind; pass to apply_snapshot so a listing overtaken by a change is dropped"""
+        with self._lock:
+            return self._generations.get(kind, 0)
+
+    def apply_snapshot(self, kind, records, generation=None):
+        """Diff a full listing into the index, touching only changed objects
+
+        records yields (namespace, name, fingerprint, status, obj).
+        Returns (added, updated, removed) counts, or None if kind was marked
+        stale after generation was taken (the listing may predate a change).
+        """
+        added, updated = [], 0
+        with self._lock:
+            if generation is not None and generation != self._generations.get(kind, 0):
+                return None
+            objects = self._objects.setdefault(kind, {})
+            by_namespace = self._by_namespace.setdefault(kind, {})
+            by_status = self._by_status.setdefault(kind, {})
+            seen = set()
+
+            for namespace, name, fingerprint, status, obj in records:
+                key = (namespace, name)
+                seen.add(key)
+                current = objects.get(key)
+                if current is not None and current[0] == fingerprint:
+                    continue
+
+                if current is None:
+                    added.append(name)
+                    by_namespace.setdefault(namespace, set()).add(name)
+                else:
+                    updated += 1
+                    by_status.get(current[1], set()).discard(key)
+                objects[key] = (fingerprint, status, obj)
+                by_status.setdefault(status, set()).add(key)
+
+            removed = [key for key in objects if key not in seen]
+            for key in removed:
+                _, status, _ = objects.pop(key)
+                by_namespace.get(key[0], set()).discard(key[1])
+                by_status.get(status, set()).discard(key)
+
+            self._updated_at[kind] = time.monotonic()
+
+        if added or removed:
+            for listener in self.listeners:
+                listener(kind, added, [name for _, name in removed])
+        return len(added), updated, len(removed)
+
+    def query(self, kind, namespace=None, status=None):
+        """Objects of a kind, optionally filtered by namespace and status, sorted by name"""
+        with self._lock:
+            objects = self._objects.get(kind, {})
+            if status is not None:
+                keys = self._by_status.get(kind, {}).get(status, set())
+                if namespace is not None:
+                    keys = [key for key in keys if key[0] == namespace]
+            elif namespace is not None:
+                keys = [(namespace, name) for name in self._by_namespace.get(kind, {}).get(namespace, ())]
+            else:
+                keys = objects.keys()
+            return [objects[key][2] for key in sorted(keys, key=lambda k: k[1])]
+
+    def count(self, kind, namespace=None, status=None):
+        with self._lock:
+            if status is not None:
+                keys = self._by_status.get(kind, {}).get(status, ())
+                if namespace is None:
+                    return len(keys)
+                return sum(1 for key in keys if key[0] == namespace)
+            if namespace is not None:
+                return len(self._by_namespace.get(kind, {}).get(namespace, ()))
+            return len(self._objects.get(kind, {}))
+
+    def age(self, kind):
+        """Seconds since the last snapshot of kind, or None if never loaded/stale-marked"""
+        updated = self._updated_at.get(kind)
+        if updated is None:
+            return None
+        return time.monotonic() - updated
+
+    def mark_stale(self, kind):
+        """Force live lookups for kind until a snapshot taken after this call"""
+        with self._lock:
+            self._updated_at.pop(kind, None)
+            self._generations[kind] = self._generations.get(kind, 0) + 1
+
+    def mark_stale_for_intent(self, command_type):
+        for kind in INTENT_KINDS.get(command_type, []):
+            self.mark_stale(kind)
+
+    def render(self, kind, namespace=None, status=None):
+        """Render indexed objects in the CLI's table layout"""
+        objects = self.query(kind, namespace, status)
+        if kind in KUBE_TABLES:
+            headers, row, _ = KUBE_TABLES[kind]
+        else:
+            headers, row = DOCKER_TABLES[kind]
+        if not objects:
+            return ''
+        return render_table(headers, [row(obj) for obj in objects])
+
+    def _spec(self, tool, command):
+        """(kind, namespace, status) for an indexed command, or None to go live"""
+        spec = INDEXED_COMMANDS.get((tool, ' '.join(command.split())))
+        if spec is None or spec[1] != CONTEXT_NAMESPACE:
+            return spec
+        namespace = self.contexts.namespace()
+        return (spec[0], namespace, spec[2]) if namespace is not None else None
+
+    def answer(self, tool, command):
+        """Executor-formatted output for a listing command, or None to go live"""
+        spec = self._spec(tool, command)
+        if spec is None:
+            return None
+        kind, namespace, status = spec
+        age = self.age(kind)
+        if age is None or age > self.max_age:
+            return None
+
+        table = self.render(kind, namespace, status)
+        label = 'Kubectl' if tool == 'kubectl' else 'Docker'
+        if not table:
+            return f"No resources found\nℹ️ From snapshot, {age:.1f}s old"
+        return f"✅ {label} Output:\n{table}\n\nℹ️ From snapshot, {age:.1f}s old"
+
+    def answer_records(self, tool, command):
+        """Typed records for a listing command, or None to go live"""
+        spec = self._spec(tool, command)
+        if spec is None:
+            return None
+        kind, namespace, status = spec
+        age = self.age(kind)
+        if age is None or age > self.max_age:
+            return None
+
+        record_class = RECORD_TYPES[kind][0]
+        records = [record_class(obj) for obj in self.query(kind, namespace, status)]
+        return ResultSet(kind, tool, records, note=f"From snapshot, {age:.1f}s old")
+
+
+def kube_records(kind, data):
+    """Index records from a `kubectl get <kind> -A -o json` listing"""
+    status = KUBE_TABLES[kind][2]
+    for item in data.get('items', []):
+        metadata = item.get('metadata', {})
+        yield (
+            metadata.get('namespace', ''),
+            metadata.get('name', ''),
+            metadata.get('resourceVersion') or json.dumps(item, sort_keys=True),
+            status(item) if status is not None else None,
+            item,
+        )
+
+
+def docker_records(kind, output):
+    """Index records from `docker ps -a` / `docker images` JSON lines"""
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if kind == 'containers':
+            yield ('', obj.get('Names', ''), line, obj.get('State', ''), obj)
+        else:
+            yield ('', f"{obj.get('Repository', '')}:{obj.get('Tag', '')}@{obj.get('ID', '')}", line, None, obj)
+
+
+class ResourcePoller:
+    """Background thread keeping a ResourceIndex fresh by diffed polling"""
+
+    KUBE_KINDS = ['pods', 'services', 'deployments', 'nodes', 'namespaces']
+    DOCKER_KINDS = ['containers', 'images']
+
+    def __init__(self, index, interval=5, timeout=10):
+        self.index = index
+        self.interval = interval
+        self.timeout = timeout
+        self.errors = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='resource-poller', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        """Refresh every kind once; failures leave that kind's snapshot to age out"""
+        for kind in self.KUBE_KINDS:
+            self._refresh(kind, ['kubectl', 'get', kind, '--all-namespaces', '-o', 'json'],
+                          lambda out, kind=kind: kube_records(kind, json.loads(out)))
+        self._refresh('containers', ['docker', 'ps', '-a', '--format', '{{json .}}'],
+                      lambda out: docker_records('containers', out))
+        self._refresh('images', ['docker', 'images', '--format', '{{json .}}'],
+                      lambda out: docker_records('images', out))
+
+    def _refresh(self, kind, args, parse):
+        # A change made while this listing runs makes it stale; it is then dropped
+        generation = self.index.generation(kind)
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, timeout=self.timeout)
+            if result.returncode != 0:
+                self.errors[kind] = result.stderr.strip()
+                return
+            self.index.apply_snapshot(kind, list(parse(result.stdout)), generation)
+            self.errors.pop(kind, None)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            self.errors[kind] = str(e)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+
+def start_index_from_env(environ=None):
+    """Start a polled ResourceIndex when EXECUTOR_MODE=index, else return None"""
+    env = os.environ if environ is None else environ
+    if env.get('EXECUTOR_MODE', 'live') != 'index':
+        return None
+
+    interval = float(env.get('INDEX_POLL_INTERVAL', 5))
+    index = ResourceIndex(max_age=3 * interval)
+    ResourcePoller(index, interval=interval).start()
+    return index
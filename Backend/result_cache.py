@@ -0,0 +1,265 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds a read-only result stays fresh, per (tool, verb)
+DEFAULT_TTLS = {
+    ('kubectl', 'get'): 5,
+    ('kubectl', 'describe'): 5,
+    ('kubectl', 'logs'): 2,
+    ('kubectl', 'version'): 60,
+    ('docker', 'ps'): 3,
+    ('docker', 'images'): 30,
+    ('docker', 'logs'): 2,
+    ('docker', 'info'): 30,
+}
+
+# Verbs that change cluster/daemon state and must never be cached
+MUTATING_VERBS = {
+    'kubectl': {'delete', 'scale', 'rollout', 'apply', 'patch', 'create', 'edit', 'label', 'annotate', 'cordon', 'drain'},
+    'docker': {'stop', 'start', 'restart', 'kill', 'rm', 'rmi', 'run', 'pause', 'unpause'},
+}
+
+# Cache tags dropped when a mutating intent runs
+INTENT_INVALIDATIONS = {
+    'delete_pod': [('kubectl', 'pod')],
+    'restart_pod': [('kubectl', 'pod'), ('kubectl', 'deployment')],
+    'scale_deployment': [('kubectl', 'deployment'), ('kubectl', 'pod')],
+    'stop_container': [('docker', 'container')],
+}
+
+KUBECTL_RESOURCE_ALIASES = {
+    'po': 'pod', 'svc': 'service', 'deploy': 'deployment', 'no': 'node',
+    'ns': 'namespace', 'cm': 'configmap', 'logs': 'pod',
+}
+
+
+def normalize_command(command):
+    """Collapse whitespace so equivalent commands share a cache key"""
+    return ' '.join(command.split())
+
+
+def command_tag(tool, command):
+    """Resource tag used to group cache entries for invalidation"""
+    words = command.split()
+    if not words:
+        return (tool, '')
+
+    if tool == 'docker':
+        if words[0] in ('ps', 'logs', 'stop', 'start', 'restart', 'kill', 'rm', 'pause', 'unpause'):
+            return (tool, 'container')
+        if words[0] in ('images', 'rmi'):
+            return (tool, 'image')
+        return (tool, words[0])
+
+    # kubectl <verb> <resource> ...
+    verb = words[0]
+    if verb == 'logs':
+        return (tool, 'pod')
+    resource = words[1] if len(words) > 1 else verb
+    if verb == 'rollout' and len(words) > 2:
+        resource = words[2]
+    resource = resource.split('/')[0].split('.')[0].lower()
+    resource = KUBECTL_RESOURCE_ALIASES.get(resource, resource)
+    if resource.endswith('s') and resource not in ('status',):
+        resource = resource[:-1]
+    return (tool, resource)
+
+
+class _Flight:
+    """An in-progress load that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResultCache:
+    """TTL + LRU cache for read-only kubectl/docker output with single-flight loads"""
+
+    def __init__(self, ttls=None, max_bytes=4 * 1024 * 1024, max_entries=256):
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()  # key -> (expires_at, tag, value, size in bytes)
+        self._flights = {}
+        self._bytes = 0
+        # tag -> invalidation count; a load that saw an older count is not stored
+        self._generations = {}
+        self._lock = threading.Lock()
+
+        self._kubeconfig_path = None
+        self._kubeconfig_mtime = None
+        self._kube_context = ''
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def is_cacheable(self, tool, command):
+        """Only read-only verbs with a configured TTL are cached"""
+        verb = command.split()[0] if command.split() else ''
+        return self.ttls.get((tool, verb), 0) > 0
+
+    def is_mutating(self, tool, command):
+        verb = command.split()[0] if command.split() else ''
+        return verb in MUTATING_VERBS.get(tool, ())
+
+    def get_or_load(self, tool, command, loader, should_store=None):
+        """Return a cached result or run loader once for all concurrent callers"""
+        command = normalize_command(command)
+        verb = command.split()[0] if command else ''
+        ttl = self.ttls.get((tool, verb), 0)
+        key = (tool, self.current_kube_context() if tool == 'kubectl' else '', command)
+        tag = command_tag(tool, command)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                self.misses += 1
+                flight = _Flight()
+                self._flights[key] = flight
+                generation = self._generations.get(tag, 0)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = loader()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                # An invalidation during the load means the result may predate a mutation
+                if (flight.error is None and ttl > 0 and self._generations.get(tag, 0) == generation
+                        and (should_store is None or should_store(flight.result))):
+                    self._store(key, tag, flight.result, ttl)
+            flight.done.set()
+
+        return flight.result
+
+    def lookup(self, tool, command):
+        """Return a fresh cached result or None, without loading"""
+        command = normalize_command(command)
+        key = (tool, self.current_kube_context() if tool == 'kubectl' else '', command)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        return None
+
+    def generation(self, tool, command):
+        """Invalidation count of the command's tag; pass it to store() after loading"""
+        with self._lock:
+            return self._generations.get(command_tag(tool, normalize_command(command)), 0)
+
+    def store(self, tool, command, value, generation=None):
+        """Store a result loaded outside get_or_load (e.g. by the async executor)
+
+        With the generation taken before the load, a result that an
+        invalidation overtook is dropped instead of served for a full TTL.
+        """
+        command = normalize_command(command)
+        verb = command.split()[0] if command else ''
+        ttl = self.ttls.get((tool, verb), 0)
+        if ttl <= 0:
+            return
+        key = (tool, self.current_kube_context() if tool == 'kubectl' else '', command)
+        tag = command_tag(tool, command)
+        with self._lock:
+            if generation is not None and self._generations.get(tag, 0) != generation:
+                return
+            self._store(key, tag, value, ttl)
+
+    def _store(self, key, tag, value, ttl):
+        size = len(value.encode()) if isinstance(value, str) else len(value)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old:
+            self._bytes -= old[3]
+
+        self._entries[key] = (time.monotonic() + ttl, tag, value, size)
+        self._bytes += size
+
+        while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted[3]
+
+    def invalidate(self, tool, resource):
+        """Drop every entry tagged with the given (tool, resource)"""
+        with self._lock:
+            self._generations[(tool, resource)] = self._generations.get((tool, resource), 0) + 1
+            for key in [k for k, v in self._entries.items() if v[1] == (tool, resource)]:
+                self._bytes -= self._entries.pop(key)[3]
+
+    def invalidate_command(self, tool, command):
+        """Invalidate entries related to a mutating command"""
+        self.invalidate(*command_tag(tool, normalize_command(command)))
+
+    def invalidate_intent(self, command_type):
+        """Invalidate entries affected by a mutating AIProcessor intent"""
+        for tool, resource in INTENT_INVALIDATIONS.get(command_type, []):
+            self.invalidate(tool, resource)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def current_kube_context(self):
+        """Current kubeconfig context, re-read only when the file changes"""
+        path = os.environ.get('KUBECONFIG', '').split(os.pathsep)[0] or os.path.expanduser('~/.kube/config')
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return ''
+
+        if path != self._kubeconfig_path or mtime != self._kubeconfig_mtime:
+            context = ''
+            try:
+                with open(path) as f:
+                    for line in f:
+                        if line.startswith('current-context:'):
+                            context = line.split(':', 1)[1].strip().strip('"\'')
+                            break
+            except OSError:
+                pass
+            self._kubeconfig_path = path
+            self._kubeconfig_mtime = mtime
+            self._kube_context = context
+
+        return self._kube_context
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+            }
@@ -0,0 +1,138 @@
+import os
+import time
+from api_backend import render_table
+from cluster_fanout import ClusterResult
+from records import RECORD_TYPES
+
+# Listings with more records than this are not kept for diffing
+MAX_SNAPSHOT_RECORDS = int(os.environ.get('DIFF_MAX_RECORDS', 20000))
+
+
+def entries(result):
+    """((cluster, namespace, name), record) pairs of a ResultSet or ClusterResult"""
+    if isinstance(result, ClusterResult):
+        return [((context, r.namespace, r.name), r) for context, result_set in result.results for r in result_set.records]
+    return [((None, r.namespace, r.name), r) for r in result.records]
+
+
+def unanswered(result):
+    """Clusters that did not answer this time; their objects are not reported as removed"""
+    return {context for context, _ in result.failures} if isinstance(result, ClusterResult) else set()
+
+
+def say_ago(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    minutes = seconds // 60
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
+class Snapshot:
+    """One listing's records by (cluster, namespace, name), kept to diff the next one"""
+
+    __slots__ = ('kind', 'records', 'taken')
+
+    def __init__(self, kind, records):
+        self.kind = kind
+        self.records = records  # (cluster, namespace, name) -> record
+        self.taken = time.monotonic()
+
+    @classmethod
+    def of(cls, result, previous=None):
+        """Snapshot of a listing; clusters that did not answer keep their previous records"""
+        records = dict(entries(result))
+        down = unanswered(result)
+        if previous is not None and down:
+            for key, record in previous.records.items():
+                if key[0] in down:
+                    records.setdefault(key, record)
+        return cls(result.kind, records)
+
+
+class ResultDelta:
+    """Objects added, removed or with a new status since the previous snapshot"""
+
+    def __init__(self, kind, added, removed, changed, total, since, clusters=False, failures=()):
+        self.kind = kind
+        self.added = added      # [(key, record)]
+        self.removed = removed  # [(key, record)] as last seen
+        self.changed = changed  # [(key, previous status, record)]
+        self.total = total
+        self.since = since      # seconds since the previous snapshot
+        self.clusters = clusters
+        self.failures = list(failures)
+        self.error = None
+        # Current objects in display order, for "describe the first one"
+        self.records = [record for _, _, record in changed] + [record for _, record in added]
+
+    @classmethod
+    def between(cls, previous, result):
+        """Keyed delta of result against a Snapshot, in one pass over each"""
+        current = dict(entries(result))
+        down = unanswered(result)
+        added, changed = [], []
+        for key, record in current.items():
+            old = previous.records.get(key)
+            if old is None:
+                added.append((key, record))
+            elif old.status != record.status:
+                changed.append((key, old.status, record))
+        removed = [(key, record) for key, record in previous.records.items()
+                   if key not in current and key[0] not in down]
+        return cls(result.kind, added, removed, changed, len(current), time.monotonic() - previous.taken,
+                   clusters=isinstance(result, ClusterResult), failures=getattr(result, 'failures', ()))
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+    def summary(self):
+        """Spoken summary of the changes only: "2 pods went CrashLoopBackOff, 1 new pod" """
+        noun = RECORD_TYPES[self.kind][2]
+
+        def count(n):
+            return f"{n} {noun}{'s' if n != 1 else ''}"
+
+        if not len(self):
+            summary = f"No changes in {count(self.total)} since {say_ago(self.since)} ago"
+        else:
+            statuses = {}
+            for _, _, record in self.changed:
+                statuses[record.status] = statuses.get(record.status, 0) + 1
+            parts = [f"{count(n)} went {status}" for n, status in sorted(((n, s) for s, n in statuses.items()), reverse=True)]
+            if self.added:
+                parts.append(f"{len(self.added)} new {noun}{'s' if len(self.added) != 1 else ''}")
+            if self.removed:
+                parts.append(f"{count(len(self.removed))} gone")
+            summary = ", ".join(parts)
+        if self.failures:
+            summary += "; no answer from " + ", ".join(context for context, _ in self.failures)
+        return summary
+
+    def render(self):
+        """Only the changed rows, with a CHANGE column (and CLUSTER across clusters)"""
+        noun = RECORD_TYPES[self.kind][2]
+        headers = ['CHANGE'] + (['CLUSTER'] if self.clusters else []) + RECORD_TYPES[self.kind][1]
+
+        def row(change, key, record):
+            return [change] + ([key[0]] if self.clusters else []) + record.row()
+
+        rows = [row(f"{old} -> {record.status}", key, record) for key, old, record in self.changed]
+        rows += [row('added', key, record) for key, record in self.added]
+        rows += [row('removed', key, record) for key, record in self.removed]
+        output = f"✅ Changes since {say_ago(self.since)} ago ({self.total} {noun}s listed):\n"
+        output += render_table(headers, rows) if rows else "No changes"
+        for context, reason in self.failures:
+            output += f"\n⚠️ {context}: {reason}"
+        return output
+
+    def to_dicts(self):
+        def as_dict(change, key, record, **extra):
+            values = {slot: getattr(record, slot) for slot in record.__slots__}
+            if self.clusters:
+                values['cluster'] = key[0]
+            return dict(values, change=change, **extra)
+
+        return ([as_dict('status', key, record, previous_status=old) for key, old, record in self.changed]
+                + [as_dict('added', key, record) for key, record in self.added]
+                + [as_dict('removed', key, record) for key, record in self.removed])
@@ -0,0 +1,161 @@
+"""Production server for the Voice DevOps Assistant
+
+Runs several worker processes, each building its own components once:
+ASGI workers under uvicorn (default), or threaded WSGI workers under
+gunicorn. With more than one worker, a separate speech service process
+owns text-to-speech and the workers send it what to say.
+
+    python serve.py                                   # ASGI, one worker per CPU
+    python serve.py --server wsgi --workers 4 --threads 8
+    WEB_CONCURRENCY=8 PORT=8000 python serve.py
+
+On SIGTERM/SIGINT workers stop accepting connections, end open log streams,
+finish in-flight requests and give running kubectl/docker processes up to
+GRACEFUL_TIMEOUT seconds before killing them.
+"""
+import argparse
+import functools
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from app_logging import configure_logging, get_logger
+from log_stream import close_all_streams
+from speech_service import run_speech_service
+
+log = get_logger('serve')
+
+
+def parse_settings(argv=None, environ=None):
+    """Server settings from the environment, overridden by command line flags"""
+    env = os.environ if environ is None else environ
+    parser = argparse.ArgumentParser(description='Voice DevOps Assistant production server')
+    parser.add_argument('--server', choices=['asgi', 'wsgi'], default=env.get('SERVER', 'asgi'))
+    parser.add_argument('--host', default=env.get('HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(env.get('PORT', 5000)))
+    parser.add_argument('--workers', type=int, default=int(env.get('WEB_CONCURRENCY', os.cpu_count() or 1)))
+    parser.add_argument('--threads', type=int, default=int(env.get('THREADS', 8)),
+                        help='request threads per WSGI worker')
+    parser.add_argument('--graceful-timeout', type=float, default=float(env.get('GRACEFUL_TIMEOUT', 30)))
+    parser.add_argument('--tts-socket', default=env.get('TTS_SOCKET') or os.path.join(
+        tempfile.gettempdir(), f"voice-devops-tts-{os.getpid()}.sock"))
+    parser.add_argument('--warm-up', action=argparse.BooleanOptionalAction, default=env.get('WARM_UP', '1') == '1',
+                        help='build speech engine, patterns and API connections in the background at startup')
+    parser.add_argument('--log-level', default=env.get('LOG_LEVEL', 'INFO'))
+    return parser.parse_args(argv)
+
+
+def start_speech_service(path, timeout=10):
+    """Start the process that owns text-to-speech and wait until it listens on path"""
+    if os.path.exists(path):
+        # Left over from a previous run; waiting below must see the new socket
+        os.remove(path)
+    # spawn, not fork: the engine must be created in a clean process
+    process = multiprocessing.get_context('spawn').Process(
+        target=run_speech_service, args=(path,), name='speech-service', daemon=True)
+    process.start()
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path) and process.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if not os.path.exists(path):
+        log.warning("Speech service did not start; voice output is disabled")
+    return process
+
+
+def asgi_config(settings):
+    import uvicorn
+    return uvicorn.Config('asgi:app', host=settings.host, port=settings.port, workers=settings.workers,
+                          lifespan='on', log_level=settings.log_level.lower())
+
+
+def run_asgi_worker(settings, sockets=None):
+    """One ASGI worker process (also the whole server when workers == 1)"""
+    import uvicorn
+
+    class DrainingServer(uvicorn.Server):
+        def handle_exit(self, sig, frame):
+            # Followed logs never end by themselves; end them so connections can close
+            close_all_streams()
+            super().handle_exit(sig, frame)
+
+    DrainingServer(asgi_config(settings)).run(sockets=sockets)
+
+
+def serve_asgi(settings):
+    from uvicorn.supervisors import Multiprocess
+
+    if settings.workers <= 1:
+        run_asgi_worker(settings)
+        return
+    config = asgi_config(settings)
+    Multiprocess(config, target=functools.partial(run_asgi_worker, settings), sockets=[config.bind_socket()]).run()
+
+
+def end_streams_on_term(worker):
+    """gunicorn post_worker_init hook: end log streams as soon as SIGTERM arrives"""
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        close_all_streams()
+        if callable(previous):
+            previous(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+def serve_wsgi(settings):
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        'bind': f"{settings.host}:{settings.port}",
+        'workers': settings.workers,
+        'threads': settings.threads,
+        'worker_class': 'gthread',
+        'graceful_timeout': settings.graceful_timeout,
+        # Components are built in each worker after the fork, never shared
+        'preload_app': False,
+        'post_worker_init': end_streams_on_term,
+        'worker_exit': lambda server, worker: close_all_streams(),
+        'loglevel': settings.log_level.lower(),
+    }
+
+    class WSGIServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import app
+            return app
+
+    WSGIServer().run()
+
+
+def main(argv=None):
+    settings = parse_settings(argv)
+    configure_logging(settings.log_level)
+    # Workers read these when they build their components
+    os.environ['GRACEFUL_TIMEOUT'] = str(settings.graceful_timeout)
+    os.environ['LOG_LEVEL'] = settings.log_level
+    os.environ['WARM_UP'] = '1' if settings.warm_up else '0'
+
+    speech = None
+    if settings.workers > 1:
+        speech = start_speech_service(settings.tts_socket)
+        os.environ['TTS_SOCKET'] = settings.tts_socket
+
+    log.info("Serving %s on %s:%d with %d worker(s)", settings.server.upper(), settings.host, settings.port, settings.workers)
+    try:
+        if settings.server == 'wsgi':
+            serve_wsgi(settings)
+        else:
+            serve_asgi(settings)
+    finally:
+        if speech is not None:
+            speech.terminate()
+            speech.join(5)
+
+
+if __name__ == '__main__':
+    main()
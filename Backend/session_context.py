@@ -0,0 +1,235 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from cluster_fanout import ClusterResult
+from records import ResultSet
+from result_diff import MAX_SNAPSHOT_RECORDS, ResultDelta, Snapshot
+
+SESSION_HEADER = 'X-Session-ID'
+# Client-chosen session IDs, same shape as request IDs
+SESSION_ID = re.compile(r'^[A-Za-z0-9._:-]{1,64}$')
+
+ORDINALS = {
+    'first': 0, 'second': 1, 'third': 2, 'fourth': 3, 'fifth': 4,
+    'sixth': 5, 'seventh': 6, 'eighth': 7, 'ninth': 8, 'tenth': 9, 'last': -1,
+}
+NOUNS = r'(?:one|pod|container|deployment|service|node|image|namespace)s?'
+# "the second one", "the 3rd pod", "number 2", "the next one"
+ORDINAL_REFERENCE = re.compile(
+    rf'\b(?:(?P<word>{"|".join(ORDINALS)})|(?P<digits>\d+)(?:st|nd|rd|th))(?:\s+{NOUNS}\b|\s*$)'
+    rf'|\bnumber\s+(?P<number>\d+)\b'
+    rf'|\b(?P<step>next|previous)(?:\s+{NOUNS}\b|\s*$)'
+)
+# "that", "it", "its", "this pod", "the same one"
+LAST_REFERENCE = re.compile(rf'\b(?:that|its?|this|the\s+same)(?:\s+{NOUNS})?\b')
+# Words the name patterns pick up from a reference ("describe the second one")
+REFERENCE_WORDS = {'that', 'it', 'its', 'this', 'same', 'one', 'number', 'next', 'previous'} | set(ORDINALS)
+REFERENCE_WORDS |= {f"{n}{suffix}" for n in range(1, 100) for suffix in ('st', 'nd', 'rd', 'th')}
+
+# Verb in a follow-up -> intent, by the kind of the resource it refers to.
+# Changes are listed so "kill it" asks for a name; they never take one from a reference
+FOLLOW_UP_INTENTS = {
+    'pods': [('describe', 'describe_pod'), ('detail', 'describe_pod'), ('log', 'get_logs'),
+             ('delete', 'delete_pod'), ('remove', 'delete_pod'), ('kill', 'delete_pod'), ('show', 'describe_pod')],
+    'containers': [('log', 'get_logs'), ('stop', 'stop_container')],
+    'deployments': [('scale', 'scale_deployment'), ('restart', 'restart_pod')],
+}
+# Intents that change something: their target must be said, not referred to
+CHANGE_INTENTS = {'delete_pod', 'restart_pod', 'scale_deployment', 'stop_container'}
+# Kind of the resource a named intent acts on
+INTENT_KINDS = {
+    'describe_pod': 'pods', 'delete_pod': 'pods', 'get_logs': 'pods', 'search_logs': 'pods',
+    'restart_pod': 'deployments', 'scale_deployment': 'deployments', 'stop_container': 'containers',
+}
+# Intents that take the session's namespace when none was said
+NAMESPACED_INTENTS = {
+    'get_pods', 'describe_pod', 'delete_pod', 'restart_pod', 'get_services', 'get_deployments',
+    'scale_deployment', 'get_configmaps', 'get_secrets',
+}
+# "what changed in the deployments": listing intent by the noun said
+LISTING_INTENTS = [
+    ('pod', 'get_pods'), ('deployment', 'get_deployments'), ('service', 'get_services'), ('node', 'get_nodes'),
+    ('namespace', 'get_namespaces'), ('container', 'list_containers'), ('image', 'list_images'),
+]
+
+
+class ResultIndex:
+    """The names from a listing, by position and by name (no record payloads)"""
+
+    __slots__ = ('kind', 'names', 'namespaces', 'positions')
+
+    def __init__(self, result_set, max_records=500):
+        records = result_set.records[:max_records]
+        self.kind = result_set.kind
+        self.names = tuple(record.name for record in records)
+        self.namespaces = tuple(record.namespace for record in records)
+        self.positions = {name: i for i, name in reversed(list(enumerate(self.names)))}
+
+    def __len__(self):
+        return len(self.names)
+
+    def at(self, position):
+        """(name, namespace) at a 0-based position (negative from the end), or None"""
+        if -len(self.names) <= position < len(self.names):
+            return self.names[position], self.namespaces[position]
+        return None
+
+
+class SessionContext:
+    """What one conversation has seen: the last listing, namespace and resource, and a snapshot per query"""
+
+    def __init__(self, max_snapshots=8):
+        self.result = None         # ResultIndex of the last listing
+        self.namespace = None      # namespace last said explicitly
+        self.resource = None       # (kind, name, namespace) last referred to
+        self.query = None          # (command_type, params) of the last listing
+        self.snapshots = OrderedDict()  # query key -> Snapshot, least recently used first
+        self.max_snapshots = max_snapshots
+        self.touched = time.monotonic()
+
+    def resolve(self, command, command_type, params):
+        """Fill a follow-up's intent and parameters from the context
+
+        command is the normalized text; returns (command_type, params).
+        """
+        params = dict(params)
+        if params.get('name') in REFERENCE_WORDS:
+            del params['name']
+
+        # "what changed": the listing named, else the last one, again
+        if params.get('diff') and command_type == 'unknown':
+            command_type = next((intent for noun, intent in LISTING_INTENTS if noun in command), None)
+            if command_type is None and self.query is not None:
+                command_type = self.query[0]
+                params = dict(self.query[1], **params)
+            command_type = command_type or 'unknown'
+
+        said_namespace = params.get('namespace')
+        # Only an intent that needs a name (or none at all) can refer back:
+        # "show pods that are running" is still a listing
+        needs_target = command_type in INTENT_KINDS or command_type == 'unknown'
+        target = self._referenced(command) if needs_target and 'name' not in params else None
+        if target is not None:
+            kind, name, namespace = target
+            if command_type == 'unknown':
+                command_type = self._follow_up_intent(command, kind) or command_type
+            if command_type in CHANGE_INTENTS:
+                # "delete that" could hit a different object than the user has in mind:
+                # left without a name, the executor asks for one
+                target = None
+            else:
+                params['name'] = name
+                if namespace and 'namespace' not in params:
+                    params['namespace'] = namespace
+
+        if said_namespace:
+            self.namespace = said_namespace
+        elif 'namespace' not in params and self.namespace and command_type in NAMESPACED_INTENTS:
+            params['namespace'] = self.namespace
+
+        if target is not None:
+            self.resource = target
+        elif params.get('name') and command_type in INTENT_KINDS:
+            self.resource = (INTENT_KINDS[command_type], params['name'], params.get('namespace'))
+        return command_type, params
+
+    def _referenced(self, command):
+        """(kind, name, namespace) the command points at, or None"""
+        match = ORDINAL_REFERENCE.search(command)
+        if match and self.result is not None:
+            if match.group('step'):
+                if self.resource is None or self.resource[1] not in self.result.positions:
+                    return None
+                position = self.result.positions[self.resource[1]] + (1 if match.group('step') == 'next' else -1)
+                if position < 0:
+                    return None
+            elif match.group('word'):
+                position = ORDINALS[match.group('word')]
+            else:
+                position = int(match.group('digits') or match.group('number')) - 1
+            entry = self.result.at(position)
+            return (self.result.kind, *entry) if entry else None
+
+        if LAST_REFERENCE.search(command):
+            if self.resource is not None:
+                return self.resource
+            if self.result is not None and len(self.result) == 1:
+                return (self.result.kind, *self.result.at(0))
+        return None
+
+    def _follow_up_intent(self, command, kind):
+        for verb, intent in FOLLOW_UP_INTENTS.get(kind, []):
+            if verb in command:
+                return intent
+        return None
+
+    def changes(self, command_type, params, result, diff=False):
+        """Snapshot a listing under its query; in diff mode return what changed since the last one
+
+        Diff mode is diff=True (the request's "diff" flag) or a spoken "what
+        changed"; returns result itself when there is nothing to diff against.
+        """
+        diff = diff or params.get('diff', False)
+        if not isinstance(result, (ResultSet, ClusterResult)) or result.error:
+            return result
+        query = {k: v for k, v in params.items() if k != 'diff'}
+        key = (command_type, tuple(sorted(query.items())))
+        self.query = (command_type, query)
+        previous = self.snapshots.pop(key, None)
+        delta = ResultDelta.between(previous, result) if previous is not None and diff else None
+
+        if len(result) <= MAX_SNAPSHOT_RECORDS:
+            self.snapshots[key] = Snapshot.of(result, previous)
+            if len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return delta if delta is not None else result
+
+    def remember(self, result_set):
+        """Keep a successful listing (or the changed objects of one) for ordinal references"""
+        if not isinstance(result_set, (ResultSet, ResultDelta)) or result_set.error:
+            return
+        if isinstance(result_set, ResultDelta) and not result_set.records:
+            return
+        self.result = ResultIndex(result_set)
+        if len(self.result) == 1:
+            self.resource = (self.result.kind, *self.result.at(0))
+
+
+class SessionStore:
+    """Per-session contexts with idle TTL and LRU eviction across sessions"""
+
+    def __init__(self, ttl=900, max_sessions=1000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> SessionContext, least recently used first
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def get(self, session_id):
+        """The context for session_id (created on first use), or None without a valid ID"""
+        if not session_id or not SESSION_ID.match(session_id):
+            return None
+        now = time.monotonic()
+        with self._lock:
+            # Least recently used first, so expired sessions are at the front
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+                if now - oldest.touched <= self.ttl:
+                    break
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+            context = self._sessions.get(session_id)
+            if context is None:
+                context = self._sessions[session_id] = SessionContext()
+                if len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            context.touched = now
+        return context
+
+    def __len__(self):
+        return len(self._sessions)
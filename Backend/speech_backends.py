@@ -0,0 +1,90 @@
+import os
+import time
+import wave
+
+
+def write_silence(path, seconds=0.2, rate=16000):
+    """Write a short silent mono WAV (placeholder clip for headless backends)"""
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b'\x00\x00' * int(seconds * rate))
+
+
+class Pyttsx3Backend:
+    """Speaks through the system TTS driver via pyttsx3"""
+
+    def __init__(self):
+        import pyttsx3
+
+        self.engine = pyttsx3.init()
+        self.engine.setProperty('rate', 150)  # Speed
+        self.engine.setProperty('volume', 0.9)  # Volume
+
+        # Set voice (female voice if available)
+        voices = self.engine.getProperty('voices')
+        if len(voices) > 1:
+            self.engine.setProperty('voice', voices[1].id)
+
+    def say(self, text):
+        self.engine.say(text)
+        self.engine.runAndWait()
+
+    def save(self, text, path):
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+    def voice_id(self):
+        return f"pyttsx3:{self.engine.getProperty('voice')}:{self.engine.getProperty('rate')}"
+
+
+class NullBackend:
+    """Discards speech, optionally simulating synthesis time (headless load tests)"""
+
+    def __init__(self, seconds_per_char=0.0, init_seconds=0.0):
+        self.seconds_per_char = seconds_per_char
+        self.spoken = 0
+        # Stand-in for driver startup (pyttsx3.init and voice enumeration)
+        time.sleep(init_seconds)
+
+    def say(self, text):
+        if self.seconds_per_char:
+            time.sleep(len(text) * self.seconds_per_char)
+        self.spoken += 1
+
+    def save(self, text, path):
+        self.say(text)
+        write_silence(path)
+
+    def voice_id(self):
+        return 'null'
+
+
+class FileBackend:
+    """Appends each utterance to a text file instead of playing it"""
+
+    def __init__(self, path='speech.log'):
+        self.path = path
+
+    def say(self, text):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(f"{time.strftime('%Y-%m-%dT%H:%M:%S')} {text}\n")
+
+    def save(self, text, path):
+        self.say(text)
+        write_silence(path)
+
+    def voice_id(self):
+        return 'file'
+
+
+def create_speech_backend(name=None):
+    """Build the backend named by TTS_BACKEND: pyttsx3 (default), null or file"""
+    name = name or os.environ.get('TTS_BACKEND', 'pyttsx3')
+    if name == 'null':
+        return NullBackend(float(os.environ.get('TTS_NULL_SECONDS_PER_CHAR', 0)),
+                           float(os.environ.get('TTS_NULL_INIT_SECONDS', 0)))
+    if name == 'file':
+        return FileBackend(os.environ.get('TTS_FILE', 'speech.log'))
+    return Pyttsx3Backend()
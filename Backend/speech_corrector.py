@@ -0,0 +1,260 @@
+import re
+import threading
+
+# Words the assistant understands; anything close to one of these is a mishearing
+DEVOPS_VOCABULARY = [
+    'pod', 'pods', 'container', 'containers', 'image', 'images', 'service', 'services',
+    'deployment', 'deployments', 'node', 'nodes', 'namespace', 'namespaces', 'log', 'logs',
+    'secret', 'secrets', 'config', 'configmap', 'configmaps', 'map', 'maps', 'replica', 'replicas',
+    'instance', 'instances', 'cluster', 'docker', 'kubectl', 'kubernetes', 'health', 'status',
+    'system', 'running', 'show', 'list', 'get', 'display', 'describe', 'detail', 'details', 'info',
+    'check',
+]
+# Verbs that change the cluster: understood only when heard exactly, never
+# reached by correcting another word ("will" is not "kill", "top" is not "stop")
+MUTATING_VERBS = ['delete', 'remove', 'kill', 'restart', 'stop', 'scale', 'increase', 'decrease']
+MUTATING_SET = set(MUTATING_VERBS)
+# Everyday words that must never be "corrected" into vocabulary
+COMMON_WORDS = [
+    'a', 'an', 'the', 'of', 'for', 'from', 'in', 'on', 'to', 'at', 'by', 'with', 'and', 'then',
+    'after', 'that', 'this', 'all', 'me', 'my', 'is', 'are', 'what', 'which', 'please', 'tell',
+    'about', 'named', 'called', 'up', 'down', 'now', 'every', 'each', 'how', 'many', 'there',
+    'default', 'prod', 'production', 'staging', 'dev', 'test',
+    'last', 'past', 'over', 'since', 'ago', 'recent', 'latest', 'second', 'seconds', 'minute',
+    'minutes', 'hour', 'hours', 'day', 'days', 'line', 'lines', 'error', 'errors', 'warning',
+    'warnings', 'exception', 'exceptions', 'count', 'search', 'find', 'grep', 'filter',
+    'containing', 'matching', 'text', 'healthy',
+]
+# Words after which the next word names a resource, so only names may replace it
+NAME_CONTEXT = {'namespace', 'named', 'called', 'of', 'for', 'from', 'pod', 'container', 'deployment', 'service'}
+# Known mishearings too far from the intended word to be found by distance
+SPEECH_ALIASES = {'ports': 'pods'}
+
+# Resource names recognised before any live listing arrives
+DEFAULT_RESOURCE_NAMES = ['backend', 'frontend', 'database', 'redis', 'nginx', 'mysql']
+
+# Phonetic classes: consonants that sound alike share a digit, vowels are dropped
+PHONETIC_CLASSES = str.maketrans('bpfvcgjkqsxzdtlmnr', '111122222222334556', 'aeiouyhw')
+
+# kind -> whether spoken forms include the name's segments / workload stem
+POD_SUFFIX = re.compile(r'^(.+?)(?:-[a-z0-9]{6,10})?-[a-z0-9]{5}$|^(.+?)-\d+$')
+NAMED_KINDS = {'pods', 'deployments', 'services', 'containers', 'nodes', 'namespaces'}
+
+WORD = re.compile(r'[a-z0-9][a-z0-9_.-]*|[^a-z0-9]+')
+
+
+def phonetic_key(word):
+    """Sound-alike key: "boats", "pots" and "pods" all map to 132"""
+    key = word.translate(PHONETIC_CLASSES)
+    return re.sub(r'(\d)\1+', r'\1', re.sub(r'[^\d]', '', key))
+
+
+def deletions(word):
+    """The word and every variant with one letter removed
+
+    Two words within edit distance 2 (one edit on each side) share a variant,
+    so lookups are a handful of dict hits instead of a scan.
+    """
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance, or limit + 1 once it must exceed limit
+
+    Only the diagonal band of width 2 * limit + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = {j: j for j in range(min(len(b), limit) + 1)}
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        current = {}
+        low, high = max(0, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            if j == 0:
+                current[0] = i
+                continue
+            cost = previous.get(j - 1, over) + (ca != b[j - 1])
+            insert = current.get(j - 1, over) + 1
+            delete = previous.get(j, over) + 1
+            current[j] = min(cost, insert, delete, over)
+        if min(current.values()) > limit:
+            return over
+        previous = current
+    return previous.get(len(b), over)
+
+
+def spoken_forms(kind, name):
+    """Words a user would say for a resource: its name, plus a pod's workload name"""
+    name = name.lower()
+    forms = {name}
+    if kind == 'pods':
+        match = POD_SUFFIX.match(name)
+        if match:
+            forms.add(match.group(1) or match.group(2))
+    elif kind == 'containers':
+        # docker compose names: project-service-1 / project_service_1
+        forms.update(part for part in re.split(r'[-_]', name) if len(part) > 2 and not part.isdigit())
+    return forms
+
+
+class SpeechCorrector:
+    """Maps misheard words to DevOps vocabulary and live resource names
+
+    Exact words hit a dict; other alphabetic words are matched by phonetic
+    key, then through a single-deletion index, with candidates verified by a
+    bounded edit distance.
+    Resource names are reference counted, so listings can be applied as
+    incremental adds and removes.
+    """
+
+    def __init__(self, vocabulary=None, resource_names=None):
+        self._lock = threading.Lock()
+        self._counts = {}     # word -> references (vocabulary counts once)
+        self._resources = set()
+        self._phonetic = {}   # phonetic key -> set(word)
+        self._deletions = {}  # word with one letter removed -> set(word)
+        self._sources = {}    # listing source -> set(name) last seen
+        self._common = set(COMMON_WORDS)
+
+        for word in (vocabulary if vocabulary is not None else DEVOPS_VOCABULARY):
+            self._add(word)
+        for word in MUTATING_VERBS:
+            self._add(word, fuzzy=False)
+        self.update('defaults', resource_names if resource_names is not None else DEFAULT_RESOURCE_NAMES, [])
+
+    def _add(self, word, fuzzy=True):
+        count = self._counts.get(word, 0)
+        self._counts[word] = count + 1
+        if count or not fuzzy or not word.isalpha():
+            # Only plain words are fuzzy-matched; generated names stay exact-only
+            return
+        self._phonetic.setdefault(phonetic_key(word), set()).add(word)
+        for variant in deletions(word):
+            self._deletions.setdefault(variant, set()).add(word)
+
+    def _discard(self, word):
+        count = self._counts.get(word, 0)
+        if count > 1:
+            self._counts[word] = count - 1
+            return
+        if not count:
+            return
+        del self._counts[word]
+        self._resources.discard(word)
+        if not word.isalpha():
+            return
+        sounds = self._phonetic.get(phonetic_key(word))
+        if sounds is not None:
+            sounds.discard(word)
+            if not sounds:
+                del self._phonetic[phonetic_key(word)]
+        for variant in deletions(word):
+            words = self._deletions.get(variant)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self._deletions[variant]
+
+    def update(self, kind, added, removed):
+        """Apply resource names that appeared and disappeared"""
+        if kind not in NAMED_KINDS and kind != 'defaults':
+            return
+        with self._lock:
+            for name in added:
+                for form in spoken_forms(kind, name):
+                    self._add(form)
+                    self._resources.add(form)
+            for name in removed:
+                for form in spoken_forms(kind, name):
+                    self._discard(form)
+
+    def sync(self, source, kind, names):
+        """Apply a full listing from one source, diffed against its previous listing"""
+        names = set(names)
+        previous = self._sources.get(source, set())
+        self._sources[source] = names
+        if names != previous:
+            self.update(kind, names - previous, previous - names)
+
+    def is_resource_name(self, word):
+        return word in self._resources
+
+    def correct_word(self, word, names_only=False, exact_names=False):
+        """Closest known word to a misheard one, or the word unchanged
+
+        names_only limits candidates to resource names; exact_names rules
+        them out, so a misheard word never becomes a different resource.
+        """
+        if names_only and exact_names:
+            return word
+        if word in self._counts or word in self._common or not word.isalpha() or len(word) < 3:
+            return word
+        if word in SPEECH_ALIASES and not names_only:
+            return SPEECH_ALIASES[word]
+        limit = 1 if len(word) <= 4 else 2
+        # A short word is a different word once its first sound changes ("dog" is not "log")
+        short = len(word) <= 4
+
+        with self._lock:
+            # Sound-alikes may differ a little more in spelling ("boats" -> "pods"),
+            # but not in length ("ghost" is not "get")
+            best, best_distance = None, limit + 2
+            key = phonetic_key(word)
+            for candidate in self._phonetic.get(key, ()) if key else ():
+                if names_only and candidate not in self._resources or abs(len(candidate) - len(word)) > 1:
+                    continue
+                if short and candidate[0] != word[0] or exact_names and candidate in self._resources:
+                    continue
+                distance = edit_distance(word, candidate, best_distance - 1)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+            if best is not None:
+                return best
+
+            candidates = set()
+            for variant in deletions(word):
+                candidates.update(self._deletions.get(variant, ()))
+
+        for candidate in candidates:
+            if names_only and candidate not in self._resources or short and candidate[0] != word[0]:
+                continue
+            if exact_names and candidate in self._resources:
+                continue
+            distance = edit_distance(word, candidate, limit)
+            if distance <= limit and (best is None or distance < best_distance):
+                best, best_distance = candidate, distance
+        return best or word
+
+    def correct(self, text):
+        """Correct every word of a lowercase utterance, rejoining split names ("back end")
+
+        An utterance with a verb that changes something keeps its resource
+        names as heard: deleting a near miss would hit the wrong object.
+        """
+        tokens = WORD.findall(text)
+        mutating = not MUTATING_SET.isdisjoint(tokens)
+        output = []
+        previous = None
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            # "back end" -> "backend", "api gateway" -> "api-gateway"
+            if not mutating and i + 2 < len(tokens) and tokens[i + 1] == ' ':
+                joined = [token + tokens[i + 2], f"{token}-{tokens[i + 2]}"]
+                match = next((j for j in joined if j in self._resources), None)
+                if match:
+                    output.append(match)
+                    previous = match
+                    i += 3
+                    continue
+            if token[0].isalnum():
+                token = self.correct_word(token, names_only=previous in NAME_CONTEXT, exact_names=mutating)
+                previous = token
+            output.append(token)
+            i += 1
+        return ''.join(output)
+
+    def stats(self):
+        return {'words': len(self._counts), 'resource_names': len(self._resources), 'index_keys': len(self._deletions)}
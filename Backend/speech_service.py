@@ -0,0 +1,120 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from voice_response import VoiceResponse
+from audio_cache import AudioCache
+from app_logging import get_logger
+
+log = get_logger('speech')
+
+
+class _SpeechRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, one JSON reply per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                reply = self.server.dispatch(request)
+            except Exception as e:
+                reply = {'error': str(e)}
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            self.wfile.flush()
+
+
+class SpeechService(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Owns the one VoiceResponse of a multi-worker deployment, behind a UNIX socket
+
+    Worker processes talk to it through RemoteVoiceResponse, so the speaker
+    and the speech engine are never driven by two processes at once.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, voice_response=None):
+        if os.path.exists(path):
+            os.remove(path)
+        super().__init__(path, _SpeechRequestHandler)
+        self.path = path
+        self.voice_response = voice_response if voice_response is not None else VoiceResponse()
+
+    def dispatch(self, request):
+        op = request.get('op')
+        if op == 'speak':
+            self.voice_response.speak(request['text'], request.get('priority', 1))
+            return {'ok': True}
+        if op == 'audio_clip':
+            return {'key': self.voice_response.audio_clip(request['text'])}
+        if op == 'metrics':
+            return self.voice_response.metrics()
+        return {'error': f"Unknown operation: {op}"}
+
+
+def run_speech_service(path):
+    """Process entry point: serve speech requests until terminated"""
+    service = SpeechService(path)
+    # This process exists to speak: create the engine before the first request
+    service.voice_response.warm_up()
+    log.info("Speech service listening on %s", path)
+    try:
+        service.serve_forever()
+    finally:
+        service.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class RemoteVoiceResponse(VoiceResponse):
+    """VoiceResponse for worker processes: synthesis happens in the SpeechService
+
+    Summaries and text cleanup still run locally (inherited); only speak,
+    audio_clip and metrics cross the socket. Clips are written by the
+    service into the shared audio directory and served from it here.
+    """
+
+    def __init__(self, path, timeout=20):
+        self.path = path
+        self.timeout = timeout
+        self.enabled = True
+        # Workers never render; the service writes clips to the same directory
+        self.audio_cache = AudioCache(lambda text, clip_path: False)
+        self._warned = threading.Event()
+
+    def _call(self, request):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.settimeout(self.timeout)
+                connection.connect(self.path)
+                connection.sendall(json.dumps(request).encode() + b'\n')
+                reply = connection.makefile('rb').readline()
+            return json.loads(reply) if reply else None
+        except (OSError, ValueError) as e:
+            # Once per worker: a missing speech service must not flood the log
+            if not self._warned.is_set():
+                self._warned.set()
+                log.warning("Speech service unavailable at %s: %s", self.path, e)
+            return None
+
+    def warm_up(self):
+        # The speech service warms up its own engine
+        pass
+
+    def speak(self, text, priority=1):
+        self._call({'op': 'speak', 'text': text, 'priority': priority})
+
+    def audio_clip(self, text):
+        reply = self._call({'op': 'audio_clip', 'text': text})
+        return reply.get('key') if reply else None
+
+    def metrics(self):
+        return self._call({'op': 'metrics'}) or {'enabled': False, 'engine_ready': False, 'queue_depth': 0, 'audio_cache': self.audio_cache.stats()}
+
+
+def create_voice_response():
+    """The speech service client when TTS_SOCKET is set (multi-worker), else a local VoiceResponse"""
+    path = os.environ.get('TTS_SOCKET')
+    if path:
+        return RemoteVoiceResponse(path)
+    return VoiceResponse()
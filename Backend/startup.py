@@ -0,0 +1,35 @@
+import os
+import threading
+import time
+from app_logging import get_logger
+
+log = get_logger('startup')
+
+
+def warm_up_in_background(*components, environ=None):
+    """Warm components up on a daemon thread when WARM_UP=1
+
+    Components build their expensive parts (speech engine, compiled
+    patterns, API connections) on first use; warming up moves that cost
+    off the first request while the server already answers. Components
+    without a warm_up method, or None, are skipped.
+    """
+    env = os.environ if environ is None else environ
+    if env.get('WARM_UP', '0') != '1':
+        return None
+
+    def run():
+        started = time.perf_counter()
+        for component in components:
+            warm_up = getattr(component, 'warm_up', None)
+            if warm_up is None:
+                continue
+            try:
+                warm_up()
+            except Exception as e:
+                log.warning("Warm-up of %s failed: %s", type(component).__name__, e)
+        log.info("Warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
+
+    thread = threading.Thread(target=run, name='warm-up', daemon=True)
+    thread.start()
+    return thread
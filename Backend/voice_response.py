@@ -1,49 +1,204 @@
-import pyttsx3
+import heapq
+import itertools
 import threading
+import time
+from speech_backends import create_speech_backend
+from audio_cache import AudioCache, COMMON_PHRASES
+from app_logging import get_logger
+from metrics import TTS_SECONDS
+
+log = get_logger('speech')
+
+class _SpeechJob:
+    """A queued utterance: spoken aloud, or rendered to an audio file"""
+    
+    __slots__ = ('kind', 'text', 'path', 'enqueued_at', 'done', 'ok')
+    
+    def __init__(self, kind, text, path=None):
+        self.kind = kind
+        self.text = text
+        self.path = path
+        self.enqueued_at = time.monotonic()
+        self.done = threading.Event()
+        self.ok = False
 
 class VoiceResponse:
-    """Text-to-Speech for voice responses"""
+    """Text-to-Speech for voice responses
     
-    def __init__(self):
-        try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)  # Speed
-            self.engine.setProperty('volume', 0.9)  # Volume
-            
-            # Set voice (female voice if available)
-            voices = self.engine.getProperty('voices')
-            if len(voices) > 1:
-                self.engine.setProperty('voice', voices[1].id)
-            
-            self.enabled = True
-        except Exception as e:
-            print(f"Voice engine initialization failed: {e}")
-            self.enabled = False
+    One worker thread owns the speech engine and drains a bounded priority
+    queue, so concurrent requests never touch the engine directly. The
+    engine is created on first use, or ahead of it by warm_up().
+    """
     
-    def speak(self, text):
-        """Speak the given text"""
+    def __init__(self, backend_factory=None, max_queue=8, max_age=10.0, audio_cache=None):
+        self.backend_factory = backend_factory or create_speech_backend
+        self.max_queue = max_queue
+        self.max_age = max_age  # seconds before a queued utterance is stale
+        
+        self._queue = []  # heap of (priority, sequence, job)
+        self._pending = {}  # (kind, text) -> job
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._ready = threading.Event()
+        self._stats = {'queued': 0, 'spoken': 0, 'rendered': 0, 'coalesced': 0, 'dropped_full': 0, 'dropped_stale': 0, 'errors': 0}
+        self._wait_ms = []
+        self._speak_ms = []
+        
+        self.enabled = True
+        self.voice_id = 'default'
+        self._worker = None
+        self._start_lock = threading.Lock()
+        
+        # Rendered clips for the browser, keyed by content hash; the voice is
+        # filled in once the engine reports it
+        self._owns_audio_cache = audio_cache is None
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache(self.render_to_file)
+    
+    def warm_up(self):
+        """Start creating the speech engine now instead of on the first utterance"""
+        self._ensure_worker()
+    
+    def _ensure_worker(self, wait=False):
+        """Start the speech worker once; with wait, block until its engine is ready"""
+        if self._ready.is_set():
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='speech-worker', daemon=True)
+                self._worker.start()
+        if wait:
+            self._ready.wait(timeout=5)
+    
+    def speak(self, text, priority=1):
+        """Queue text to be spoken; lower priority numbers are spoken first"""
         if not self.enabled:
             return
         
         try:
+            # Queued utterances wait for the engine if it is still starting
+            self._ensure_worker()
             # Clean text for speaking
             clean_text = self.clean_text_for_speech(text)
+            self._enqueue(_SpeechJob('speak', clean_text), priority)
+        except Exception as e:
+            log.error("Speech error: %s", e)
+    
+    def render_to_file(self, text, path, timeout=15):
+        """Synthesize text into an audio file on the speech worker; True on success"""
+        if not self.enabled:
+            return False
+        self._ensure_worker()
+        job = self._enqueue(_SpeechJob('render', text, path), priority=0)
+        return job.done.wait(timeout) and job.ok
+    
+    def audio_clip(self, text):
+        """Content hash of the rendered clip for text, rendering it on a cache miss"""
+        # The clip key includes the voice, which is known once the engine is up
+        self._ensure_worker(wait=True)
+        if not self.enabled:
+            return None
+        return self.audio_cache.get_or_render(self.clean_text_for_speech(text))
+    
+    def _enqueue(self, job, priority):
+        with self._condition:
+            # Same phrase already waiting: do it once
+            pending = self._pending.get((job.kind, job.text))
+            if pending is not None and (job.kind == 'speak' or pending.path == job.path):
+                self._stats['coalesced'] += 1
+                return pending
             
-            # Speak in separate thread to not block
-            thread = threading.Thread(target=self._speak_thread, args=(clean_text,))
-            thread.daemon = True
-            thread.start()
+            if len(self._queue) >= self.max_queue:
+                # Backed up: drop the oldest of the least urgent entries,
+                # unless the new job is less urgent than all of them
+                worst_priority = max(entry[0] for entry in self._queue)
+                self._stats['dropped_full'] += 1
+                if priority > worst_priority:
+                    job.done.set()
+                    return job
+                victim = min(entry for entry in self._queue if entry[0] == worst_priority)
+                self._queue.remove(victim)
+                heapq.heapify(self._queue)
+                self._pending.pop((victim[2].kind, victim[2].text), None)
+                victim[2].done.set()
             
-        except Exception as e:
-            print(f"Speech error: {e}")
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            self._pending[(job.kind, job.text)] = job
+            self._stats['queued'] += 1
+            self._condition.notify()
+        return job
     
-    def _speak_thread(self, text):
-        """Internal method to speak in thread"""
+    def _run(self):
+        """Worker loop: create the engine on this thread, then drain the queue"""
         try:
-            self.engine.say(text)
-            self.engine.runAndWait()
+            backend = self.backend_factory()
         except Exception as e:
-            print(f"Speech thread error: {e}")
+            log.error("Voice engine initialization failed: %s", e)
+            self.enabled = False
+            self._ready.set()
+            return
+        if hasattr(backend, 'voice_id'):
+            self.voice_id = backend.voice_id()
+        if self._owns_audio_cache:
+            self.audio_cache.voice = self.voice_id
+        self._ready.set()
+        self.audio_cache.prerender([self.clean_text_for_speech(phrase) for phrase in COMMON_PHRASES])
+        
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._queue)
+                if self._pending.get((job.kind, job.text)) is job:
+                    del self._pending[(job.kind, job.text)]
+            
+            waited = time.monotonic() - job.enqueued_at
+            if job.kind == 'speak' and waited > self.max_age:
+                self._stats['dropped_stale'] += 1
+                job.done.set()
+                continue
+            
+            started = time.monotonic()
+            try:
+                if job.kind == 'render':
+                    backend.save(job.text, job.path)
+                    self._stats['rendered'] += 1
+                else:
+                    backend.say(job.text)
+                    self._stats['spoken'] += 1
+                job.ok = True
+            except Exception as e:
+                self._stats['errors'] += 1
+                log.exception("Speech thread error: %s", e)
+            finally:
+                job.done.set()
+            
+            elapsed = time.monotonic() - started
+            self._record(self._wait_ms, waited * 1000)
+            self._record(self._speak_ms, elapsed * 1000)
+            TTS_SECONDS.observe(waited, job=job.kind, phase='queue_wait')
+            TTS_SECONDS.observe(elapsed, job=job.kind, phase='synthesize')
+    
+    def _record(self, samples, value, keep=512):
+        samples.append(value)
+        if len(samples) > keep:
+            del samples[:len(samples) - keep]
+    
+    def metrics(self):
+        """Queue depth, counters and wait/speak latency percentiles (ms)"""
+        def percentiles(samples):
+            ordered = sorted(samples)
+            if not ordered:
+                return {'p50': 0.0, 'p99': 0.0}
+            return {
+                'p50': round(ordered[len(ordered) // 2], 1),
+                'p99': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 1),
+            }
+        
+        with self._condition:
+            depth = len(self._queue)
+        return dict(self._stats, queue_depth=depth, enabled=self.enabled, engine_ready=self._ready.is_set(),
+                    audio_cache=self.audio_cache.stats(),
+                    wait_ms=percentiles(self._wait_ms), speak_ms=percentiles(self._speak_ms))
     
     def clean_text_for_speech(self, text):
         """Clean text to make it more speech-friendly"""
@@ -64,8 +219,11 @@ class VoiceResponse:
         
         return clean
     
-    def generate_summary(self, command_result):
+    def generate_summary(self, command_result, result_set=None):
         """Generate a concise summary for voice"""
+        if result_set is not None:
+            return result_set.summary()
+        
         result_lower = command_result.lower()
         
         # Count items
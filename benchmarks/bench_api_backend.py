@@ -0,0 +1,143 @@
+"""Benchmark: native API backend vs kubectl/docker subprocesses.
+
+Starts a stub Kubernetes API server on localhost, a stub Docker daemon on a
+UNIX socket, and stub kubectl/docker executables returning the same data,
+then times `get pods` and `ps -a` through both DevOpsExecutor paths.
+
+Usage: python benchmarks/bench_api_backend.py [iterations] [pods]
+"""
+import json
+import os
+import socketserver
+import stat
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from api_backend import DockerAPIClient, KubernetesAPIClient, NativeAPIBackend
+from devops_executor import DevOpsExecutor
+from result_cache import ResultCache
+
+
+def pod_list(count):
+    return {'items': [{
+        'metadata': {'name': f'web-{i}', 'creationTimestamp': '2024-01-01T00:00:00Z'},
+        'status': {'phase': 'Running', 'containerStatuses': [{'ready': True, 'restartCount': 0, 'state': {'running': {}}}]},
+    } for i in range(count)]}
+
+
+def container_list(count):
+    return [{'Id': f'{i:064x}', 'Image': 'nginx:latest', 'Status': 'Up 2 hours', 'Names': [f'/web-{i}']} for i in range(count)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    routes = {}
+
+    def do_GET(self):
+        body = self.routes.get(self.path.split('?')[0])
+        if body is None:
+            self.send_response(404)
+            body = b'{"message": "not found"}'
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TCPStubHandler(StubHandler):
+    disable_nagle_algorithm = True
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('local', 0)
+
+
+class ThreadingTCPHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def write_stub(directory, name, output):
+    data_path = os.path.join(directory, f'{name}.out')
+    with open(data_path, 'w') as f:
+        f.write(output)
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        f.write(f'#!/bin/sh\ncat "{data_path}"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pods = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    StubHandler.routes = {
+        '/api/v1/namespaces/default/pods': json.dumps(pod_list(pods)).encode(),
+        '/containers/json': json.dumps(container_list(pods)).encode(),
+    }
+
+    tmp = tempfile.mkdtemp()
+    k8s_server = ThreadingTCPHTTPServer(('127.0.0.1', 0), TCPStubHandler)
+    socket_path = os.path.join(tmp, 'docker.sock')
+    docker_server = ThreadingUnixHTTPServer(socket_path, StubHandler)
+    for server in (k8s_server, docker_server):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    backend = NativeAPIBackend(
+        KubernetesAPIClient(f'http://127.0.0.1:{k8s_server.server_address[1]}'),
+        DockerAPIClient(socket_path),
+    )
+    api = DevOpsExecutor(backend=backend)
+
+    # Stub CLIs print exactly what the API backend renders
+    bin_dir = os.path.join(tmp, 'bin')
+    os.mkdir(bin_dir)
+    write_stub(bin_dir, 'kubectl', backend.run_kubectl('get pods'))
+    write_stub(bin_dir, 'docker', backend.run_docker('ps -a'))
+    os.environ['PATH'] = bin_dir + os.pathsep + os.environ['PATH']
+    cli = DevOpsExecutor()
+
+    # Disable caching so every call reaches the backend under test
+    no_cache = {key: 0 for key in ResultCache().ttls}
+    api.cache = ResultCache(ttls=no_cache)
+    cli.cache = ResultCache(ttls=no_cache)
+
+    print(f"{iterations} iterations, {pods} objects per listing")
+    print(f"{'command':<14}{'path':<12}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for label, call in (('get pods', lambda e: e.run_kubectl('get pods')),
+                        ('ps -a', lambda e: e.run_docker('ps -a'))):
+        assert call(api) == call(cli), f"{label}: outputs differ"
+        for path, executor in (('subprocess', cli), ('api', api)):
+            p50, p99 = time_calls(lambda: call(executor), iterations)
+            print(f"{label:<14}{path:<12}{p50:>10.2f}{p99:>10.2f}")
+
+    backend.close()
+    k8s_server.shutdown()
+    docker_server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
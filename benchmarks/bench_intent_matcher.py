@@ -0,0 +1,79 @@
+"""Micro-benchmark: compiled IntentMatcher vs the per-pattern re.search loop.
+
+Usage: python benchmarks/bench_intent_matcher.py [corpus_size]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from ai_processor import AIProcessor
+
+VERBS = ['show', 'list', 'get', 'display', 'what', 'which', 'describe', 'delete',
+         'restart', 'stop', 'scale', 'check', 'increase', 'tell me about', 'please']
+NOUNS = ['pods', 'containers', 'images', 'services', 'deployments', 'nodes',
+         'logs', 'health', 'system status', 'replicas', 'namespaces', 'weather']
+NAMES = ['backend', 'frontend', 'redis', 'nginx', 'api-gateway', 'worker', '']
+
+
+def build_corpus(size, seed=42):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        words = [rng.choice(VERBS), 'the', rng.choice(NOUNS), rng.choice(NAMES)]
+        if rng.random() < 0.3:
+            words.append('in namespace ' + rng.choice(['default', 'prod', 'staging']))
+        corpus.append(' '.join(w for w in words if w))
+    return corpus
+
+
+def legacy_detect(command_patterns, command):
+    for cmd_type, patterns in command_patterns.items():
+        for pattern in patterns:
+            if re.search(pattern, command, re.IGNORECASE):
+                return cmd_type
+    return 'unknown'
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_each(fn, corpus):
+    samples = []
+    for utterance in corpus:
+        start = time.perf_counter_ns()
+        fn(utterance)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    corpus = build_corpus(size)
+    processor = AIProcessor()
+    patterns = processor.command_patterns
+
+    # Both implementations must agree before timings mean anything
+    for utterance in corpus:
+        expected = legacy_detect(patterns, utterance)
+        actual = processor.detect_command_type(utterance)
+        assert expected == actual, f"{utterance!r}: {expected} != {actual}"
+
+    legacy = time_each(lambda u: legacy_detect(patterns, u), corpus)
+    compiled = time_each(processor.detect_command_type, corpus)
+
+    print(f"Corpus: {size} utterances")
+    print(f"{'implementation':<16}{'p50 (us)':>12}{'p99 (us)':>12}{'total (ms)':>14}")
+    for name, samples in (('re.search loop', legacy), ('IntentMatcher', compiled)):
+        print(f"{name:<16}{percentile(samples, 50) / 1000:>12.2f}"
+              f"{percentile(samples, 99) / 1000:>12.2f}{sum(samples) / 1e6:>14.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: answering a repeated pod listing in full vs as changes only.
+
+Simulates polling "show pods" during an incident: each poll re-lists the
+same pods with a few status changes. Compares rendering the full table and
+summary with diffing against the session's previous snapshot
+(SessionContext.changes) and rendering only the delta. Payload is the
+rendered response in bytes; spoken is the summary's length in characters,
+which is what speech time scales with.
+
+Usage: python benchmarks/bench_result_diff.py [pods] [changes per poll] [iterations]
+"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from bench_structured_summary import measure, pod_listing
+from records import parse_kubectl_json
+from session_context import SessionContext
+
+
+def polls(pods, changes, count, seed=7):
+    """count listings of the same pods, each with `changes` pods flipped to CrashLoopBackOff"""
+    listing = pod_listing(pods, seed)
+    outputs = []
+    for poll in range(count):
+        for i in range(poll * changes, (poll + 1) * changes):
+            item = listing['items'][(i * 7919) % pods]
+            item['status']['containerStatuses'][0].update(ready=False, state={'waiting': {'reason': 'CrashLoopBackOff'}})
+        outputs.append(json.dumps(listing))
+    return outputs
+
+
+def main():
+    pods = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    previous, current = [parse_kubectl_json('pods', output) for output in polls(pods, changes, 2)]
+
+    def full():
+        return current.render(), current.summary()
+
+    def changes_only():
+        context = SessionContext()
+        context.changes('get_pods', {}, previous)
+        delta = context.changes('get_pods', {}, current, diff=True)
+        return delta.render(), delta.summary()
+
+    print(f"{pods} pods, {changes} status changes per poll, {iterations} iterations")
+    print(f"{'path':<16}{'ms/op':>10}{'peak KiB':>12}{'payload B':>12}{'spoken':>8}  summary")
+    for name, fn in (('full listing', full), ('changes only', changes_only)):
+        elapsed, peak, (rendered, summary) = measure(fn, iterations)
+        print(f"{name:<16}{elapsed:>10.3f}{peak:>12.1f}{len(rendered.encode()):>12}{len(summary):>8}  {summary}")
+    print("changes only includes taking both snapshots; a real poll takes one")
+
+
+if __name__ == '__main__':
+    main()
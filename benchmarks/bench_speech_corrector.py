@@ -0,0 +1,115 @@
+"""Micro-benchmark: SpeechCorrector lookups and incremental updates at cluster scale.
+
+Builds a corrector over N synthetic pod names (deployment-hash-suffix, as
+ReplicaSets name them), then times misheard-word corrections and the cost
+of applying a listing in which some pods were replaced. Also checks that
+everyday phrases are neither rewritten nor parsed into a change (a
+mutating intent); the script exits non-zero if one is.
+
+Usage: python benchmarks/bench_speech_corrector.py [resource_count]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from ai_processor import AIProcessor
+from result_cache import INTENT_INVALIDATIONS
+from speech_corrector import SpeechCorrector
+from bench_intent_matcher import percentile
+
+# Ordinary speech that once turned into deletes, stops and scales ("will" -> "kill")
+EVERYDAY_PHRASES = [
+    'how will pod web behave', 'till the pod frontend is ready', 'top container nginx',
+    'is the stale deployment web healthy', 'fill pod web', 'skill pod web', 'hill pod web',
+    'sale deployment web to 3', 'scare deployment web', 'deleted pod web', 'deplete pod web',
+    'show dog of backend', 'fog on pod web', 'food list', 'show code', 'mode of backend',
+]
+
+SYLLABLES = ['pay', 'ment', 'check', 'out', 'cart', 'search', 'auth', 'user', 'order', 'ship',
+             'ping', 'stock', 'price', 'mail', 'notify', 'report', 'queue', 'cache', 'feed', 'rank']
+
+
+def random_word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+
+
+def pod_name(rng, deployment):
+    suffix = ''.join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(5))
+    return f"{deployment}-{rng.randrange(16 ** 9):09x}-{suffix}"
+
+
+def mishear(rng, word):
+    """Drop, double or swap one letter"""
+    i = rng.randrange(1, len(word) - 1)
+    return rng.choice([word[:i] + word[i + 1:], word[:i] + word[i] + word[i:], word[:i] + word[i + 1] + word[i] + word[i + 2:]])
+
+
+def time_each(fn, items):
+    samples = []
+    for item in items:
+        start = time.perf_counter_ns()
+        fn(item)
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def everyday_regressions(corrector):
+    """Everyday phrases the corrector rewrote or that parse to a mutating intent"""
+    processor = AIProcessor(corrector=corrector)
+    failures = []
+    for phrase in EVERYDAY_PHRASES:
+        corrected = corrector.correct(phrase)
+        command_type = processor.process_command(phrase)['command_type']
+        if corrected != phrase or command_type in INTENT_INVALIDATIONS:
+            failures.append(f"{phrase!r} -> {corrected!r} ({command_type})")
+    return failures
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    rng = random.Random(7)
+    deployments = sorted({random_word(rng) for _ in range(count // 10)})
+    pods = [pod_name(rng, rng.choice(deployments)) for _ in range(count)]
+
+    corrector = SpeechCorrector()
+    start = time.perf_counter()
+    corrector.sync('pods', 'pods', pods)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    targets = [rng.choice(deployments) for _ in range(2000)]
+    misheard = [mishear(rng, word) for word in targets]
+    resolved = sum(1 for heard, word in zip(misheard, targets) if corrector.correct_word(heard, names_only=True) == word)
+
+    # A rollout replaces 1% of the pods
+    churned = list(pods)
+    for i in rng.sample(range(count), count // 100):
+        churned[i] = pod_name(rng, rng.choice(deployments))
+    start = time.perf_counter()
+    corrector.sync('pods', 'pods', churned)
+    churn_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Resources: {count} pods of {len(deployments)} deployments; {corrector.stats()}")
+    print(f"Initial index build: {build_ms:.1f} ms; applying a 1% churn listing: {churn_ms:.1f} ms")
+    print(f"Misheard names resolved to the intended deployment: {resolved}/{len(targets)}")
+    print(f"{'lookup':<16}{'p50 (us)':>12}{'p99 (us)':>12}")
+    for name, samples in (
+        ('exact word', time_each(corrector.correct_word, targets)),
+        ('misheard name', time_each(lambda w: corrector.correct_word(w, names_only=True), misheard)),
+        ('utterance', time_each(corrector.correct, [f"show logs of {w}" for w in misheard])),
+    ):
+        print(f"{name:<16}{percentile(samples, 50) / 1000:>12.2f}{percentile(samples, 99) / 1000:>12.2f}")
+
+    failures = everyday_regressions(SpeechCorrector())
+    print(f"Everyday phrases left alone: {len(EVERYDAY_PHRASES) - len(failures)}/{len(EVERYDAY_PHRASES)}")
+    for failure in failures:
+        print(f"  changed: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Startup report: import time and first-request latency of the ASGI app.
+
+Each run is a fresh interpreter that imports asgi, then sends its first
+/api/health, first voice command and first voice command with an audio
+clip in-process (stub kubectl/docker, TTS_BACKEND=null). TTS_NULL_INIT_SECONDS
+stands in for the pyttsx3 driver startup, which is what lazy init defers.
+
+Modes:
+    eager    speech engine and patterns built before serving (the old import-time cost)
+    lazy     everything built on first use
+    warm-up  WARM_UP=1: built on a background thread while requests are served
+
+Usage: python benchmarks/bench_startup.py [runs] [engine_init_seconds]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'Backend'))
+
+import stub_cli
+
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import asgi
+imported = time.perf_counter()
+if sys.argv[1] == 'eager':
+    asgi.voice_response._ensure_worker(wait=True)
+    asgi.ai_processor.warm_up()
+ready = time.perf_counter()
+
+async def call(method, path, body=None):
+    messages = [{'type': 'http.request', 'body': json.dumps(body or {}).encode(), 'more_body': False}]
+    sent = []
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+    async def send(message):
+        sent.append(message)
+    start = time.perf_counter()
+    await asgi.app({'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b''}, receive, send)
+    return (time.perf_counter() - start) * 1000
+
+async def main():
+    return {
+        'import_ms': (imported - started) * 1000,
+        'ready_ms': (ready - started) * 1000,
+        'health_ms': await call('GET', '/api/health'),
+        'command_ms': await call('POST', '/api/voice-command', {'command': 'show pods'}),
+        'audio_ms': await call('POST', '/api/voice-command', {'command': 'list containers', 'audio': True}),
+    }
+
+print(json.dumps(asyncio.run(main())))
+"""
+
+MODES = [('eager', '0'), ('lazy', '0'), ('warm-up', '1')]
+FIELDS = ['import_ms', 'ready_ms', 'health_ms', 'command_ms', 'audio_ms']
+
+
+def run_once(mode, warm_up, env):
+    result = subprocess.run([sys.executable, '-c', CHILD, mode], cwd=os.path.join(BENCH_DIR, '..', 'Backend'),
+                            env=dict(env, WARM_UP=warm_up), capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    engine_init = sys.argv[2] if len(sys.argv) > 2 else '0.5'
+    env = dict(os.environ, TTS_BACKEND='null', TTS_NULL_INIT_SECONDS=engine_init, LOG_LEVEL='WARNING',
+               PATH=stub_cli.install() + os.pathsep + os.environ['PATH'])
+
+    print(f"Median of {runs} fresh processes, simulated engine init {engine_init} s")
+    print(f"{'mode':<10}" + ''.join(f"{field[:-3] + ' ms':>12}" for field in FIELDS))
+    for mode, warm_up in MODES:
+        samples = [run_once(mode, warm_up, env) for _ in range(runs)]
+        print(f"{mode:<10}" + ''.join(f"{statistics.median(s[field] for s in samples):>12.1f}" for field in FIELDS))
+    print("ready = import plus eager initialization; the request columns are each request's own latency")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Benchmark: summarizing a large pod listing from text vs typed records.
+
+Builds a synthetic pod listing as kubectl's table text, as `-o json` and as
+the executor's `-o jsonpath` pod lines, then compares the old
+substring-scanning summaries (AIProcessor.generate_smart_response +
+VoiceResponse.generate_summary) with parsing into records and summarizing.
+Pod lines are what the executor fetches: statuses are counted while the
+lines are split, and records are only built when the table is rendered.
+
+Usage: python benchmarks/bench_structured_summary.py [pods] [iterations]
+"""
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+from ai_processor import AIProcessor
+from api_backend import pod_lines, render_kube_table
+from records import parse_kubectl_json, parse_pod_lines
+
+STATUSES = ['Running'] * 90 + ['Pending'] * 4 + ['CrashLoopBackOff'] * 3 + ['Succeeded'] * 3
+
+
+def pod_listing(count, seed=7):
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        status = rng.choice(STATUSES)
+        waiting = {'waiting': {'reason': status}} if status == 'CrashLoopBackOff' else {'running': {}}
+        items.append({
+            'metadata': {
+                # Some names contain "running" to show the substring count is wrong
+                'name': f"{'running-job' if i % 50 == 0 else 'web'}-{i}",
+                'namespace': 'default',
+                'creationTimestamp': '2024-01-01T00:00:00Z',
+                'resourceVersion': str(i),
+            },
+            'status': {
+                'phase': 'Running' if status == 'CrashLoopBackOff' else status,
+                'containerStatuses': [{'ready': status == 'Running', 'restartCount': rng.randint(0, 5), 'state': waiting}],
+            },
+        })
+    return {'apiVersion': 'v1', 'kind': 'List', 'items': items}
+
+
+def legacy_voice_summary(command_result):
+    """VoiceResponse.generate_summary before typed records"""
+    result_lower = command_result.lower()
+    if 'running' in result_lower:
+        return f"Found {result_lower.count('running')} running items"
+    elif 'error' in result_lower:
+        return "Command failed with an error"
+    elif 'no resources' in result_lower:
+        return "No resources found"
+    elif 'success' in result_lower:
+        return "Command executed successfully"
+    return "Command completed"
+
+
+def measure(fn, iterations):
+    fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / iterations * 1000
+    return elapsed, peak / 1024, result
+
+
+def main():
+    pods = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    listing = pod_listing(pods)
+    json_output = json.dumps(listing)
+    text_output = "✅ Kubectl Output:\n" + render_kube_table('pods', listing)
+    processor = AIProcessor()
+    lines_output = pod_lines(listing['items'])
+    parsed = parse_kubectl_json('pods', json_output)
+
+    def legacy():
+        smart = processor.generate_smart_response(text_output, {})
+        return legacy_voice_summary(smart)
+
+    def records_only():
+        return parsed.summary()
+
+    def parse_and_summarize():
+        return parse_kubectl_json('pods', json_output).summary()
+
+    def lines_summarize():
+        return parse_pod_lines(lines_output).summary()
+
+    def lines_render():
+        result_set = parse_pod_lines(lines_output)
+        result_set.render()
+        return result_set.summary()
+
+    healthy = sum(1 for item in listing['items'] if item['status']['phase'] in ('Running', 'Succeeded')
+                  and 'waiting' not in item['status']['containerStatuses'][0]['state'])
+    print(f"{pods} pods, {healthy} actually Running/Succeeded, {iterations} iterations")
+    print(f"input: table {len(text_output) // 1024} KiB, json {len(json_output) // 1024} KiB, pod lines {len(lines_output) // 1024} KiB")
+    print(f"{'path':<30}{'ms/op':>10}{'peak KiB':>12}  summary")
+    for name, fn in (('text substring scan', legacy),
+                     ('records: summarize', records_only),
+                     ('json: parse+summarize', parse_and_summarize),
+                     ('pod lines: parse+summarize', lines_summarize),
+                     ('pod lines: +render table', lines_render)):
+        elapsed, peak, result = measure(fn, iterations)
+        print(f"{name:<30}{elapsed:>10.3f}{peak:>12.1f}  {result}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""Load generator for /api/voice-command: throughput and p50/p95/p99 latency per intent.
+
+By default the ASGI app is driven in-process against the stub kubectl/docker
+from stub_cli.py (no cluster, no speaker: TTS_BACKEND=null), so runs are
+reproducible on any machine. --url targets a running server instead; start
+it with the stubs on PATH to benchmark the full HTTP stack.
+
+Results are written as JSON (default: benchmarks/results/<commit>.json);
+--compare prints the change against an earlier run.
+
+Usage:
+    python benchmarks/load_test.py --requests 2000 --concurrency 32 --pods 10000 --latency-ms 20
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --requests 500
+    python benchmarks/load_test.py --compare benchmarks/results/<old commit>.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'Backend'))
+
+import stub_cli
+from bench_intent_matcher import percentile
+
+# One utterance per intent family, weighted roughly like interactive use
+DEFAULT_WORKLOAD = [
+    ('show pods', 20),
+    ('list containers', 10),
+    ('show images', 5),
+    ('get services', 8),
+    ('list deployments', 8),
+    ('show nodes', 4),
+    ('show namespaces', 3),
+    ('show pods in namespace prod', 6),
+    ('describe pod backend', 3),
+    ('show logs of backend', 8),
+    ('show errors in backend logs from the last 10 minutes', 4),
+    ('count 500s in nginx', 3),
+    ('health check', 3),
+    ('show pods and list containers', 5),
+    ('scale deployment web to 3 replicas', 1),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+
+
+def load_workload(path):
+    """Utterances with weights: a file of 'weight<TAB>utterance' or plain utterance lines"""
+    if not path:
+        return DEFAULT_WORKLOAD
+    workload = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            weight, _, utterance = line.partition('\t')
+            workload.append((utterance, int(weight)) if utterance else (line, 1))
+    return workload
+
+
+def record(samples, command, elapsed_ms, status, payload):
+    intent = (payload.get('ai_analysis') or {}).get('command_type', 'error')
+    ok = status < 400 and payload.get('success', False)
+    samples.append((intent, elapsed_ms, ok))
+
+
+async def run_in_process(warmup, commands, concurrency, cold):
+    import asgi
+    if cold:
+        from result_cache import ResultCache
+        asgi.async_executor.executor.cache = ResultCache(ttls={key: 0 for key in ResultCache().ttls})
+
+    async def call(command):
+        body = json.dumps({'command': command}).encode()
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Never disconnects
+            await asyncio.Event().wait()
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'POST', 'path': '/api/voice-command', 'headers': [], 'query_string': b''}
+        await asgi.app(scope, receive, send)
+        return sent[0]['status'], json.loads(sent[1]['body'])
+
+    async def run(commands, concurrency):
+        samples = []
+        queue = list(reversed(commands))
+
+        async def worker():
+            while queue:
+                command = queue.pop()
+                start = time.perf_counter()
+                try:
+                    status, payload = await call(command)
+                except Exception as e:
+                    status, payload = 599, {'error': str(e)}
+                record(samples, command, (time.perf_counter() - start) * 1000, status, payload)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return samples, time.perf_counter() - started
+
+    await run(warmup, 1)
+    return await run(commands, concurrency)
+
+
+def run_http(url, commands, concurrency):
+    samples = []
+    lock = threading.Lock()
+
+    def call(command):
+        request = urllib.request.Request(f"{url.rstrip('/')}/api/voice-command", data=json.dumps({'command': command}).encode(),
+                                         headers={'Content-Type': 'application/json'})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                status, payload = response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, {}
+        except Exception as e:
+            status, payload = 599, {'error': str(e)}
+        with lock:
+            record(samples, command, (time.perf_counter() - start) * 1000, status, payload)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, commands))
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    def stats(rows):
+        latencies = [ms for _, ms, _ in rows]
+        return {
+            'requests': len(rows),
+            'errors': sum(1 for _, _, ok in rows if not ok),
+            'mean_ms': round(sum(latencies) / len(latencies), 2),
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p95_ms': round(percentile(latencies, 95), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies), 2),
+        }
+
+    intents = {}
+    for row in samples:
+        intents.setdefault(row[0], []).append(row)
+    overall = stats(samples)
+    overall['throughput_rps'] = round(len(samples) / elapsed, 1)
+    overall['elapsed_s'] = round(elapsed, 2)
+    return overall, {intent: stats(rows) for intent, rows in sorted(intents.items())}
+
+
+def print_report(result, baseline=None):
+    def change(intent, field, value):
+        if baseline is None:
+            return ''
+        old = baseline['overall'] if intent is None else baseline['intents'].get(intent)
+        if not old or not old.get(field):
+            return f"{'':>9}"
+        return f"{(value - old[field]) / old[field] * 100:>+8.0f}%"
+
+    overall = result['overall']
+    print(f"{overall['requests']} requests in {overall['elapsed_s']} s: {overall['throughput_rps']} req/s, "
+          f"{overall['errors']} errors" + (f" (throughput {change(None, 'throughput_rps', overall['throughput_rps']).strip()})" if baseline else ''))
+    header = f"{'intent':<20}{'n':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header + (f"{'p50 Δ':>9}{'p99 Δ':>9}" if baseline else ''))
+    for intent, stats in list(result['intents'].items()) + [('(all)', overall)]:
+        key = None if intent == '(all)' else intent
+        print(f"{intent:<20}{stats['requests']:>6}{stats['errors']:>5}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+              + (change(key, 'p50_ms', stats['p50_ms']) + change(key, 'p99_ms', stats['p99_ms']) if baseline else ''))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--url', help='benchmark a running server instead of the in-process ASGI app')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workload', help="file of utterances ('weight<TAB>utterance' per line)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--cold', action='store_true', help='disable the result cache (in-process only)')
+    parser.add_argument('--no-stubs', action='store_true', help='use the real kubectl/docker on PATH')
+    parser.add_argument('--pods', type=int, default=100)
+    parser.add_argument('--containers', type=int, default=20)
+    parser.add_argument('--log-lines', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--output', help='result JSON path (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='earlier result JSON to compare against')
+    args = parser.parse_args()
+
+    stub_config = {
+        'STUB_PODS': args.pods, 'STUB_CONTAINERS': args.containers, 'STUB_LOG_LINES': args.log_lines,
+        'STUB_LATENCY_MS': args.latency_ms, 'STUB_JITTER_MS': args.jitter_ms,
+    }
+    if not args.no_stubs and not args.url:
+        os.environ.update({name: f"{value:g}" for name, value in stub_config.items()})
+        os.environ['PATH'] = stub_cli.install() + os.pathsep + os.environ['PATH']
+    os.environ.setdefault('TTS_BACKEND', 'null')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    workload = load_workload(args.workload)
+    rng = random.Random(args.seed)
+    commands = rng.choices([u for u, _ in workload], [w for _, w in workload], k=args.requests)
+
+    # Each distinct utterance runs once first, so stub outputs and imports are warm
+    warmup = list(dict.fromkeys(commands))
+    if args.url:
+        run_http(args.url, warmup, 1)
+        samples, elapsed = run_http(args.url, commands, args.concurrency)
+    else:
+        samples, elapsed = asyncio.run(run_in_process(warmup, commands, args.concurrency, args.cold))
+
+    overall, intents = summarize(samples, elapsed)
+    commit = git_commit()
+    result = {
+        'meta': {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'target': args.url or 'in-process asgi',
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'cold_cache': args.cold,
+            'stubs': None if args.no_stubs or args.url else stub_config,
+            'seed': args.seed,
+        },
+        'overall': overall,
+        'intents': intents,
+    }
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {baseline['meta']['commit']} ({baseline['meta']['timestamp']})")
+    print_report(result, baseline)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+"""Fake kubectl/docker executables for benchmarks, driven by environment variables.
+
+`install()` writes `kubectl` and `docker` wrappers into a directory that
+re-run this script, so putting that directory first on PATH makes every
+executor path (subprocess, asyncio, log streams, health probes) talk to
+synthetic data instead of a cluster:
+
+    STUB_PODS=10000 STUB_LATENCY_MS=50 PATH=$(python benchmarks/stub_cli.py --install /tmp/stubs):$PATH
+
+STUB_PODS          pods (and deployments = pods / 10) per listing   (10)
+STUB_CONTAINERS    docker containers                                (10)
+STUB_IMAGES        docker images                                    (10)
+STUB_NODES         nodes                                            (3)
+STUB_LOG_LINES     lines per `logs` call (10k lines is about 1 MB)  (1000)
+STUB_LATENCY_MS    delay before any output                          (0)
+STUB_JITTER_MS     extra random delay, uniform in [0, jitter]       (0)
+STUB_FAIL_RATE     fraction of calls that fail like a down cluster  (0)
+STUB_CACHE_DIR     where generated outputs are kept between calls
+
+Several clusters: `write_kubeconfig()` (or --kubeconfig) writes a kubeconfig
+with one context per name; point KUBECONFIG at it and `--context=NAME`
+selects a cluster, each with its own failing pods.
+
+STUB_CONTEXT_LATENCY_MS  per-context delay, e.g. "staging=3000,dr=500"
+STUB_DOWN_CONTEXTS       contexts that refuse connections, e.g. "dr,eu-west"
+
+Usage: python benchmarks/stub_cli.py --install DIRECTORY
+       python benchmarks/stub_cli.py --kubeconfig PATH prod staging dr
+"""
+import hashlib
+import json
+import os
+import random
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+ENV_DEFAULTS = {
+    'STUB_PODS': 10, 'STUB_CONTAINERS': 10, 'STUB_IMAGES': 10, 'STUB_NODES': 3,
+    'STUB_LOG_LINES': 1000, 'STUB_LATENCY_MS': 0, 'STUB_JITTER_MS': 0, 'STUB_FAIL_RATE': 0,
+}
+WORKLOADS = ['backend', 'frontend', 'database', 'redis', 'nginx', 'mysql', 'checkout', 'payments', 'search', 'worker']
+CREATED = '2026-01-01T00:00:00Z'
+
+
+def config():
+    return {name: float(os.environ.get(name, default)) for name, default in ENV_DEFAULTS.items()}
+
+
+# Replays an output generated earlier for the same arguments and sizes without
+# starting Python (which would cost more CPU than the app under test); misses,
+# jitter, failures and `logs -f` go to this script.
+WRAPPER = """#!/bin/sh
+key=$(printf '%s\\n' {tool} "$@" "$STUB_PODS" "$STUB_CONTAINERS" "$STUB_IMAGES" "$STUB_NODES" "$STUB_LOG_LINES" | cksum | tr ' ' '-')
+cached="${{STUB_CACHE_DIR:-{cache_dir}}}/$key"
+case "${{STUB_JITTER_MS:-0}}${{STUB_FAIL_RATE:-0}}${{STUB_CONTEXT_LATENCY_MS}}${{STUB_DOWN_CONTEXTS}} $*" in
+    00\\ *\\ -f*|00\\ *--follow*) ;;
+    00\\ *)
+        if [ -f "$cached" ]; then
+            case "${{STUB_LATENCY_MS:-0}}" in 0) ;; *) sleep "$(awk "BEGIN {{ print $STUB_LATENCY_MS / 1000 }}")" ;; esac
+            exec cat "$cached"
+        fi ;;
+esac
+STUB_KEY="$key" exec "{python}" -S "{script}" {tool} "$@"
+"""
+
+
+def cache_dir():
+    return os.environ.get('STUB_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'voice-devops-stub-cache')
+
+
+def install(directory=None):
+    """Write kubectl/docker wrappers into directory (a new temp dir by default); returns it"""
+    directory = directory or tempfile.mkdtemp(prefix='voice-devops-stubs-')
+    os.makedirs(directory, exist_ok=True)
+    for tool in ('kubectl', 'docker'):
+        path = os.path.join(directory, tool)
+        with open(path, 'w') as f:
+            # python -S skips site-packages: the stub needs only the stdlib and starts faster
+            f.write(WRAPPER.format(tool=tool, cache_dir=cache_dir(), python=sys.executable, script=os.path.abspath(__file__)))
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return directory
+
+
+KUBECONFIG_TEMPLATE = """apiVersion: v1
+kind: Config
+current-context: {current}
+clusters:
+{clusters}contexts:
+{contexts}users:
+- name: stub
+  user: {{}}
+"""
+
+
+def write_kubeconfig(path, contexts):
+    """Write a kubeconfig with one cluster and context per name (the first is current)"""
+    clusters = ''.join(f"- name: {name}\n  cluster:\n    server: https://{name}.stub.invalid:6443\n" for name in contexts)
+    entries = ''.join(f"- name: {name}\n  context:\n    cluster: {name}\n    user: stub\n" for name in contexts)
+    with open(path, 'w') as f:
+        f.write(KUBECONFIG_TEMPLATE.format(current=contexts[0], clusters=clusters, contexts=entries))
+    return path
+
+
+def kubeconfig_contexts():
+    """(context names, current context) from the first KUBECONFIG file"""
+    path = os.environ.get('KUBECONFIG', '').split(os.pathsep)[0] or os.path.expanduser('~/.kube/config')
+    names, current, section = [], '', None
+    try:
+        with open(path) as f:
+            for line in f:
+                if not line.startswith((' ', '-')):
+                    section = line.split(':', 1)[0]
+                    if section == 'current-context':
+                        current = line.split(':', 1)[1].strip()
+                elif section == 'contexts' and line.startswith('- name:'):
+                    names.append(line.split(':', 1)[1].strip())
+    except OSError:
+        pass
+    return names, current
+
+
+def context_settings(name):
+    """Value for one context from a "ctx=value,ctx=value" variable"""
+    for entry in os.environ.get(name, '').split(','):
+        key, _, value = entry.partition('=')
+        if key.strip() and value:
+            yield key.strip(), value.strip()
+
+
+def pod_name(i):
+    return f"{WORKLOADS[i % len(WORKLOADS)]}-{i:09x}-{i * 7919 % 100000:05d}"
+
+
+def pods(count, namespace, context=''):
+    # Each named cluster crash-loops 1-3 of every 89 pods
+    crashing = int(hashlib.sha1(context.encode()).hexdigest(), 16) % 3 + 1 if context else 0
+    return {'items': [{
+        'metadata': {'name': pod_name(i), 'namespace': namespace, 'creationTimestamp': CREATED},
+        'status': {
+            'phase': 'Pending' if i % 97 == 5 else 'Running',
+            'containerStatuses': [{
+                'ready': i % 97 != 5 and i % 89 >= crashing,
+                'restartCount': i % 13 // 12 + (7 if i % 89 < crashing else 0),
+                'state': {'waiting': {'reason': 'CrashLoopBackOff'}} if i % 89 < crashing else {'running': {}},
+            }],
+        },
+    } for i in range(count)]}
+
+
+def deployments(count, namespace):
+    return {'items': [{
+        'metadata': {'name': f"{WORKLOADS[i % len(WORKLOADS)]}-{i}", 'namespace': namespace, 'creationTimestamp': CREATED},
+        'spec': {'replicas': 3},
+        'status': {'readyReplicas': 3, 'updatedReplicas': 3, 'availableReplicas': 3},
+    } for i in range(max(1, count // 10))]}
+
+
+def services(count, namespace):
+    return {'items': [{
+        'metadata': {'name': f"{WORKLOADS[i % len(WORKLOADS)]}-{i}", 'namespace': namespace, 'creationTimestamp': CREATED},
+        'spec': {'type': 'ClusterIP', 'clusterIP': f"10.0.{i // 250 % 256}.{i % 250 + 1}", 'ports': [{'port': 80, 'protocol': 'TCP'}]},
+    } for i in range(max(1, count // 10))]}
+
+
+def nodes(count):
+    return {'items': [{
+        'metadata': {'name': f"node-{i}", 'creationTimestamp': CREATED, 'labels': {'node-role.kubernetes.io/worker': ''}},
+        'status': {'conditions': [{'type': 'Ready', 'status': 'True'}], 'nodeInfo': {'kubeletVersion': 'v1.29.0'}},
+    } for i in range(count)]}
+
+
+def namespaces():
+    return {'items': [{'metadata': {'name': name, 'creationTimestamp': CREATED}, 'status': {'phase': 'Active'}}
+                      for name in ('default', 'kube-system', 'prod', 'staging')]}
+
+
+def table(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)] if rows else [len(h) for h in headers]
+    return '\n'.join('   '.join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+                     for row in [headers] + rows) + '\n'
+
+
+def log_lines(count, timestamps):
+    lines = []
+    for i in range(count):
+        level = 'ERROR' if i % 50 == 0 else 'WARN' if i % 20 == 0 else 'INFO'
+        status = 500 if i % 40 == 0 else 200
+        line = f"{level} GET /api/items/{i} {status} {i % 90 + 3}ms"
+        if level == 'ERROR':
+            line += ' connection refused to db:5432'
+        if timestamps:
+            line = f"2026-10-17T12:{i // 600 % 60:02d}:{i // 10 % 60:02d}.{i % 10:09d}Z {line}"
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def option(args, name, default=None):
+    """Value of `--name value` or `--name=value`"""
+    for i, arg in enumerate(args):
+        if arg == name and i + 1 < len(args):
+            return args[i + 1]
+        if arg.startswith(name + '='):
+            return arg[len(name) + 1:]
+    return default
+
+
+def kubectl(args, cfg):
+    """(exit code, stdout, stderr) for a kubectl command line"""
+    namespace = option(args, '-n', 'default')
+    context = option(args, '--context', '')
+    verb = args[0] if args else ''
+    if verb == 'config' and args[1:2] == ['get-contexts']:
+        return 0, ''.join(name + '\n' for name in kubeconfig_contexts()[0]), ''
+    if verb == 'config' and args[1:2] == ['current-context']:
+        return 0, kubeconfig_contexts()[1] + '\n', ''
+    if verb == 'config' and args[1:2] == ['view']:
+        # Stub contexts set no namespace, so `-o jsonpath={..namespace}` is empty
+        return 0, '', ''
+    if verb == 'version':
+        return 0, 'Client Version: v1.29.0\n', ''
+    if verb == 'get' and len(args) > 1 and args[1] == '--raw':
+        return 0, 'ok', ''
+    if verb == 'get' and len(args) > 1:
+        resource = args[1].rstrip('s')
+        count = int(cfg['STUB_PODS'])
+        listings = {
+            'pod': lambda: pods(count, namespace, context),
+            'deployment': lambda: deployments(count, namespace),
+            'service': lambda: services(count, namespace),
+            'node': lambda: nodes(int(cfg['STUB_NODES'])),
+            'namespace': namespaces,
+            'configmap': lambda: {'items': [{'metadata': {'name': f"{w}-config", 'creationTimestamp': CREATED}} for w in WORKLOADS]},
+            'secret': lambda: {'items': [{'metadata': {'name': f"{w}-token", 'creationTimestamp': CREATED}} for w in WORKLOADS]},
+        }
+        if resource not in listings:
+            return 1, '', f'error: the server doesn\'t have a resource type "{args[1]}"\n'
+        data = listings[resource]()
+        if option(args, '-o') == 'json':
+            return 0, json.dumps(data), ''
+        if (option(args, '-o') or '').startswith('jsonpath='):
+            # Only the executor's pod line template, printed the way the API backend does
+            sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+            from api_backend import POD_JSONPATH, pod_lines
+            if resource != 'pod' or option(args, '-o') != 'jsonpath=' + POD_JSONPATH:
+                return 1, '', 'error: the stub only knows the pod listing jsonpath\n'
+            return 0, pod_lines(data['items']), ''
+        rows = [[item['metadata']['name'], 'Ready' if resource == 'node' else 'Running', '1/1', '0', '5d']
+                for item in data['items']]
+        if '--no-headers' in args:
+            return 0, ''.join(f"{row[0]}   {row[1]}\n" for row in rows), ''
+        return 0, table(['NAME', 'STATUS', 'READY', 'RESTARTS', 'AGE'], rows), ''
+    if verb == 'describe':
+        items = pods(min(int(cfg['STUB_PODS']), 50), namespace)['items']
+        return 0, ''.join(f"Name:         {item['metadata']['name']}\nNamespace:    {namespace}\nStatus:       Running\n\n" for item in items), ''
+    if verb == 'logs':
+        tail = option(args, '--tail')
+        count = int(cfg['STUB_LOG_LINES']) if tail is None else min(int(tail), int(cfg['STUB_LOG_LINES']))
+        return 0, log_lines(count, '--timestamps' in args), ''
+    if verb in ('scale', 'delete', 'rollout') and len(args) > 2:
+        # rollout restart deployment NAME / scale deployment NAME --replicas=N / delete pod NAME
+        resource, name = (args[2], args[3]) if verb == 'rollout' and len(args) > 3 else (args[1], args[2])
+        done = {'scale': 'scaled', 'delete': 'deleted', 'rollout': 'restarted'}[verb]
+        return 0, f"{resource}/{name} {done}\n", ''
+    return 1, '', f'error: unknown command "{verb}" for "kubectl"\n'
+
+
+def docker(args, cfg):
+    """(exit code, stdout, stderr) for a docker command line"""
+    verb = args[0] if args else ''
+    containers = [{'ID': f"{i:012x}", 'Image': f"{WORKLOADS[i % len(WORKLOADS)]}:latest", 'State': 'running' if i % 11 else 'exited',
+                   'Status': 'Up 2 hours' if i % 11 else 'Exited (0) 1 hour ago', 'Names': f"proj-{WORKLOADS[i % len(WORKLOADS)]}-{i // len(WORKLOADS) + 1}"}
+                  for i in range(int(cfg['STUB_CONTAINERS']))]
+    if verb == 'info':
+        return 0, 'Server Version: 25.0.0\n', ''
+    if verb == 'ps':
+        if '-a' not in args:
+            containers = [c for c in containers if c['State'] == 'running']
+        name_filter = option(args, '--filter', '')
+        if name_filter.startswith('name='):
+            containers = [c for c in containers if name_filter[5:] in c['Names']]
+        fmt = option(args, '--format', '')
+        if fmt == '{{json .}}':
+            return 0, ''.join(json.dumps(c) + '\n' for c in containers), ''
+        if fmt == '{{.Names}}':
+            return 0, ''.join(c['Names'] + '\n' for c in containers), ''
+        return 0, table(['CONTAINER ID', 'IMAGE', 'STATUS', 'NAMES'], [[c['ID'], c['Image'], c['Status'], c['Names']] for c in containers]), ''
+    if verb == 'images':
+        images = [{'Repository': WORKLOADS[i % len(WORKLOADS)], 'Tag': f"v{i // len(WORKLOADS) + 1}", 'ID': f"{i * 7919:012x}",
+                   'CreatedSince': '2 weeks ago', 'Size': f"{100 + i % 400}MB"} for i in range(int(cfg['STUB_IMAGES']))]
+        if option(args, '--format') == '{{json .}}':
+            return 0, ''.join(json.dumps(image) + '\n' for image in images), ''
+        return 0, table(['REPOSITORY', 'TAG', 'IMAGE ID', 'CREATED', 'SIZE'], [list(image.values()) for image in images]), ''
+    if verb == 'logs':
+        tail = option(args, '--tail')
+        count = int(cfg['STUB_LOG_LINES']) if tail is None else min(int(tail), int(cfg['STUB_LOG_LINES']))
+        return 0, log_lines(count, '--timestamps' in args), ''
+    if verb in ('stop', 'start', 'restart', 'rm'):
+        return 0, args[-1] + '\n', ''
+    return 1, '', f"docker: '{verb}' is not a docker command.\n"
+
+
+def main(argv):
+    if argv[:1] == ['--install']:
+        print(install(argv[1] if len(argv) > 1 else None))
+        return 0
+
+    if argv[:1] == ['--kubeconfig']:
+        print(write_kubeconfig(argv[1], argv[2:] or ['stub']))
+        return 0
+
+    tool, args = argv[0], argv[1:]
+    cfg = config()
+    rng = random.Random()
+    delay = cfg['STUB_LATENCY_MS'] + rng.uniform(0, cfg['STUB_JITTER_MS'])
+    context = option(args, '--context', '') if tool == 'kubectl' else ''
+    delay += float(dict(context_settings('STUB_CONTEXT_LATENCY_MS')).get(context, 0))
+    # kubectl gives up on a slow API server after --request-timeout
+    request_timeout = option(args, '--request-timeout', '0').rstrip('s')
+    if delay and request_timeout != '0' and delay > float(request_timeout) * 1000:
+        time.sleep(float(request_timeout))
+        sys.stderr.write('Unable to connect to the server: context deadline exceeded\n')
+        return 1
+    if delay:
+        time.sleep(delay / 1000)
+    if context and context in os.environ.get('STUB_DOWN_CONTEXTS', '').split(','):
+        sys.stderr.write(f'Unable to connect to the server: dial tcp: lookup {context}.stub.invalid: no such host\n')
+        return 1
+    if cfg['STUB_FAIL_RATE'] and rng.random() < cfg['STUB_FAIL_RATE']:
+        sys.stderr.write('Unable to connect to the server: dial tcp 10.0.0.1:6443: i/o timeout\n')
+        return 1
+
+    # Generating 10k pods takes longer than printing them, so outputs are kept on disk
+    directory = cache_dir()
+    key = os.environ.get('STUB_KEY') or hashlib.sha1(json.dumps([tool, args, sorted(cfg.items())]).encode()).hexdigest()
+    cached = os.path.join(directory, key)
+    code = 0
+    if os.path.exists(cached):
+        with open(cached, 'rb') as f:
+            shutil.copyfileobj(f, sys.stdout.buffer)
+    else:
+        code, stdout, stderr = (kubectl if tool == 'kubectl' else docker)(args, cfg)
+        # kubeconfig answers follow the file, which is not part of the key
+        if code == 0 and args[:1] != ['config']:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                f.write(stdout)
+            os.replace(tmp_path, cached)
+        sys.stdout.write(stdout)
+        sys.stderr.write(stderr)
+
+    # `logs -f` keeps following until the reader goes away
+    if code == 0 and args[:1] == ['logs'] and ('-f' in args or '--follow' in args):
+        sys.stdout.flush()
+        time.sleep(3600)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
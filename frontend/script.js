@@ -1,5 +1,7 @@
 let recognition;
 let isListening = false;
+// Lets follow-ups like "describe the second one" refer to earlier answers
+const sessionId = Math.random().toString(36).slice(2) + Date.now().toString(36);
 
 // Check browser support
 function initializeSpeechRecognition() {
@@ -108,7 +110,7 @@ async function sendCommandToBackend(command) {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ command: command })
+            body: JSON.stringify({ command: command, audio: true, session_id: sessionId })
         });
         
         if (!response.ok) {
@@ -126,6 +128,16 @@ async function sendCommandToBackend(command) {
             }
             document.getElementById('response-text').textContent = responseText;
             document.getElementById('status').textContent = '✅ Command processed successfully!';
+            
+            // Play the spoken summary in the browser
+            if (data.audio_url) {
+                new Audio('http://127.0.0.1:5000' + data.audio_url).play().catch(err => console.error("Audio playback error:", err));
+            }
+            
+            // Follow logs live when the backend offers a stream
+            if (data.log_stream) {
+                followLogs('http://127.0.0.1:5000' + data.log_stream);
+            }
         } else {
             document.getElementById('response-text').textContent = 'Error: ' + data.error;
             document.getElementById('status').textContent = '❌ Command failed';
@@ -136,4 +148,41 @@ async function sendCommandToBackend(command) {
         document.getElementById('response-text').textContent = 'Connection Error: ' + error.message;
         document.getElementById('status').textContent = '❌ Backend connection failed';
     }
-}
\ No newline at end of file
+}
+
+// Live log streaming (Server-Sent Events)
+let logSource = null;
+const MAX_LOG_LINES = 500;
+
+function followLogs(url) {
+    stopLogs();
+    
+    const logBox = document.getElementById('log-stream');
+    logBox.textContent = '';
+    document.getElementById('log-section').style.display = 'block';
+    
+    logSource = new EventSource(url);
+    logSource.onmessage = function(event) {
+        logBox.appendChild(document.createTextNode(event.data + '\n'));
+        // Keep the DOM bounded however chatty the container is
+        while (logBox.childNodes.length > MAX_LOG_LINES) {
+            logBox.removeChild(logBox.firstChild);
+        }
+        logBox.scrollTop = logBox.scrollHeight;
+    };
+    logSource.addEventListener('end', function(event) {
+        console.log("Log stream ended:", event.data);
+        stopLogs();
+    });
+    logSource.onerror = function() {
+        console.error("Log stream error");
+        stopLogs();
+    };
+}
+
+function stopLogs() {
+    if (logSource) {
+        logSource.close();
+        logSource = null;
+    }
+}
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Backend'))
+
+
+@pytest.fixture
+def kubeconfig(tmp_path, monkeypatch):
+    """Write a kubeconfig with the given current context; call again to switch"""
+    path = tmp_path / 'config'
+    monkeypatch.setenv('KUBECONFIG', str(path))
+    writes = [0]
+
+    def write(current_context, contexts=()):
+        names = list(contexts) or [current_context]
+        path.write_text(
+            f"current-context: {current_context}\n"
+            "contexts:\n" + ''.join(f"- name: {name}\n" for name in names)
+        )
+        # Distinct mtimes, so readers that cache on mtime see every switch
+        writes[0] += 1
+        os.utime(path, (1000000 + writes[0], 1000000 + writes[0]))
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    """Put a shell script on PATH as the named CLI (kubectl, docker)"""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    def install(name, script):
+        path = bin_dir / name
+        path.write_text('#!/bin/sh\n' + script)
+        path.chmod(0o755)
+        return str(path)
+
+    return install
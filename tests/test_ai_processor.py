@@ -0,0 +1,63 @@
+import pytest
+
+from ai_processor import AIProcessor
+from cluster_fanout import KubeContexts
+
+
+@pytest.fixture
+def processor(kubeconfig, fake_cli):
+    kubeconfig('kind-prod', ['kind-prod', 'staging'])
+    fake_cli('kubectl', '[ "$*" = "config get-contexts -o name" ] && printf "kind-prod\\nstaging\\n"\n')
+    return AIProcessor(contexts=KubeContexts())
+
+
+def parse(processor, command):
+    analysis = processor.process_command(command)
+    return analysis['command_type'], analysis['parameters']
+
+
+@pytest.mark.parametrize('command, intent, params', [
+    ('show pods', 'get_pods', {}),
+    ('show pods in namespace prod', 'get_pods', {'namespace': 'prod'}),
+    ('describe pod web-1', 'describe_pod', {'name': 'web-1'}),
+    ('delete pod web-1', 'delete_pod', {'name': 'web-1'}),
+    ('scale deployment web to 3 replicas', 'scale_deployment', {'name': 'web', 'replicas': 3}),
+    ('scale deployment web', 'scale_deployment', {'name': 'web'}),
+    ('stop container backend', 'stop_container', {'name': 'backend'}),
+    ('show logs of backend', 'get_logs', {'name': 'backend'}),
+    ('list images', 'list_images', {}),
+    ('check system health', 'health_check', {}),
+])
+def test_intent_and_parameters(processor, command, intent, params):
+    assert parse(processor, command) == (intent, params)
+
+
+@pytest.mark.parametrize('command, intent', [
+    ('show pods in the cluster', 'get_pods'),
+    ('show the cluster nodes', 'get_nodes'),
+    ('check cluster health', 'health_check'),
+    ('show me the cluster status', None),
+    ('show pods in cluster nowhere', 'get_pods'),
+])
+def test_words_next_to_cluster_are_not_contexts(processor, command, intent):
+    command_type, params = parse(processor, command)
+    assert 'clusters' not in params
+    if intent is not None:
+        assert command_type == intent
+
+
+@pytest.mark.parametrize('command, clusters', [
+    ('show pods across all clusters', 'all'),
+    ('show failing pods in every context', 'all'),
+    ('show pods in clusters prod and staging', ('prod', 'staging')),
+    ('list nodes in contexts kind-prod, staging', ('kind-prod', 'staging')),
+    ('show pods in cluster staging', ('staging',)),
+    ('show pods in the prod cluster', ('prod',)),
+    ('show pods on context kind-prod', ('kind-prod',)),
+])
+def test_clusters_said(processor, command, clusters):
+    assert parse(processor, command)[1]['clusters'] == clusters
+
+
+def test_description_of_a_plain_listing_is_unchanged(processor):
+    assert processor.process_command('show pods in the cluster')['description'] == 'Fetching all pods in the cluster'
@@ -0,0 +1,125 @@
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api_backend import BackendError, DockerAPIClient, KubernetesAPIClient
+
+PODS = {'items': [{
+    'metadata': {'namespace': 'default', 'name': 'web-1'},
+    'status': {'phase': 'Running', 'containerStatuses': [{'ready': True, 'restartCount': 0}]},
+}]}
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 server answering from a path -> (status, body) table"""
+
+    protocol_version = 'HTTP/1.1'
+    routes = {}
+    # Paths after which the server drops the connection, though it looked keep-alive
+    closes = {'/api/v1/namespaces/flaky/pods'}
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        status, body = self.routes.get(self.path, (404, {'message': f"{self.path} not found"}))
+        body = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.close_connection = self.path in self.closes
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixStubServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('docker', 0)
+
+
+def serve(server, routes):
+    server.requests = []
+    server.connections = 0
+    server.RequestHandlerClass = type('Routes', (StubAPI,), {'routes': routes})
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def kube_api():
+    server = serve(ThreadingHTTPServer(('127.0.0.1', 0), StubAPI), {
+        '/api/v1/namespaces/default/pods': (200, PODS),
+        '/api/v1/namespaces/default/pods/web-1/log?tailLines=2': (200, b'line 1\nline 2\n'),
+        '/api/v1/namespaces/flaky/pods': (200, PODS),
+        '/api/v1/namespaces/gone/pods': (404, {'message': 'namespaces "gone" not found'}),
+    })
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def docker_api(tmp_path):
+    logs = b'\x01\x00\x00\x00\x00\x00\x00\x06hello\n\x02\x00\x00\x00\x00\x00\x00\x05oops\n'
+    server = serve(UnixStubServer(str(tmp_path / 'docker.sock'), StubAPI), {
+        '/containers/json?all=1': (200, [{'Id': 'abc123def4567890', 'Image': 'nginx', 'Status': 'Up 1 minute', 'Names': ['/web']}]),
+        '/containers/web/logs?stdout=1&stderr=1': (200, logs),
+    })
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def kube_client(server, **kwargs):
+    host, port = server.server_address
+    return KubernetesAPIClient(f"http://{host}:{port}", **kwargs)
+
+
+def test_kubernetes_requests_share_one_connection_and_token(kube_api):
+    client = kube_client(kube_api, token='secret')
+    for _ in range(3):
+        assert 'web-1' in client.run('get pods')
+    assert client.run('logs web-1 --tail=2') == 'line 1\nline 2\n'
+    assert kube_api.connections == 1
+    assert all(headers['Authorization'] == 'Bearer secret' for _, headers in kube_api.requests)
+
+
+def test_kubernetes_error_is_the_servers_message(kube_api):
+    with pytest.raises(BackendError, match='namespaces "gone" not found'):
+        kube_client(kube_api).run('get pods -n gone')
+
+
+@pytest.mark.parametrize('command', ['get pods --context=staging', 'delete pod web-1', 'get pods -o wide'])
+def test_kubernetes_leaves_other_commands_to_kubectl(kube_api, command):
+    assert kube_client(kube_api).run(command) is None
+    assert kube_api.requests == []
+
+
+def test_pooled_connection_closed_by_server_is_retried(kube_api):
+    client = kube_client(kube_api)
+    client.run('get pods -n flaky')
+    assert 'web-1' in client.run('get pods')
+    assert kube_api.connections == 2
+
+
+def test_docker_over_unix_socket(docker_api):
+    client = DockerAPIClient(docker_api.server_address)
+    listing = client.run('ps -a')
+    assert listing.splitlines()[0].split() == ['CONTAINER', 'ID', 'IMAGE', 'STATUS', 'NAMES']
+    assert 'abc123def456' in listing and 'web' in listing
+    # Non-TTY logs carry 8-byte stream headers
+    assert client.run('logs web') == 'hello\noops'
+    assert docker_api.connections == 1
+    assert client.run("ps --format '{{json .}}'") is None
@@ -0,0 +1,60 @@
+import asyncio
+
+from async_executor import AsyncDevOpsExecutor
+from devops_executor import DevOpsExecutor
+
+
+class GatedExecutor(AsyncDevOpsExecutor):
+    """Runs no CLI: each load waits for release() and answers with the context it started in"""
+
+    def __init__(self):
+        super().__init__(DevOpsExecutor())
+        self.started = []
+        self.release = asyncio.Event()
+
+    async def _run_tool(self, tool, command):
+        context = self.executor.cache.current_kube_context()
+        self.started.append((tool, context, command))
+        await self.release.wait()
+        return f"{context}: {command}"
+
+    async def until_started(self, count):
+        async def wait():
+            while len(self.started) < count:
+                await asyncio.sleep(0)
+        await asyncio.wait_for(wait(), 1)
+
+
+def test_identical_reads_share_one_load(kubeconfig):
+    kubeconfig('prod')
+
+    async def main():
+        executor = GatedExecutor()
+        first = asyncio.ensure_future(executor.run_kubectl('get pods'))
+        second = asyncio.ensure_future(executor.run_kubectl('get  pods'))
+        await executor.until_started(1)
+        await asyncio.sleep(0)
+        executor.release.set()
+        return executor.started, await asyncio.gather(first, second)
+
+    started, results = asyncio.run(main())
+    assert len(started) == 1
+    assert results == ['prod: get pods', 'prod: get pods']
+
+
+def test_read_after_context_switch_does_not_join_old_load(kubeconfig):
+    kubeconfig('prod')
+
+    async def main():
+        executor = GatedExecutor()
+        before = asyncio.ensure_future(executor.run_kubectl('get pods'))
+        await executor.until_started(1)
+        kubeconfig('staging')
+        after = asyncio.ensure_future(executor.run_kubectl('get pods'))
+        await executor.until_started(2)
+        executor.release.set()
+        return executor.started, await asyncio.gather(before, after)
+
+    started, results = asyncio.run(main())
+    assert [context for _, context, _ in started] == ['prod', 'staging']
+    assert results == ['prod: get pods', 'staging: get pods']
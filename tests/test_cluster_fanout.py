@@ -0,0 +1,76 @@
+from cluster_fanout import ALL_CONTEXTS, ClusterQuery, KubeContexts
+from devops_executor import DevOpsExecutor
+
+
+def test_context_namespace_defaults_to_default(kubeconfig, fake_cli):
+    kubeconfig('prod')
+    # No namespace in the context: kubectl prints nothing
+    fake_cli('kubectl', 'exit 0\n')
+    contexts = KubeContexts()
+    assert contexts.namespace() == 'default'
+
+
+def test_context_namespace_set_in_kubeconfig(kubeconfig, fake_cli, tmp_path, monkeypatch):
+    namespace_file = tmp_path / 'namespace'
+    namespace_file.write_text('team-a')
+    monkeypatch.setenv('NAMESPACE_FILE', str(namespace_file))
+    fake_cli('kubectl', 'cat "$NAMESPACE_FILE"\n')
+    kubeconfig('prod')
+    contexts = KubeContexts()
+    assert contexts.namespace() == 'team-a'
+
+    # Cached until the kubeconfig changes
+    namespace_file.write_text('team-b')
+    assert contexts.namespace() == 'team-a'
+    kubeconfig('staging')
+    assert contexts.namespace() == 'team-b'
+
+
+def test_context_namespace_unknown_when_kubectl_fails(kubeconfig, fake_cli):
+    kubeconfig('prod')
+    fake_cli('kubectl', 'exit 1\n')
+    assert KubeContexts().namespace() is None
+
+
+CLUSTERS_KUBECTL = '''case "$*" in
+  "config get-contexts -o name") printf 'prod\\nstaging\\nslow\\n' ;;
+  *--context=prod*) echo '{"items": [{"metadata": {"name": "prod-node"}}]}' ;;
+  *--context=staging*) echo 'error: connection refused' >&2; exit 1 ;;
+  *--context=slow*) sleep 2; echo '{"items": []}' ;;
+esac
+'''
+
+
+def fan_out(contexts):
+    executor = DevOpsExecutor()
+    executor.cluster_timeout = 0.5
+    return executor.query_clusters(ClusterQuery('get nodes', contexts))
+
+
+def test_fan_out_reports_failing_and_slow_clusters_next_to_answers(kubeconfig, fake_cli):
+    kubeconfig('prod', ['prod', 'staging', 'slow'])
+    fake_cli('kubectl', CLUSTERS_KUBECTL)
+    result = fan_out(ALL_CONTEXTS)
+
+    assert result.error is None
+    assert [(context, [r.name for r in nodes.records]) for context, nodes in result.results] == [('prod', ['prod-node'])]
+    failures = dict(result.failures)
+    assert set(failures) == {'staging', 'slow'}
+    assert 'connection refused' in failures['staging']
+    assert failures['slow'] == 'timed out after 0.5 s'
+
+
+def test_fan_out_reports_unknown_contexts(kubeconfig, fake_cli):
+    kubeconfig('prod', ['prod', 'staging', 'slow'])
+    fake_cli('kubectl', CLUSTERS_KUBECTL)
+    result = fan_out(('prod', 'nowhere'))
+    assert [context for context, _ in result.results] == ['prod']
+    assert result.failures == [('nowhere', 'no such context')]
+
+
+def test_fan_out_with_no_answer_is_an_error(kubeconfig, fake_cli):
+    kubeconfig('prod', ['prod', 'staging', 'slow'])
+    fake_cli('kubectl', CLUSTERS_KUBECTL)
+    result = fan_out(('staging', 'slow'))
+    assert result.results == []
+    assert result.error.startswith('❌ No cluster answered (staging: ')
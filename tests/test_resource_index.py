@@ -0,0 +1,68 @@
+from resource_index import ResourceIndex, kube_records
+
+
+class FixedContexts:
+    """KubeContexts stand-in whose current namespace is set by the test"""
+
+    def __init__(self, namespace):
+        self._namespace = namespace
+
+    def namespace(self):
+        return self._namespace
+
+
+def pods(*names):
+    """kube_records for pods given as 'namespace/name'"""
+    items = []
+    for i, full in enumerate(names):
+        namespace, name = full.split('/')
+        items.append({
+            'metadata': {'namespace': namespace, 'name': name, 'resourceVersion': str(i)},
+            'status': {'phase': 'Running'},
+        })
+    return list(kube_records('pods', {'items': items}))
+
+
+def listed_names(index, command='get pods'):
+    result = index.answer_records('kubectl', command)
+    return None if result is None else [record.name for record in result.records]
+
+
+def test_snapshot_overtaken_by_mark_stale_is_dropped():
+    index = ResourceIndex(contexts=FixedContexts('default'))
+    index.apply_snapshot('pods', pods('default/web-1', 'default/web-2'))
+
+    # A poll starts, then web-2 is deleted and the index marked stale
+    generation = index.generation('pods')
+    index.mark_stale_for_intent('delete_pod')
+    assert index.apply_snapshot('pods', pods('default/web-1', 'default/web-2'), generation) is None
+    assert listed_names(index) is None
+
+    # The next poll, started after the change, is applied
+    assert index.apply_snapshot('pods', pods('default/web-1'), index.generation('pods')) == (0, 0, 1)
+    assert listed_names(index) == ['web-1']
+
+
+def test_mark_stale_leaves_other_kinds_alone():
+    index = ResourceIndex(contexts=FixedContexts('default'))
+    generation = index.generation('services')
+    index.mark_stale('pods')
+    assert index.apply_snapshot('services', [], generation) == (0, 0, 0)
+
+
+def test_listing_uses_current_context_namespace():
+    index = ResourceIndex(contexts=FixedContexts('team-a'))
+    index.apply_snapshot('pods', pods('default/web-1', 'team-a/api-1', 'team-a/api-2'))
+    assert listed_names(index) == ['api-1', 'api-2']
+    assert 'api-1' in index.answer('kubectl', 'get pods')
+    assert 'web-1' not in index.answer('kubectl', 'get pods')
+
+
+def test_unknown_context_namespace_goes_live():
+    index = ResourceIndex(contexts=FixedContexts(None))
+    index.apply_snapshot('pods', pods('default/web-1'))
+    assert index.answer('kubectl', 'get pods') is None
+    assert listed_names(index) is None
+    # Cluster-wide kinds don't depend on the namespace
+    index.apply_snapshot('nodes', [])
+    assert index.answer('kubectl', 'get nodes') is not None
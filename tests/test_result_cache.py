@@ -0,0 +1,92 @@
+import threading
+import time
+
+from result_cache import ResultCache, command_tag
+
+
+def test_concurrent_loads_run_once(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return 'pods'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('kubectl', 'get pods', loader)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()['coalesced'] < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == ['pods'] * 4
+    assert cache.lookup('kubectl', 'get pods') == 'pods'
+
+
+def test_load_overtaken_by_invalidation_is_not_stored(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache()
+
+    def loader():
+        # A delete lands while the listing is still running
+        cache.invalidate_intent('delete_pod')
+        return 'pods before the delete'
+
+    assert cache.get_or_load('kubectl', 'get pods', loader) == 'pods before the delete'
+    assert cache.lookup('kubectl', 'get pods') is None
+    assert cache.get_or_load('kubectl', 'get pods', lambda: 'pods after') == 'pods after'
+    assert cache.lookup('kubectl', 'get pods') == 'pods after'
+
+
+def test_store_with_old_generation_is_dropped(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache()
+    generation = cache.generation('kubectl', 'get deployments')
+    cache.invalidate_intent('scale_deployment')
+    cache.store('kubectl', 'get deployments', 'stale', generation)
+    assert cache.lookup('kubectl', 'get deployments') is None
+
+    cache.store('kubectl', 'get deployments', 'fresh', cache.generation('kubectl', 'get deployments'))
+    assert cache.lookup('kubectl', 'get deployments') == 'fresh'
+
+
+def test_invalidation_only_drops_its_tag(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache()
+    cache.store('kubectl', 'get pods', 'pods')
+    cache.store('kubectl', 'get services', 'services')
+    cache.invalidate_command('kubectl', 'delete pod web-1')
+    assert cache.lookup('kubectl', 'get pods') is None
+    assert cache.lookup('kubectl', 'get services') == 'services'
+
+
+def test_entries_are_per_kube_context(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache()
+    cache.store('kubectl', 'get pods', 'prod pods')
+    kubeconfig('staging')
+    assert cache.lookup('kubectl', 'get pods') is None
+    kubeconfig('prod')
+    assert cache.lookup('kubectl', 'get pods') == 'prod pods'
+
+
+def test_size_is_counted_in_bytes(kubeconfig):
+    kubeconfig('prod')
+    cache = ResultCache(max_bytes=10)
+    cache.store('kubectl', 'get pods', 'é' * 6)  # 12 bytes, 6 characters
+    assert cache.lookup('kubectl', 'get pods') is None
+
+
+def test_mutating_commands_are_not_cacheable():
+    cache = ResultCache()
+    assert cache.is_mutating('kubectl', 'scale deployment web --replicas=2')
+    assert not cache.is_cacheable('kubectl', 'delete pod web-1')
+    assert command_tag('kubectl', 'get deploy') == ('kubectl', 'deployment')
@@ -0,0 +1,81 @@
+import pytest
+
+from ai_processor import AIProcessor
+from devops_executor import DevOpsExecutor
+from records import ContainerRecord, PodRecord, ResultSet
+from session_context import SessionContext
+
+
+def pods(*names):
+    return ResultSet('pods', 'kubectl', [
+        PodRecord({'metadata': {'namespace': 'shop', 'name': name}, 'status': {'phase': 'Running'}}) for name in names
+    ])
+
+
+def containers(*names):
+    return ResultSet('containers', 'docker', [ContainerRecord({'Names': name, 'State': 'running'}) for name in names])
+
+
+@pytest.fixture
+def ask():
+    processor = AIProcessor()
+    context = SessionContext()
+
+    def ask(command, listing=None):
+        analysis = processor.process_command(command, context)
+        if listing is not None:
+            context.remember(listing)
+        return analysis['command_type'], analysis['parameters']
+
+    return ask
+
+
+def test_read_follow_ups_take_the_name_from_the_listing(ask):
+    ask('show pods', pods('web-1', 'web-2', 'web-3'))
+    assert ask('describe the second one') == ('describe_pod', {'name': 'web-2', 'namespace': 'shop'})
+    assert ask('logs for that') == ('get_logs', {'name': 'web-2', 'namespace': 'shop'})
+    assert ask('show the next one') == ('describe_pod', {'name': 'web-3', 'namespace': 'shop'})
+
+
+def test_listing_is_not_turned_into_a_follow_up(ask):
+    ask('show pods', pods('web-1'))
+    assert ask('show pods that are running') == ('get_pods', {})
+
+
+@pytest.mark.parametrize('command, intent', [
+    ('delete that', 'delete_pod'),
+    ('kill it', 'delete_pod'),
+    ('remove it', 'delete_pod'),
+    ('delete the last one', 'delete_pod'),
+    ('delete that pod', 'delete_pod'),
+    ('delete the second pod', 'delete_pod'),
+])
+def test_change_never_takes_its_target_from_a_reference(ask, command, intent):
+    ask('show pods', pods('web-1', 'web-2'))
+    ask('describe the first one')
+    command_type, params = ask(command)
+    assert command_type == intent
+    assert 'name' not in params
+
+
+@pytest.mark.parametrize('command', ['stop it', 'stop the third container'])
+def test_stopping_a_referenced_container_asks_for_its_name(ask, command):
+    ask('list containers', containers('api', 'worker', 'cache'))
+    ask('logs for the third one')
+    command_type, params = ask(command)
+    assert command_type == 'stop_container' and 'name' not in params
+    step = DevOpsExecutor().resolve_analysis({'original_command': command, 'command_type': command_type, 'parameters': params})
+    assert step[0] == 'message'
+
+
+def test_change_with_a_said_name_still_runs(ask):
+    ask('show pods', pods('web-1', 'web-2'))
+    ask('describe the first one')
+    assert ask('delete pod web-2') == ('delete_pod', {'name': 'web-2'})
+
+
+def test_refused_reference_keeps_the_remembered_resource(ask):
+    ask('show pods', pods('web-1', 'web-2'))
+    ask('describe the first one')
+    ask('kill it')
+    assert ask('logs for it') == ('get_logs', {'name': 'web-1', 'namespace': 'shop'})
@@ -0,0 +1,64 @@
+import pytest
+
+from ai_processor import AIProcessor
+from devops_executor import DevOpsExecutor
+from result_cache import INTENT_INVALIDATIONS
+from speech_corrector import SpeechCorrector
+
+# Ordinary speech that must not be rewritten or turned into a change
+EVERYDAY_PHRASES = [
+    'how will pod web behave', 'till the pod frontend is ready', 'top container nginx',
+    'is the stale deployment web healthy', 'fill pod web', 'skill pod web', 'hill pod web',
+    'sale deployment web to 3', 'scare deployment web', 'deleted pod web', 'deplete pod web',
+    'show dog of backend', 'fog on pod web', 'food list', 'show code', 'mode of backend',
+]
+
+
+@pytest.fixture
+def corrector():
+    corrector = SpeechCorrector()
+    corrector.update('pods', ['checkout-7d9f8c6b5-x2x9z', 'web-1', 'web-2'], [])
+    return corrector
+
+
+@pytest.mark.parametrize('phrase', EVERYDAY_PHRASES)
+def test_everyday_phrase_is_left_alone(corrector, phrase):
+    assert corrector.correct(phrase) == phrase
+    assert AIProcessor(corrector=corrector).process_command(phrase)['command_type'] not in INTENT_INVALIDATIONS
+
+
+@pytest.mark.parametrize('heard, meant', [
+    ('show boats', 'show pods'),
+    ('show nods', 'show nodes'),
+    ('list deploymants', 'list deployments'),
+    ('show logs of bakend', 'show logs of backend'),
+    ('describe pod checkot', 'describe pod checkout'),
+    ('logs of check out', 'logs of checkout'),
+])
+def test_mishearing_in_a_read_is_corrected(corrector, heard, meant):
+    assert corrector.correct(heard) == meant
+
+
+@pytest.mark.parametrize('heard', [
+    'delete pod checkot',
+    'kill checkot pod',
+    'stop container nginks',
+    'delete pod check out',
+    'scale deployment checkot to 3',
+    'restart pod bakend',
+])
+def test_names_in_a_change_are_kept_as_heard(corrector, heard):
+    assert corrector.correct(heard) == heard
+
+
+def test_change_with_misheard_name_never_targets_another_resource(corrector):
+    processor = AIProcessor(corrector=corrector)
+    step = DevOpsExecutor(corrector=corrector).resolve_analysis(processor.process_command('delete pod checkot'))
+    assert step == ('kubectl', 'delete pod checkot')
+
+
+@pytest.mark.parametrize('verb', ['delete', 'remove', 'kill', 'restart', 'stop', 'scale'])
+def test_mutating_verbs_are_never_a_correction(corrector, verb):
+    near = verb[:-1] + ('x' if verb[-1] != 'x' else 'y')
+    assert corrector.correct_word(near) != verb
+    assert corrector.correct_word(verb) == verb